@@ -1,9 +1,10 @@
 from fastapi import APIRouter
-from backend.api.v1.endpoints import system, zonas, locais, cargas, circuitos, calculos, propostas
+from backend.api.v1.endpoints import system, projetos, zonas, locais, cargas, circuitos, calculos, propostas, jobs
 
 api_router = APIRouter()
 
 api_router.include_router(system.router, tags=["system"])
+api_router.include_router(projetos.router, prefix="/projetos", tags=["projetos"])
 api_router.include_router(zonas.router, prefix="/zonas", tags=["zonas"])
 api_router.include_router(locais.router, prefix="/locais", tags=["locais"])
 api_router.include_router(cargas.router, prefix="/cargas", tags=["cargas"])
@@ -11,4 +12,6 @@ api_router.include_router(circuitos.router, prefix="/circuitos", tags=["circuito
 # [NOVO] Rota de Cálculos
 api_router.include_router(calculos.router, prefix="/calculos", tags=["calculos"])
 # [NOVO] Rota de Propostas (Área de Rascunho)
-api_router.include_router(propostas.router, prefix="/propostas", tags=["propostas"])
\ No newline at end of file
+api_router.include_router(propostas.router, prefix="/propostas", tags=["propostas"])
+# Jobs de dimensionamento em segundo plano (progresso via SSE)
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
\ No newline at end of file
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
+import logging
+from collections import Counter
+from time import perf_counter
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from domain_core.schemas.projeto import ProjetoEletrico
 from domain_core.schemas.local import Local
@@ -8,8 +13,24 @@ from domain_core.schemas.zona import Zona
 from domain_core.schemas.circuito import Circuito
 from domain_core.schemas.resultados import ResultadoDimensionamento
 from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
+from domain_core.engine.perfilador_etapas import PerfiladorEtapas
+from domain_core.engine.log_estruturado import obter_logger
+from backend.core.config import settings
+from backend.core.executor import obter_pool_calculo
+from backend.core.cache_resultados import (
+    cache_resultados, chave_simulacao, digest_contexto, etag_corresponde, json_canonico
+)
+from backend.core.resultado_store import obter_resultado_store
+from backend.core.metricas import cache_resultados_consultas
+from backend.core.serializacao import (
+    compactar_corpo, dumps_json, juntar_lista, serializar_resultado, serializar_resultados
+)
+from backend.repositories import (
+    repositorio_projetos, repositorio_zonas, repositorio_locais, repositorio_circuitos
+)
 
 router = APIRouter()
+logger = obter_logger("api.calculos")
 
 class SimulacaoRequest(BaseModel):
     projeto: ProjetoEletrico
@@ -18,32 +39,408 @@ class SimulacaoRequest(BaseModel):
     circuito: Circuito
     has_dr: bool = False
 
+class SimulacaoProjetoRequest(BaseModel):
+    projeto: ProjetoEletrico
+    locais: List[Local]
+    zonas: List[Zona]
+    circuitos: List[Circuito]
+    has_dr: bool = False
+
+class SimulacaoPorIdRequest(BaseModel):
+    circuito_id: str
+    has_dr: bool = False
+
+class ResumoSimulacao(BaseModel):
+    """Último registro do fluxo NDJSON de /simular-projeto/stream."""
+    total: int
+    por_status: Dict[str, int]
+    duracao_ms: float
+
+PARAM_PERFIL = Query(default=False, description="Debug: recalcula sem cache e devolve o tempo de cada etapa do motor")
+PARAM_PERFIL_ALOCACOES = Query(default=False, description="Debug: como `perfil`, medindo também memória (tracemalloc, lento)")
+PARAM_COMPACTO = Query(default=False, description="Omite a memória de cálculo (`memoria`) de cada resultado")
+
+# Chave/ETag da variante compacta de um resultado em cache
+SUFIXO_COMPACTO = "-c"
+
 @router.post("/simular", response_model=ResultadoDimensionamento)
-async def simular_dimensionamento(req: SimulacaoRequest):
+def simular_dimensionamento(
+    req: SimulacaoRequest,
+    if_none_match: Optional[str] = Header(default=None),
+    perfil: bool = PARAM_PERFIL,
+    perfil_alocacoes: bool = PARAM_PERFIL_ALOCACOES,
+    compacto: bool = PARAM_COMPACTO
+):
     """
     Endpoint Fase 10:
     Recebe um Contexto (Projeto, Locais, Zona, Circuito) e executa o Motor de Cálculo NBR 5410.
+
+    O resultado é endereçado pelo hash da requisição normalizada + versão normativa:
+    repetições são servidas do cache e `If-None-Match` com o ETag devolve 304 sem corpo.
+
+    Com `?perfil=true` a resposta vira `{"resultado": ..., "perfil": ...}` (+ header Server-Timing).
+    Com `?compacto=true` o resultado vem sem `memoria` (ETag próprio).
     """
+    if perfil or perfil_alocacoes:
+        return _simular_circuito_perfilado(
+            req.projeto, req.locais, req.zona_governante, req.circuito, req.has_dr, perfil_alocacoes, compacto
+        )
+    return _simular_circuito(
+        req.projeto, req.locais, req.zona_governante, req.circuito, req.has_dr, if_none_match, compacto
+    )
+
+def _simular_circuito(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zona_governante: Zona,
+    circuito: Circuito,
+    has_dr: bool,
+    if_none_match: Optional[str] = None,
+    compacto: bool = False
+) -> Response:
+    chave = chave_simulacao(digest_contexto(projeto, locais), zona_governante, circuito, has_dr)
+    chave_resposta = chave + SUFIXO_COMPACTO if compacto else chave
+    etag = f'"{chave_resposta}"'
+    if etag_corresponde(if_none_match, etag):
+        cache_resultados_consultas.incrementar(origem="etag")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    corpo = cache_resultados.obter(chave_resposta)
+    if corpo is not None:
+        cache_resultados_consultas.incrementar(origem="memoria")
+        return Response(content=corpo, media_type="application/json", headers={"ETag": etag, "X-Cache": "HIT"})
+
+    # No modo compacto, o resultado completo já em memória só precisa perder a `memoria`
+    origem, x_cache = "memoria", "HIT"
+    corpo = cache_resultados.obter(chave) if compacto else None
+    store = obter_resultado_store()
+    if corpo is None and store:
+        corpo = store.obter(chave)
+        if corpo is not None:
+            cache_resultados.guardar(chave, corpo)
+            origem, x_cache = "disco", "HIT-DISK"
+
+    resultado = None
+    if corpo is None:
+        resultado = _calcular_circuito(projeto, locais, zona_governante, circuito, has_dr)
+        corpo = serializar_resultado(resultado)
+        cache_resultados.guardar(chave, corpo)
+        if store:
+            store.salvar(chave, corpo)
+        origem, x_cache = "calculo", "MISS"
+
+    if compacto:
+        corpo = serializar_resultado(resultado, compacto=True) if resultado is not None else compactar_corpo(corpo)
+        cache_resultados.guardar(chave_resposta, corpo)
+    cache_resultados_consultas.incrementar(origem=origem)
+    return Response(content=corpo, media_type="application/json", headers={"ETag": etag, "X-Cache": x_cache})
+
+def _calcular_circuito(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zona_governante: Zona,
+    circuito: Circuito,
+    has_dr: bool
+) -> ResultadoDimensionamento:
     try:
         engine = DimensionadorProjeto()
-        
-        print("\n--- [DEBUG] PAYLOAD RECEBIDO EM /SIMULAR ---")
-        print(req.circuito.model_dump())
-        print("--------------------------------------------\n")
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload recebido em /simular", extra={"dados": {"circuito": circuito.model_dump(mode="json")}})
+
         # Como o engine é stateless, repassamos os dados de UI
-        resultado = engine.processar_circuito(
-            projeto=req.projeto,
-            locais=req.locais,
-            zona_governante=req.zona_governante,
-            circuito=req.circuito,
-            has_dr=req.has_dr
+        return engine.processar_circuito(
+            projeto=projeto,
+            locais=locais,
+            zona_governante=zona_governante,
+            circuito=circuito,
+            has_dr=has_dr
         )
         
-        return resultado
-        
     except Exception as e:
+        logger.exception("Erro fatal no motor de cálculo", extra={"dados": {"circuito_id": circuito.id}})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro fatal no Motor de Cálculo NBR 5410: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/simular-projeto", response_model=List[ResultadoDimensionamento])
+def simular_projeto(
+    req: SimulacaoProjetoRequest,
+    perfil: bool = PARAM_PERFIL,
+    perfil_alocacoes: bool = PARAM_PERFIL_ALOCACOES,
+    compacto: bool = PARAM_COMPACTO
+):
+    """
+    Dimensiona todos os circuitos de um projeto numa única chamada.
+    O contexto (Projeto, Locais, Zonas) é validado uma vez; cada circuito usa a zona de `zona_id`.
+    Falhas são isoladas por circuito (status 'nao_atende' com o erro em `erros_entrada`).
+    Circuitos já calculados (memória ou SQLite) não são recalculados.
+
+    Com `?perfil=true` todos os circuitos são recalculados e a resposta vira
+    `{"resultados": [...], "perfil": ...}` com o resumo do lote por etapa.
+    """
+    # Endpoint síncrono: o FastAPI o executa no threadpool, sem travar o event loop.
+    if perfil or perfil_alocacoes:
+        return _simular_lote_perfilado(
+            req.projeto, req.locais, req.zonas, req.circuitos, req.has_dr, perfil_alocacoes, compacto
+        )
+    return _simular_lote(req.projeto, req.locais, req.zonas, req.circuitos, req.has_dr, compacto)
+
+def _simular_lote(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zonas: List[Zona],
+    circuitos: List[Circuito],
+    has_dr: bool,
+    compacto: bool = False
+) -> Response:
+    contexto = digest_contexto(projeto, locais)
+    zonas_json = {z.id: (z, json_canonico(z)) for z in zonas}
+
+    chaves: List[Optional[str]] = []
+    for circuito in circuitos:
+        zona = zonas_json.get(circuito.zona_id)
+        chaves.append(
+            chave_simulacao(contexto, zona[0], circuito, has_dr, zona_json=zona[1]) if zona else None
+        )
+
+    corpos = {}
+    for chave in chaves:
+        if chave is not None and chave not in corpos:
+            corpo = cache_resultados.obter(chave)
+            if corpo is not None:
+                corpos[chave] = corpo
+
+    store = obter_resultado_store()
+    faltantes = [c for c in chaves if c is not None and c not in corpos]
+    if store and faltantes:
+        do_disco = store.obter_varios(faltantes)
+        for chave, corpo in do_disco.items():
+            cache_resultados.guardar(chave, corpo)
+        corpos.update(do_disco)
+
+    # Circuitos sem chave (zona desconhecida) vão ao motor só para gerar o resultado de erro
+    corpos_sem_chave = {}
+    pendentes = [(i, c) for i, c in enumerate(circuitos) if chaves[i] is None or chaves[i] not in corpos]
+    if pendentes:
+        engine = DimensionadorProjeto()
+        pool = obter_pool_calculo() if len(pendentes) >= settings.CALCULO_MIN_CIRCUITOS_POOL else None
+        resultados = engine.processar_projeto(
+            projeto=projeto,
+            locais=locais,
+            zonas=zonas,
+            circuitos=[c for _, c in pendentes],
+            has_dr=has_dr,
+            max_workers=settings.CALCULO_MAX_WORKERS if pool else 1,
+            executor=pool
+        )
+        novos = []
+        for (i, _), resultado in zip(pendentes, resultados):
+            corpo = serializar_resultado(resultado)
+            if chaves[i] is None:
+                corpos_sem_chave[i] = serializar_resultado(resultado, compacto=True) if compacto else corpo
+                continue
+            corpos[chaves[i]] = corpo
+            cache_resultados.guardar(chaves[i], corpo)
+            if compacto:
+                cache_resultados.guardar(chaves[i] + SUFIXO_COMPACTO, serializar_resultado(resultado, compacto=True))
+            novos.append((chaves[i], corpo))
+        if store:
+            store.salvar_lote(novos)
+
+    if compacto:
+        corpos = {chave: _corpo_compacto(chave, corpo) for chave, corpo in corpos.items()}
+    corpo_lista = juntar_lista(
+        corpos[chave] if chave is not None else corpos_sem_chave[i] for i, chave in enumerate(chaves)
+    )
+    return Response(content=corpo_lista, media_type="application/json")
+
+@router.post("/simular-projeto/stream")
+def simular_projeto_stream(req: SimulacaoProjetoRequest, compacto: bool = PARAM_COMPACTO):
+    """
+    Como /simular-projeto, mas a resposta é NDJSON (`application/x-ndjson`) enviada à medida
+    que os circuitos ficam prontos, na ordem de entrada:
+
+        {"tipo": "resultado", "dados": {...ResultadoDimensionamento...}}
+        ...
+        {"tipo": "resumo", "dados": {"total": ..., "por_status": {...}, "duracao_ms": ...}}
+
+    A memória do servidor não cresce com o tamanho do projeto: cada resultado é serializado,
+    enviado e descartado (o cache de resultados não é consultado nem alimentado).
+    Se o cliente desconectar, os lotes ainda não iniciados são cancelados.
+    """
+    return StreamingResponse(
+        _linhas_ndjson(req.projeto, req.locais, req.zonas, req.circuitos, req.has_dr, compacto),
+        media_type="application/x-ndjson",
+        headers={"X-Cache": "BYPASS"}
+    )
+
+def _linhas_ndjson(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zonas: List[Zona],
+    circuitos: List[Circuito],
+    has_dr: bool,
+    compacto: bool
+) -> Iterator[bytes]:
+    # Gerador síncrono: o Starlette o consome no threadpool. As linhas são agrupadas por até
+    # CALCULO_STREAM_INTERVALO_S para não pagar uma troca de thread por circuito.
+    inicio = ultimo_envio = perf_counter()
+    por_status = Counter()
+    pendentes: List[bytes] = []
+    pool = obter_pool_calculo() if len(circuitos) >= settings.CALCULO_MIN_CIRCUITOS_POOL else None
+    # Nada daqui vai para o cache: no modo compacto a memória de cálculo nem é registrada
+    resultados = DimensionadorProjeto(registrar_memoria=not compacto).iterar_projeto(
+        projeto, locais, zonas, circuitos, has_dr,
+        executor=pool,
+        tamanho_lote=settings.CALCULO_STREAM_TAMANHO_LOTE,
+        max_lotes_em_voo=2 * settings.CALCULO_MAX_WORKERS
+    )
+    try:
+        for resultado in resultados:
+            por_status[resultado.status_global.value] += 1
+            pendentes.append(b'{"tipo":"resultado","dados":' + serializar_resultado(resultado, compacto) + b'}\n')
+            agora = perf_counter()
+            if agora - ultimo_envio >= settings.CALCULO_STREAM_INTERVALO_S:
+                yield b"".join(pendentes)
+                pendentes.clear()
+                ultimo_envio = agora
+    finally:
+        resultados.close()
+
+    resumo = ResumoSimulacao(
+        total=sum(por_status.values()),
+        por_status=dict(por_status),
+        duracao_ms=(perf_counter() - inicio) * 1000
+    )
+    pendentes.append(dumps_json({"tipo": "resumo", "dados": resumo.model_dump()}) + b"\n")
+    yield b"".join(pendentes)
+
+def _corpo_compacto(chave: str, corpo: bytes) -> bytes:
+    chave_compacta = chave + SUFIXO_COMPACTO
+    compacto = cache_resultados.obter(chave_compacta)
+    if compacto is None:
+        compacto = compactar_corpo(corpo)
+        cache_resultados.guardar(chave_compacta, compacto)
+    return compacto
+
+
+# --- Perfilamento (debug): sempre recalcula, sem ler nem gravar caches ---
+
+def _verificar_perfil_habilitado():
+    if not settings.CALCULO_PERFIL_DEBUG:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Perfilamento desabilitado neste ambiente")
+
+def _server_timing(etapas: Iterable[Tuple[str, float]]) -> str:
+    return ", ".join(f"{nome};dur={duracao_ms:.3f}" for nome, duracao_ms in etapas)
+
+def _simular_circuito_perfilado(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zona_governante: Zona,
+    circuito: Circuito,
+    has_dr: bool,
+    medir_alocacoes: bool,
+    compacto: bool = False
+) -> Response:
+    _verificar_perfil_habilitado()
+    perfilador = PerfiladorEtapas(medir_alocacoes=medir_alocacoes)
+    try:
+        resultado = DimensionadorProjeto().processar_circuito(
+            projeto, locais, zona_governante, circuito, has_dr=has_dr, perfilador=perfilador
+        )
+    except Exception as e:
+        logger.exception("Erro fatal no motor de cálculo", extra={"dados": {"circuito_id": circuito.id}})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro fatal no Motor de Cálculo NBR 5410: {str(e)}"
+        )
+    finally:
+        perfilador.encerrar()
+
+    perfil = perfilador.circuitos[0]
+    corpo = (
+        b'{"resultado":' + serializar_resultado(resultado, compacto)
+        + b',"perfil":' + perfil.model_dump_json().encode('utf-8') + b'}'
+    )
+    return Response(content=corpo, media_type="application/json", headers={
+        "Server-Timing": _server_timing((e.etapa, e.duracao_ms) for e in perfil.etapas),
+        "X-Cache": "BYPASS",
+    })
+
+def _simular_lote_perfilado(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zonas: List[Zona],
+    circuitos: List[Circuito],
+    has_dr: bool,
+    medir_alocacoes: bool,
+    compacto: bool = False
+) -> Response:
+    _verificar_perfil_habilitado()
+    perfilador = PerfiladorEtapas(medir_alocacoes=medir_alocacoes)
+    pool = obter_pool_calculo() if len(circuitos) >= settings.CALCULO_MIN_CIRCUITOS_POOL else None
+    try:
+        resultados = DimensionadorProjeto().processar_projeto(
+            projeto=projeto,
+            locais=locais,
+            zonas=zonas,
+            circuitos=circuitos,
+            has_dr=has_dr,
+            max_workers=settings.CALCULO_MAX_WORKERS if pool else 1,
+            executor=pool,
+            perfilador=perfilador
+        )
+    finally:
+        perfilador.encerrar()
+
+    agregado = perfilador.agregar()
+    corpo = (
+        b'{"resultados":' + serializar_resultados(resultados, compacto)
+        + b',"perfil":' + agregado.model_dump_json().encode('utf-8') + b'}'
+    )
+    return Response(content=corpo, media_type="application/json", headers={
+        "Server-Timing": _server_timing((e.etapa, e.total_ms) for e in agregado.etapas),
+        "X-Cache": "BYPASS",
+    })
+
+
+# --- Simulação a partir das entidades persistidas (payload só com IDs) ---
+
+@router.post("/simular-por-id", response_model=ResultadoDimensionamento)
+def simular_por_id(
+    req: SimulacaoPorIdRequest,
+    if_none_match: Optional[str] = Header(default=None),
+    compacto: bool = PARAM_COMPACTO
+):
+    """
+    Igual a /simular, mas o contexto (Projeto, Locais, Zona) é hidratado do banco
+    a partir do circuito persistido.
+    """
+    circuito = repositorio_circuitos().obter(req.circuito_id)
+    if circuito is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Circuito não encontrado")
+    zona = repositorio_zonas().obter(circuito.zona_id)
+    if zona is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zona do circuito não encontrada")
+    projeto = repositorio_projetos().obter(zona.projeto_id)
+    if projeto is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto da zona não encontrado")
+    locais = repositorio_locais().listar_todos(projeto_id=projeto.id)
+    return _simular_circuito(projeto, locais, zona, circuito, req.has_dr, if_none_match, compacto)
+
+@router.post("/projetos/{projeto_id}/simular", response_model=List[ResultadoDimensionamento])
+def simular_projeto_por_id(projeto_id: str, has_dr: bool = False, compacto: bool = PARAM_COMPACTO):
+    """Dimensiona todos os circuitos persistidos do projeto (ver /simular-projeto)."""
+    projeto = repositorio_projetos().obter(projeto_id)
+    if projeto is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado")
+    return _simular_lote(
+        projeto,
+        repositorio_locais().listar_todos(projeto_id=projeto_id),
+        repositorio_zonas().listar_todos(projeto_id=projeto_id),
+        repositorio_circuitos().listar_todos(projeto_id=projeto_id),
+        has_dr,
+        compacto
+    )
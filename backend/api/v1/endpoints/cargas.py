@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Body
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Query, status, Body
+from typing import List, Dict, Optional
 import uuid
 from datetime import datetime
 from domain_core.schemas.carga import Carga, CargaCreate
 from domain_core.services.nbr5410_dimensionador import DimensionadorMinimoNBR
+from backend.repositories import Pagina, repositorio_cargas
 
 router = APIRouter()
 
@@ -20,36 +21,57 @@ def calcular_potencias(carga_in: CargaCreate):
         pot_w = pot_va * carga_in.fator_potencia
     return pot_w, pot_va
 
-# --- Endpoints CRUD (Mantidos até Fase 4 - Corte Controlado) ---
-
-@router.post("/", response_model=Carga, status_code=status.HTTP_201_CREATED)
-async def criar_carga(carga_in: CargaCreate):
+def _montar_carga(carga_id: str, carga_in: CargaCreate, data_criacao: datetime) -> Carga:
     pot_w, pot_va = calcular_potencias(carga_in)
-    nova_carga = Carga(
-        id=str(uuid.uuid4()), data_criacao=datetime.now(),
+    return Carga(
+        id=carga_id, data_criacao=data_criacao,
         nome=carga_in.nome, tipo=carga_in.tipo, quantidade=carga_in.quantidade,
         local_id=carga_in.local_id, potencia_va=round(pot_va, 2), potencia_w=round(pot_w, 2),
         fator_potencia=carga_in.fator_potencia,
         projeto_id=carga_in.projeto_id, # [NOVO] Repassando contexto
         zona_id=carga_in.zona_id        # [NOVO] Repassando contexto
     )
-    return nova_carga
 
-@router.put("/{carga_id}", response_model=Carga)
-async def atualizar_carga(carga_id: str, carga_in: CargaCreate):
-    pot_w, pot_va = calcular_potencias(carga_in)
-    carga_atualizada = Carga(
-        id=carga_id, data_criacao=datetime.now(), 
-        nome=carga_in.nome, tipo=carga_in.tipo, quantidade=carga_in.quantidade,
-        local_id=carga_in.local_id, potencia_va=round(pot_va, 2), potencia_w=round(pot_w, 2),
-        fator_potencia=carga_in.fator_potencia,
-        projeto_id=carga_in.projeto_id, # [NOVO]
-        zona_id=carga_in.zona_id        # [NOVO]
+# --- Endpoints CRUD (persistidos em SQLite) ---
+
+@router.get("/", response_model=Pagina[Carga])
+def listar_cargas(
+    projeto_id: Optional[str] = None,
+    zona_id: Optional[str] = None,
+    local_id: Optional[str] = None,
+    limite: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0)
+):
+    return repositorio_cargas().listar(
+        limite=limite, offset=offset, projeto_id=projeto_id, zona_id=zona_id, local_id=local_id
     )
-    return carga_atualizada
+
+@router.put("/lote", response_model=List[Carga])
+def salvar_cargas_lote(cargas: List[Carga]):
+    repositorio_cargas().salvar_lote(cargas)
+    return cargas
+
+@router.get("/{carga_id}", response_model=Carga)
+def obter_carga(carga_id: str):
+    carga = repositorio_cargas().obter(carga_id)
+    if carga is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Carga não encontrada")
+    return carga
+
+@router.post("/", response_model=Carga, status_code=status.HTTP_201_CREATED)
+def criar_carga(carga_in: CargaCreate):
+    nova_carga = _montar_carga(str(uuid.uuid4()), carga_in, datetime.now())
+    return repositorio_cargas().salvar(nova_carga)
+
+@router.put("/{carga_id}", response_model=Carga)
+def atualizar_carga(carga_id: str, carga_in: CargaCreate):
+    existente = repositorio_cargas().obter(carga_id)
+    carga_atualizada = _montar_carga(carga_id, carga_in, existente.data_criacao if existente else datetime.now())
+    return repositorio_cargas().salvar(carga_atualizada)
 
 @router.delete("/{carga_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_carga(carga_id: str):
+def deletar_carga(carga_id: str):
+    repositorio_cargas().remover(carga_id)
     return None
 
 # --- Endpoint de Cálculo (Refatorado para usar Service) ---
@@ -1,15 +1,13 @@
-from fastapi import APIRouter
-from typing import Dict, List
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from typing import Dict, List, Optional
 from domain_core.enums.circuitos import MetodoInstalacao, TipoCircuito, DESCRICOES_METODOS
+from domain_core.schemas.circuito import Circuito
+from backend.repositories import Pagina, repositorio_circuitos, repositorio_zonas
+from backend.core.respostas_estaticas import montar_resposta_estatica, responder_estatica
 
 router = APIRouter()
 
-@router.get("/opcoes", response_model=Dict[str, List[Dict[str, str]]])
-async def listar_opcoes_circuitos():
-    """
-    Retorna os Enums normativos para preencher os Selects do Frontend.
-    Garante que a UI use exatamente o que o Domain Core valida.
-    """
+def _montar_opcoes_circuitos() -> Dict[str, List[Dict[str, str]]]:
     return {
         "tipos": [
             {"codigo": e.value, "descricao": e.name.replace('_', ' ').title()} 
@@ -21,8 +19,55 @@ async def listar_opcoes_circuitos():
         ]
     }
 
+# Estático por deploy: serializado uma vez na importação
+_OPCOES_CIRCUITOS = montar_resposta_estatica(_montar_opcoes_circuitos())
+
+@router.get("/opcoes", response_model=Dict[str, List[Dict[str, str]]])
+async def listar_opcoes_circuitos(if_none_match: Optional[str] = Header(default=None)):
+    """
+    Retorna os Enums normativos para preencher os Selects do Frontend.
+    Garante que a UI use exatamente o que o Domain Core valida.
+    Resposta pré-serializada com ETag forte (304 com If-None-Match).
+    """
+    return responder_estatica(_OPCOES_CIRCUITOS, if_none_match)
+
+
+# --- Persistência de Circuitos (SQLite) ---
+# O Frontend continua dono do rascunho; estes endpoints permitem que o cálculo
+# seja disparado só com IDs (ver /calculos/simular-por-id).
+
+@router.get("/", response_model=Pagina[Circuito])
+def listar_circuitos(
+    projeto_id: Optional[str] = None,
+    zona_id: Optional[str] = None,
+    limite: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0)
+):
+    return repositorio_circuitos().listar(limite=limite, offset=offset, projeto_id=projeto_id, zona_id=zona_id)
+
+@router.put("/lote", response_model=List[Circuito])
+def salvar_circuitos_lote(circuitos: List[Circuito]):
+    """Upsert em lote. As zonas dos circuitos precisam estar persistidas (fornecem o projeto_id)."""
+    zonas = repositorio_zonas().obter_varios(sorted({c.zona_id for c in circuitos}))
+    faltantes = sorted({c.zona_id for c in circuitos if c.zona_id not in zonas})
+    if faltantes:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Zonas não persistidas: {', '.join(faltantes)}"
+        )
+    repositorio_circuitos().salvar_lote(
+        circuitos, [{"projeto_id": zonas[c.zona_id].projeto_id} for c in circuitos]
+    )
+    return circuitos
+
+@router.get("/{circuito_id}", response_model=Circuito)
+def obter_circuito(circuito_id: str):
+    circuito = repositorio_circuitos().obter(circuito_id)
+    if circuito is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Circuito não encontrado")
+    return circuito
 
-# --- FUTURO: Endpoints de CRUD de Circuitos (Fase 09 ou persistência real) ---
-# Por enquanto, como o PROJEL é stateless/local-first na Fase 08, 
-# a persistência do circuito acontece no JSON do Frontend.
-# Este endpoint serve apenas como "Oracle" de dados normativos.
\ No newline at end of file
+@router.delete("/{circuito_id}", status_code=status.HTTP_204_NO_CONTENT)
+def deletar_circuito(circuito_id: str):
+    repositorio_circuitos().remover(circuito_id)
+    return None
@@ -0,0 +1,91 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List
+
+from domain_core.schemas.resultados import ResultadoDimensionamento
+from backend.api.v1.endpoints.calculos import PARAM_COMPACTO, SimulacaoProjetoRequest
+from backend.core.config import settings
+from backend.core.jobs import FilaJobsCheia, Job, ProgressoJob, gerenciador_jobs
+from backend.core.serializacao import dumps_json
+
+router = APIRouter()
+
+def _obter_job(job_id: str) -> Job:
+    job = gerenciador_jobs.obter(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado (ou expirado)")
+    return job
+
+# submeter/cancelar são async de propósito: a fila e os eventos dos jobs vivem no event loop
+@router.post("/", response_model=ProgressoJob, status_code=status.HTTP_202_ACCEPTED)
+async def submeter_job(req: SimulacaoProjetoRequest, response: Response, compacto: bool = PARAM_COMPACTO):
+    """
+    Enfileira o dimensionamento de um projeto inteiro (mesmo corpo de /calculos/simular-projeto).
+    Acompanhe por GET /jobs/{id}/eventos (SSE) ou GET /jobs/{id}; o resultado fica em
+    GET /jobs/{id}/resultado depois de concluído.
+    """
+    try:
+        job = gerenciador_jobs.submeter(req.projeto, req.locais, req.zonas, req.circuitos, req.has_dr, compacto)
+    except FilaJobsCheia:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Fila de jobs cheia, tente mais tarde")
+    response.headers["Location"] = f"{settings.API_V1_STR}/jobs/{job.id}"
+    return job.progresso()
+
+@router.get("/{job_id}", response_model=ProgressoJob)
+def obter_job(job_id: str):
+    return _obter_job(job_id).progresso()
+
+@router.delete("/{job_id}", response_model=ProgressoJob)
+async def cancelar_job(job_id: str):
+    """Cancela o job (na fila ou em execução). Resultados parciais continuam em /resultado."""
+    _obter_job(job_id)
+    return gerenciador_jobs.cancelar(job_id).progresso()
+
+@router.get("/{job_id}/resultado", response_model=List[ResultadoDimensionamento])
+def obter_resultado_job(job_id: str):
+    job = _obter_job(job_id)
+    if not job.encerrado:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job ainda em andamento ({job.estado.value})")
+    return Response(content=job.corpo_resultados(), media_type="application/json")
+
+@router.get("/{job_id}/eventos")
+async def eventos_job(job_id: str):
+    """
+    Server-Sent Events com o progresso do job:
+
+        event: progresso      (a cada JOBS_INTERVALO_PROGRESSO_S enquanto roda)
+        event: fim            (estado final; o servidor encerra o fluxo em seguida)
+
+    Sem mudanças, o progresso é reenviado a cada JOBS_SSE_HEARTBEAT_S (mantém a conexão viva).
+
+    `data` é um ProgressoJob em JSON (concluidos, erros, por_status, eta_s...).
+    """
+    job = _obter_job(job_id)
+    return StreamingResponse(
+        _eventos(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _evento_sse(evento: str, numero: int, progresso: ProgressoJob) -> bytes:
+    return (
+        f"id: {numero}\nevent: {evento}\ndata: ".encode()
+        + dumps_json(progresso.model_dump(mode="json")) + b"\n\n"
+    )
+
+async def _eventos(job: Job) -> AsyncIterator[bytes]:
+    # A desconexão do cliente cancela este gerador (StreamingResponse)
+    numero = 0
+    while True:
+        mudanca = job.mudanca
+        progresso = job.progresso()
+        numero += 1
+        if job.encerrado:
+            yield _evento_sse("fim", numero, progresso)
+            return
+        yield _evento_sse("progresso", numero, progresso)
+        try:
+            await asyncio.wait_for(mudanca.wait(), settings.JOBS_SSE_HEARTBEAT_S)
+        except asyncio.TimeoutError:
+            pass
@@ -1,21 +1,46 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import List, Optional
 import uuid
 from datetime import datetime
 from domain_core.schemas.local import Local, LocalCreate
+from backend.repositories import Pagina, repositorio_locais
 
 router = APIRouter()
 
+@router.get("/", response_model=Pagina[Local])
+def listar_locais(
+    projeto_id: Optional[str] = None,
+    zona_id: Optional[str] = None,
+    limite: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0)
+):
+    return repositorio_locais().listar(limite=limite, offset=offset, projeto_id=projeto_id, zona_id=zona_id)
+
+@router.put("/lote", response_model=List[Local])
+def salvar_locais_lote(locais: List[Local]):
+    repositorio_locais().salvar_lote(locais)
+    return locais
+
+@router.get("/{local_id}", response_model=Local)
+def obter_local(local_id: str):
+    local = repositorio_locais().obter(local_id)
+    if local is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Local não encontrado")
+    return local
+
 @router.post("/", response_model=Local, status_code=status.HTTP_201_CREATED)
-async def criar_local(local_in: LocalCreate):
+def criar_local(local_in: LocalCreate):
     novo_local = Local(id=str(uuid.uuid4()), data_criacao=datetime.now(), **local_in.model_dump())
-    return novo_local
+    return repositorio_locais().salvar(novo_local)
 
 @router.put("/{local_id}", response_model=Local)
-async def atualizar_local(local_id: str, local_in: LocalCreate):
-    # Mock update
-    novo_local = Local(id=local_id, data_criacao=datetime.now(), **local_in.model_dump())
-    return novo_local
+def atualizar_local(local_id: str, local_in: LocalCreate):
+    existente = repositorio_locais().obter(local_id)
+    data_criacao = existente.data_criacao if existente else datetime.now()
+    novo_local = Local(id=local_id, data_criacao=data_criacao, **local_in.model_dump())
+    return repositorio_locais().salvar(novo_local)
 
 @router.delete("/{local_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_local(local_id: str):
-    return None
\ No newline at end of file
+def deletar_local(local_id: str):
+    repositorio_locais().remover(local_id)
+    return None
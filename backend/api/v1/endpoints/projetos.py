@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, status
+from domain_core.schemas.projeto import ProjetoEletrico
+from backend.repositories import repositorio_projetos
+
+router = APIRouter()
+
+@router.get("/{projeto_id}", response_model=ProjetoEletrico)
+def obter_projeto(projeto_id: str):
+    projeto = repositorio_projetos().obter(projeto_id)
+    if projeto is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado")
+    return projeto
+
+@router.put("/{projeto_id}", response_model=ProjetoEletrico)
+def salvar_projeto(projeto_id: str, projeto: ProjetoEletrico):
+    if projeto.id != projeto_id:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="ID do corpo difere do ID da rota")
+    return repositorio_projetos().salvar(projeto)
+
+@router.delete("/{projeto_id}", status_code=status.HTTP_204_NO_CONTENT)
+def deletar_projeto(projeto_id: str):
+    repositorio_projetos().remover(projeto_id)
+    return None
@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from backend.core.config import settings
+from backend.core.metricas import registro_metricas
 
 router = APIRouter()
 
@@ -9,4 +10,9 @@ def health_check():
 
 @router.get("/version", status_code=200)
 def version():
-    return {"version": "0.1.0", "engine": "NBR5410-Stateless"}
\ No newline at end of file
+    return {"version": "0.1.0", "engine": "NBR5410-Stateless"}
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas no formato de texto do Prometheus."""
+    return Response(content=registro_metricas.renderizar(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from typing import List, Dict, Any, Optional
 import uuid
 from datetime import datetime
 
@@ -9,35 +9,19 @@ from domain_core.enums.influencias import (
     CompetenciaPessoas, MateriaisConstrucao, EstruturaEdificacao,
     DESCRICOES_INFLUENCIAS
 )
+from domain_core.enums.zonas import PRESETS_ZONAS
+from backend.repositories import Pagina, repositorio_zonas
+from backend.core.respostas_estaticas import montar_resposta_estatica, responder_estatica
 
 router = APIRouter()
 
-# --- PRESETS (Mantidos) ---
-PRESETS = {
-    "residencial": [
-        {"id": "res_seca", "nome": "Área Seca (Sala/Quarto)", "descricao": "Ambientes internos sem risco de água.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#81C784"},
-        {"id": "res_molhada", "nome": "Área Molhada (Banheiro/Cozinha)", "descricao": "Locais com presença de água. Exige DR.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD2", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#64B5F6"},
-        {"id": "res_garagem", "nome": "Garagem / Área de Serviço", "descricao": "Umidade eventual e poeira.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD2", "presenca_solidos": "AE2", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#FFB74D"},
-        {"id": "res_externa", "nome": "Área Externa", "descricao": "Exposição ao tempo.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD4", "presenca_solidos": "AE2", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#A1887F"}
-    ],
-    "comercial": [
-        {"id": "com_admin", "nome": "Área Administrativa", "descricao": "Escritórios.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#90CAF9"},
-        {"id": "com_publico", "nome": "Atendimento ao Público", "descricao": "Lojas e recepções.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#CE93D8"}
-    ]
-}
-
 def find_preset(preset_id: str):
-    for cat in PRESETS.values():
+    for cat in PRESETS_ZONAS.values():
         for p in cat:
             if p['id'] == preset_id: return p
     return None
 
-@router.get("/presets/{tipo_projeto}", response_model=List[Dict[str, Any]])
-async def listar_presets(tipo_projeto: str):
-    return PRESETS.get(tipo_projeto.lower(), [])
-
-@router.get("/opcoes-influencias", response_model=Dict[str, List[Dict[str, str]]])
-async def listar_opcoes_influencias():
+def _montar_opcoes_influencias() -> Dict[str, List[Dict[str, str]]]:
     def enum_to_list(enum_cls):
         return [{"codigo": e.value, "descricao": DESCRICOES_INFLUENCIAS.get(e.value, e.value)} for e in enum_cls]
     return {
@@ -49,8 +33,21 @@ async def listar_opcoes_influencias():
         "estrutura": enum_to_list(EstruturaEdificacao),
     }
 
-@router.post("/", response_model=Zona, status_code=status.HTTP_201_CREATED)
-async def validar_criar_zona(zona_in: ZonaCreate):
+# Estáticos por deploy: serializados uma vez na importação
+_OPCOES_INFLUENCIAS = montar_resposta_estatica(_montar_opcoes_influencias())
+_PRESETS_POR_TIPO = {tipo: montar_resposta_estatica(presets) for tipo, presets in PRESETS_ZONAS.items()}
+_PRESETS_VAZIO = montar_resposta_estatica([])
+
+@router.get("/presets/{tipo_projeto}", response_model=List[Dict[str, Any]])
+async def listar_presets(tipo_projeto: str, if_none_match: Optional[str] = Header(default=None)):
+    return responder_estatica(_PRESETS_POR_TIPO.get(tipo_projeto.lower(), _PRESETS_VAZIO), if_none_match)
+
+@router.get("/opcoes-influencias", response_model=Dict[str, List[Dict[str, str]]])
+async def listar_opcoes_influencias(if_none_match: Optional[str] = Header(default=None)):
+    """Enums de influências externas com descrições (pré-serializado, ETag forte)."""
+    return responder_estatica(_OPCOES_INFLUENCIAS, if_none_match)
+
+def _montar_zona(zona_id: str, zona_in: ZonaCreate, data_criacao: datetime) -> Zona:
     dados_finais = zona_in.model_dump()
     if zona_in.origem == 'preset' and zona_in.preset_id:
         preset = find_preset(zona_in.preset_id)
@@ -61,17 +58,42 @@ async def validar_criar_zona(zona_in: ZonaCreate):
         else:
             dados_finais['origem'] = 'custom'
 
-    nova_zona = Zona(id=str(uuid.uuid4()), data_criacao=datetime.now(), **dados_finais)
-    return nova_zona
+    return Zona(id=zona_id, data_criacao=data_criacao, **dados_finais)
+
+@router.get("/", response_model=Pagina[Zona])
+def listar_zonas(
+    projeto_id: Optional[str] = None,
+    limite: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0)
+):
+    return repositorio_zonas().listar(limite=limite, offset=offset, projeto_id=projeto_id)
+
+@router.put("/lote", response_model=List[Zona])
+def salvar_zonas_lote(zonas: List[Zona]):
+    """Upsert em lote (ex: sincronização inicial do projeto do Frontend)."""
+    repositorio_zonas().salvar_lote(zonas)
+    return zonas
+
+@router.get("/{zona_id}", response_model=Zona)
+def obter_zona(zona_id: str):
+    zona = repositorio_zonas().obter(zona_id)
+    if zona is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zona não encontrada")
+    return zona
+
+@router.post("/", response_model=Zona, status_code=status.HTTP_201_CREATED)
+def validar_criar_zona(zona_in: ZonaCreate):
+    nova_zona = _montar_zona(str(uuid.uuid4()), zona_in, datetime.now())
+    return repositorio_zonas().salvar(nova_zona)
 
 @router.put("/{zona_id}", response_model=Zona)
-async def atualizar_zona(zona_id: str, zona_in: ZonaCreate):
-    # Simula update: Recria objeto mantendo ID
-    # Em produção: DB UPDATE ... WHERE id = zona_id
-    zona_atualizada = await validar_criar_zona(zona_in)
-    zona_atualizada.id = zona_id # Mantém ID antigo
-    return zona_atualizada
+def atualizar_zona(zona_id: str, zona_in: ZonaCreate):
+    # Mantém ID e data de criação originais (se a zona já existir)
+    existente = repositorio_zonas().obter(zona_id)
+    zona_atualizada = _montar_zona(zona_id, zona_in, existente.data_criacao if existente else datetime.now())
+    return repositorio_zonas().salvar(zona_atualizada)
 
 @router.delete("/{zona_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_zona(zona_id: str):
-    return None
\ No newline at end of file
+def deletar_zona(zona_id: str):
+    repositorio_zonas().remover(zona_id)
+    return None
@@ -0,0 +1,3 @@
+"""
+Benchmarks da API (serialização e compressão). Não fazem parte da suíte de testes padrão.
+"""
@@ -0,0 +1,14 @@
+"""
+Benchmarks da API (serialização e compressão das respostas), com o executor e as baselines
+locais da suíte do motor (ver domain_core/benchmarks/__main__.py):
+
+    python -m backend.benchmarks             # compara com a última baseline salva
+    python -m backend.benchmarks --salvar    # salva uma nova baseline
+"""
+import os
+import sys
+
+from domain_core.benchmarks.__main__ import main
+
+if __name__ == '__main__':
+    sys.exit(main(diretorio=os.path.dirname(os.path.abspath(__file__))))
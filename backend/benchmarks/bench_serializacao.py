@@ -0,0 +1,62 @@
+"""
+Benchmarks de serialização de lotes de 1k `ResultadoDimensionamento` (corpo de /simular-projeto).
+O `extra_info` de cada benchmark traz o tamanho do corpo; a vazão (MB/s) é bytes / tempo mínimo.
+
+Compara o caminho usado pela API (backend.core.serializacao) com as alternativas óbvias:
+pydantic por item, `model_dump()` + orjson e a stdlib `json`. Também mede o modo compacto
+(sem `memoria`) e a compressão gzip/br aplicada pelo middleware.
+"""
+import json
+
+import pytest
+
+from backend.core import compressao
+from backend.core.serializacao import (
+    compactar_corpo, dumps_json, juntar_lista, orjson, serializar_resultado, serializar_resultados
+)
+from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
+from domain_core.services.gerador_projeto_sintetico import GeradorProjetoSintetico, ParametrosGerador
+
+NUM_RESULTADOS = 1_000
+RODADAS = 20
+
+@pytest.fixture(scope="module")
+def resultados():
+    projeto = GeradorProjetoSintetico(ParametrosGerador(num_circuitos=NUM_RESULTADOS)).gerar()
+    return DimensionadorProjeto().processar_projeto(
+        projeto.projeto, projeto.locais, projeto.zonas, projeto.circuitos
+    )
+
+def _medir(benchmark, executar):
+    corpo = benchmark.pedantic(executar, rounds=RODADAS, warmup_rounds=1)
+    benchmark.extra_info["bytes"] = len(corpo)
+    return corpo
+
+def test_serializacao_api_completo(benchmark, resultados):
+    _medir(benchmark, lambda: serializar_resultados(resultados))
+
+def test_serializacao_api_compacto(benchmark, resultados):
+    _medir(benchmark, lambda: serializar_resultados(resultados, compacto=True))
+
+def test_serializacao_api_por_item(benchmark, resultados):
+    """Como o lote é montado a partir do cache: um corpo por resultado, juntados em lista."""
+    _medir(benchmark, lambda: juntar_lista(serializar_resultado(r) for r in resultados))
+
+def test_serializacao_compactar_do_cache(benchmark, resultados):
+    corpos = [serializar_resultado(r) for r in resultados]
+    _medir(benchmark, lambda: juntar_lista(compactar_corpo(c) for c in corpos))
+
+def test_serializacao_pydantic_model_dump_json(benchmark, resultados):
+    _medir(benchmark, lambda: juntar_lista(r.model_dump_json().encode("utf-8") for r in resultados))
+
+@pytest.mark.skipif(orjson is None, reason="orjson não instalado")
+def test_serializacao_orjson_model_dump(benchmark, resultados):
+    _medir(benchmark, lambda: dumps_json([r.model_dump() for r in resultados]))
+
+def test_serializacao_stdlib_json(benchmark, resultados):
+    _medir(benchmark, lambda: json.dumps([r.model_dump(mode="json") for r in resultados]).encode("utf-8"))
+
+@pytest.mark.parametrize("codificacao", compressao.CODIFICACOES)
+def test_serializacao_compressao(benchmark, resultados, codificacao):
+    corpo = serializar_resultados(resultados)
+    _medir(benchmark, lambda: compressao.comprimir(corpo, codificacao))
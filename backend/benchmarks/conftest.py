@@ -0,0 +1,8 @@
+"""
+Fixtures dos benchmarks da API (pytest-benchmark, em requirements-dev.txt). Os arquivos
+`bench_*.py` não rodam com a suíte de testes normal: use `python -m backend.benchmarks`.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from backend.core.config import settings
+from domain_core.engine.normative_repository import NormativeRepository
+
+# Incrementar quando o formato do resultado ou a lógica do motor mudarem
+# de forma que respostas antigas deixem de ser válidas para a mesma entrada.
+FORMATO_CACHE = 1
+
+def json_canonico(modelo: Any) -> bytes:
+    """JSON normalizado pelo pydantic (defaults preenchidos, Enums como valor) com chaves ordenadas."""
+    if isinstance(modelo, BaseModel):
+        modelo = modelo.model_dump(mode='json')
+    elif isinstance(modelo, list):
+        modelo = [m.model_dump(mode='json') if isinstance(m, BaseModel) else m for m in modelo]
+    return json.dumps(modelo, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def digest_contexto(projeto: BaseModel, locais: List[BaseModel]) -> "hashlib._Hash":
+    """
+    Estado parcial do hash com a parte da simulação comum a todos os circuitos de um projeto.
+    Em lotes, é calculado uma vez e copiado para cada circuito.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{FORMATO_CACHE}:{NormativeRepository().versao_dados}:".encode())
+    digest.update(json_canonico(projeto))
+    digest.update(b"|")
+    digest.update(json_canonico(locais))
+    return digest
+
+def chave_simulacao(contexto: "hashlib._Hash", zona: BaseModel, circuito: BaseModel, has_dr: bool,
+                    zona_json: Optional[bytes] = None) -> str:
+    """
+    Hash canônico de uma simulação de circuito (contexto do projeto + zona + circuito + DR),
+    somado à versão dos dados normativos. Mesma entrada -> mesma chave em qualquer endpoint.
+    """
+    digest = contexto.copy()
+    digest.update(b"|")
+    digest.update(zona_json if zona_json is not None else json_canonico(zona))
+    digest.update(b"|")
+    digest.update(json_canonico(circuito))
+    digest.update(b"|1" if has_dr else b"|0")
+    return digest.hexdigest()
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """Avalia o cabeçalho If-None-Match (lista de ETags, fracas ou fortes, ou '*')."""
+    if not if_none_match:
+        return False
+    for candidato in if_none_match.split(','):
+        candidato = candidato.strip()
+        if candidato.startswith('W/'):
+            candidato = candidato[2:]
+        if candidato == '*' or candidato == etag:
+            return True
+    return False
+
+class CacheResultados:
+    """
+    Cache em memória do processo para respostas já serializadas (bytes JSON).
+    Despejo por LRU, por número de itens, por tamanho total em bytes e por TTL.
+    """
+
+    def __init__(self, max_itens: int, max_bytes: int, ttl_s: float):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._itens: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes_total = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            expira_em, corpo = item
+            if expira_em < time.monotonic():
+                self._remover(chave)
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return corpo
+
+    def guardar(self, chave: str, corpo: bytes):
+        if len(corpo) > self.max_bytes:
+            return
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (time.monotonic() + self.ttl_s, corpo)
+            self._bytes_total += len(corpo)
+            while len(self._itens) > self.max_itens or self._bytes_total > self.max_bytes:
+                self._remover(next(iter(self._itens)))
+
+    def _remover(self, chave: str):
+        _, corpo = self._itens.pop(chave)
+        self._bytes_total -= len(corpo)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes_total = 0
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "itens": len(self._itens),
+                "bytes": self._bytes_total,
+            }
+
+cache_resultados = CacheResultados(
+    max_itens=settings.RESULTADO_CACHE_MAX_ITENS,
+    max_bytes=settings.RESULTADO_CACHE_MAX_BYTES,
+    ttl_s=settings.RESULTADO_CACHE_TTL_S,
+)
@@ -0,0 +1,170 @@
+"""
+Compressão de respostas negociada por Accept-Encoding: brotli (se o pacote `brotli` estiver
+instalado) ou gzip. Respostas JSON de lotes grandes caem para ~6% do tamanho.
+
+Middleware ASGI puro: respostas completas são comprimidas de uma vez; respostas em streaming
+(`more_body`) são comprimidas por pedaço com flush, para que cada pedaço chegue ao cliente
+sem esperar o fim do corpo.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from backend.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # dependência opcional
+    brotli = None
+
+CODIFICACOES = ("br", "gzip") if brotli is not None else ("gzip",)
+# SSE fica de fora: proxies e navegadores lidam mal com event-stream comprimido
+_TIPOS_EXCLUIDOS = ("text/event-stream",)
+
+def negociar_codificacao(accept_encoding: Optional[str]) -> Optional[str]:
+    """Escolhe a codificação suportada de maior q-valor (empate: ordem de CODIFICACOES)."""
+    if not accept_encoding:
+        return None
+    aceitas = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.strip().partition(";")
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        aceitas[nome.strip().lower()] = q
+    melhor, melhor_q = None, 0.0
+    for codificacao in CODIFICACOES:
+        q = aceitas.get(codificacao, aceitas.get("*", 0.0))
+        if q > melhor_q:
+            melhor, melhor_q = codificacao, q
+    return melhor
+
+class Compressor:
+    """Compressor incremental para uma codificação ('gzip' ou 'br')."""
+    __slots__ = ("_gzip", "_brotli")
+
+    def __init__(self, codificacao: str):
+        self._gzip = self._brotli = None
+        if codificacao == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSAO_QUALIDADE_BROTLI)
+        else:
+            self._gzip = zlib.compressobj(settings.COMPRESSAO_NIVEL_GZIP, zlib.DEFLATED, 31)
+
+    def comprimir(self, dados: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            saida = self._brotli.process(dados)
+            return saida + (self._brotli.finish() if final else self._brotli.flush())
+        saida = self._gzip.compress(dados)
+        return saida + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+def comprimir(dados: bytes, codificacao: str) -> bytes:
+    return Compressor(codificacao).comprimir(dados, final=True)
+
+def _compressivel(cabecalhos: Headers) -> bool:
+    if "content-encoding" in cabecalhos:
+        return False
+    tipo = cabecalhos.get("content-type", "")
+    if tipo.startswith(_TIPOS_EXCLUIDOS):
+        return False
+    return tipo.startswith("text/") or "json" in tipo
+
+def etag_codificado(etag: str, codificacao: str) -> str:
+    """ETag forte próprio de cada codificação: '"abc"' -> '"abc-gzip"'."""
+    return f'{etag[:-1]}-{codificacao}"'
+
+def _etags_sem_codificacao(if_none_match: str) -> str:
+    """Tira o sufixo de codificação dos ETags do If-None-Match (os endpoints só conhecem o ETag base)."""
+    candidatos = []
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        for codificacao in CODIFICACOES:
+            sufixo = f'-{codificacao}"'
+            if candidato.endswith(sufixo):
+                candidato = candidato[:-len(sufixo)] + '"'
+                break
+        candidatos.append(candidato)
+    return ", ".join(candidatos)
+
+class MiddlewareCompressao:
+    """
+    Comprime respostas JSON/texto quando o cliente aceita br/gzip e o corpo passa de
+    `COMPRESSAO_MIN_BYTES`. Os bytes mudam com a codificação, então o ETag continua forte
+    mas ganha o sufixo dela (`"<hash>-br"`, `"<hash>-gzip"`), com `Vary: Accept-Encoding`.
+    No If-None-Match o sufixo é removido antes de chegar ao endpoint, e o 304 devolve o
+    ETag que o cliente enviou.
+    """
+
+    def __init__(self, app, minimo_bytes: Optional[int] = None):
+        self.app = app
+        self.minimo_bytes = settings.COMPRESSAO_MIN_BYTES if minimo_bytes is None else minimo_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cabecalhos_requisicao = Headers(scope=scope)
+        codificacao = negociar_codificacao(cabecalhos_requisicao.get("accept-encoding"))
+        if_none_match = cabecalhos_requisicao.get("if-none-match")
+        if if_none_match and codificacao is not None:
+            base = _etags_sem_codificacao(if_none_match)
+            if base != if_none_match:
+                scope = dict(scope)
+                scope["headers"] = [
+                    (nome, base.encode("latin-1") if nome == b"if-none-match" else valor)
+                    for nome, valor in scope["headers"]
+                ]
+        inicio = None
+        compressor: Optional[Compressor] = None
+
+        async def send_comprimido(mensagem):
+            nonlocal inicio, compressor
+            tipo = mensagem["type"]
+            if tipo == "http.response.start":
+                # Segura o início até saber o tamanho do primeiro pedaço do corpo
+                inicio = mensagem
+                return
+            if tipo != "http.response.body":
+                await send(mensagem)
+                return
+
+            corpo = mensagem.get("body", b"")
+            mais = mensagem.get("more_body", False)
+            if inicio is None:
+                # Pedaços seguintes de uma resposta em streaming
+                if compressor is not None:
+                    mensagem = {"type": tipo, "body": compressor.comprimir(corpo, final=not mais), "more_body": mais}
+                await send(mensagem)
+                return
+
+            cabecalhos = MutableHeaders(scope=inicio)
+            if inicio["status"] == 304:
+                # O 304 repete o Vary do 200; na revalidação de uma cópia comprimida o
+                # cliente conhece o ETag com sufixo
+                cabecalhos.add_vary_header("Accept-Encoding")
+                etag = cabecalhos.get("etag")
+                if etag and codificacao is not None and etag_codificado(etag, codificacao) in (if_none_match or ""):
+                    cabecalhos["ETag"] = etag_codificado(etag, codificacao)
+            elif _compressivel(cabecalhos) and inicio["status"] != 204:
+                cabecalhos.add_vary_header("Accept-Encoding")
+                if codificacao is not None and (mais or len(corpo) >= self.minimo_bytes):
+                    compressor = Compressor(codificacao)
+                    corpo = compressor.comprimir(corpo, final=not mais)
+                    cabecalhos["Content-Encoding"] = codificacao
+                    if "content-length" in cabecalhos:
+                        del cabecalhos["content-length"]
+                    if not mais:
+                        cabecalhos["Content-Length"] = str(len(corpo))
+                    etag = cabecalhos.get("etag")
+                    if etag:
+                        cabecalhos["ETag"] = etag_codificado(etag, codificacao)
+            await send(inicio)
+            inicio = None
+            await send({"type": tipo, "body": corpo, "more_body": mais})
+
+        await self.app(scope, receive, send_comprimido)
@@ -1,5 +1,11 @@
+from pathlib import Path
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+# Raiz do repositório: caminhos relativos da configuração não dependem do diretório de trabalho
+RAIZ_PROJETO = Path(__file__).resolve().parents[2]
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "PROJEL API"
     API_V1_STR: str = "/api/v1"
@@ -7,7 +13,61 @@ class Settings(BaseSettings):
     # Em produção, isso deve ser restrito ao domínio do Frontend (Vercel)
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
 
+    # Dimensionamento em lote (/calculos/simular-projeto)
+    # 1 = processa no próprio worker do uvicorn; > 1 = pool de processos compartilhado
+    CALCULO_MAX_WORKERS: int = 1
+    # Abaixo deste número de circuitos o custo de serializar para o pool não compensa
+    CALCULO_MIN_CIRCUITOS_POOL: int = 200
+    # Permite ?perfil=true / ?perfil_alocacoes=true em /calculos (tempo e memória por etapa).
+    # O tracemalloc é global ao processo: habilite só em desenvolvimento (CALCULO_PERFIL_DEBUG=true).
+    CALCULO_PERFIL_DEBUG: bool = False
+    # /calculos/simular-projeto/stream: circuitos por lote enviado ao pool (até 2 lotes por worker
+    # em andamento) e intervalo máximo entre envios de linhas NDJSON acumuladas
+    CALCULO_STREAM_TAMANHO_LOTE: int = 64
+    CALCULO_STREAM_INTERVALO_S: float = 0.05
+
+    # Jobs em segundo plano (/jobs): execução simultânea, limite de jobs não encerrados,
+    # retenção dos encerrados e cadência dos eventos SSE
+    JOBS_MAX_CONCORRENTES: int = 1
+    JOBS_MAX_ATIVOS: int = 32
+    JOBS_RETENCAO_S: float = 600.0
+    JOBS_INTERVALO_PROGRESSO_S: float = 0.25
+    JOBS_SSE_HEARTBEAT_S: float = 15.0
+
+    # Cache de resultados de /calculos/simular (memória do processo)
+    RESULTADO_CACHE_MAX_ITENS: int = 2048
+    RESULTADO_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESULTADO_CACHE_TTL_S: float = 3600.0
+
+    # Respostas estáticas por deploy (/circuitos/opcoes, /zonas/opcoes-influencias, /zonas/presets)
+    RESPOSTAS_ESTATICAS_MAX_AGE_S: int = 86400
+
+    # Compressão de respostas (br se o pacote brotli estiver instalado, senão gzip)
+    COMPRESSAO_MIN_BYTES: int = 1024
+    COMPRESSAO_NIVEL_GZIP: int = 5
+    COMPRESSAO_QUALIDADE_BROTLI: int = 4
+
+    # Logging estruturado (logger "projel"): "json" ou "texto"
+    LOG_NIVEL: str = "INFO"
+    LOG_FORMATO: str = "json"
+
+    # Persistência (SQLite). Caminho relativo = relativo à raiz do projeto
+    DATABASE_PATH: str = "projel.db"
+    DATABASE_POOL_SIZE: int = 4
+    # Resultados calculados vão para o banco e são reaproveitados após reinícios;
+    # os mais antigos saem ao passar da idade ou da quantidade máximas
+    RESULTADOS_PERSISTIR: bool = True
+    RESULTADOS_MAX_ITENS: int = 100_000
+    RESULTADOS_TTL_S: float = 30 * 86400.0
+
+    @field_validator("DATABASE_PATH")
+    @classmethod
+    def resolver_caminho_banco(cls, caminho: str) -> str:
+        if caminho == ":memory:":
+            return caminho
+        return str(RAIZ_PROJETO / caminho)
+
     class Config:
         case_sensitive = True
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
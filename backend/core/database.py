@@ -0,0 +1,92 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from backend.core.config import settings
+
+class PoolConexoesSQLite:
+    """
+    Pool simples de conexões SQLite reaproveitadas entre requisições.
+    Todas as conexões usam WAL: leitores não bloqueiam o escritor e vice-versa.
+    """
+
+    def __init__(self, caminho: str, tamanho: int = 4):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self._livres: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._criadas = 0
+        self._lock = threading.Lock()
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _nova_conexao(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.caminho, check_same_thread=False, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _criar_ou_esperar(self) -> sqlite3.Connection:
+        with self._lock:
+            criar = self._criadas < self.tamanho
+            if criar:
+                self._criadas += 1
+        if not criar:
+            return self._livres.get()
+        try:
+            return self._nova_conexao()
+        except Exception:
+            # Devolve a vaga: senão, após `tamanho` falhas (disco cheio, permissão) todos esperariam para sempre
+            with self._lock:
+                self._criadas -= 1
+            raise
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão; commit ao final do bloco, rollback em caso de erro."""
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            conn = self._criar_ou_esperar()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._livres.put(conn)
+
+    def fechar(self):
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._criadas = 0
+
+_pool: Optional[PoolConexoesSQLite] = None
+_pool_lock = threading.Lock()
+
+def obter_pool_db() -> PoolConexoesSQLite:
+    """Pool compartilhado do banco da aplicação (settings.DATABASE_PATH)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolConexoesSQLite(settings.DATABASE_PATH, settings.DATABASE_POOL_SIZE)
+        return _pool
+
+def fechar_pool_db():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+            _pool = None
@@ -0,0 +1,29 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from backend.core.config import settings
+
+# Pool compartilhado entre requisições: criar processos a cada chamada custaria mais
+# que o próprio dimensionamento de um projeto inteiro.
+_pool: Optional[ProcessPoolExecutor] = None
+# Handlers síncronos rodam no threadpool: duas primeiras requisições simultâneas não podem
+# criar dois pools (um deles ficaria órfão)
+_pool_lock = threading.Lock()
+
+def obter_pool_calculo() -> Optional[ProcessPoolExecutor]:
+    """Retorna o pool de processos do motor, ou None se o cálculo em lote for sequencial."""
+    global _pool
+    if settings.CALCULO_MAX_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.CALCULO_MAX_WORKERS)
+        return _pool
+
+def encerrar_pool_calculo():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
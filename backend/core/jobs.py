@@ -0,0 +1,233 @@
+"""
+Jobs de dimensionamento em segundo plano (projetos inteiros), com progresso observável.
+
+- Fila em memória (asyncio.Queue) consumida por `JOBS_MAX_CONCORRENTES` tarefas asyncio,
+  iniciadas no lifespan da app. Cada job roda numa thread própria (executor dedicado, fora do
+  threadpool das requisições) e, acima de CALCULO_MIN_CIRCUITOS_POOL circuitos, distribui os
+  lotes no pool de processos do motor, como /calculos/simular-projeto.
+- A thread publica o progresso no loop (no máximo a cada JOBS_INTERVALO_PROGRESSO_S);
+  assinantes (SSE) esperam pelo próximo aviso em `job.mudanca`.
+- Cancelamento cooperativo: verificado a cada circuito; os lotes ainda não iniciados no pool
+  são cancelados. Jobs na fila são cancelados sem rodar.
+- Jobs encerrados (e seus resultados, em bytes JSON) ficam disponíveis por JOBS_RETENCAO_S.
+  Tudo vive no processo: com vários workers do uvicorn, cada um tem os seus jobs.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from backend.core.config import settings
+from backend.core.executor import obter_pool_calculo
+from backend.core.serializacao import juntar_lista, serializar_resultado
+from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
+from domain_core.engine.log_estruturado import obter_logger
+from domain_core.schemas.circuito import Circuito
+from domain_core.schemas.local import Local
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.resultados import StatusDimensionamento
+from domain_core.schemas.zona import Zona
+
+logger = obter_logger("api.jobs")
+
+class EstadoJob(str, Enum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    CANCELADO = "cancelado"
+    FALHOU = "falhou"
+
+ESTADOS_FINAIS = {EstadoJob.CONCLUIDO, EstadoJob.CANCELADO, EstadoJob.FALHOU}
+
+class ProgressoJob(BaseModel):
+    id: str
+    estado: EstadoJob
+    total: int
+    concluidos: int
+    erros: int
+    por_status: Dict[str, int]
+    decorrido_s: float
+    eta_s: Optional[float] = None
+    mensagem_erro: Optional[str] = None
+
+class FilaJobsCheia(Exception):
+    pass
+
+class Job:
+    def __init__(self, projeto: ProjetoEletrico, locais: List[Local], zonas: List[Zona],
+                 circuitos: List[Circuito], has_dr: bool, compacto: bool):
+        self.id = uuid.uuid4().hex
+        self.projeto = projeto
+        self.locais = locais
+        self.zonas = zonas
+        self.circuitos = circuitos
+        self.total = len(circuitos)
+        self.has_dr = has_dr
+        self.compacto = compacto
+        self.estado = EstadoJob.PENDENTE
+        self.por_status: Counter = Counter()
+        self.concluidos = 0
+        self.resultados: List[bytes] = []
+        self.mensagem_erro: Optional[str] = None
+        self.inicio: Optional[float] = None
+        self.fim: Optional[float] = None
+        self.cancelamento = threading.Event()
+        self._mudanca = asyncio.Event()
+
+    @property
+    def encerrado(self) -> bool:
+        return self.estado in ESTADOS_FINAIS
+
+    def progresso(self) -> ProgressoJob:
+        decorrido = 0.0
+        if self.inicio is not None:
+            decorrido = (self.fim or time.monotonic()) - self.inicio
+        eta = None
+        if self.estado == EstadoJob.EXECUTANDO and self.concluidos:
+            eta = decorrido / self.concluidos * (self.total - self.concluidos)
+        por_status = dict(self.por_status)
+        return ProgressoJob(
+            id=self.id,
+            estado=self.estado,
+            total=self.total,
+            concluidos=self.concluidos,
+            erros=por_status.get(StatusDimensionamento.ERRO.value, 0),
+            por_status=por_status,
+            decorrido_s=decorrido,
+            eta_s=eta,
+            mensagem_erro=self.mensagem_erro,
+        )
+
+    def corpo_resultados(self) -> bytes:
+        return juntar_lista(self.resultados)
+
+    @property
+    def mudanca(self) -> asyncio.Event:
+        """
+        Evento disparado no próximo aviso de progresso. Obtenha-o *antes* de ler o estado:
+        assim nenhum aviso se perde entre a leitura e a espera.
+        """
+        return self._mudanca
+
+    def _sinalizar(self):
+        # Só no loop: acorda quem espera e arma um novo evento para a próxima mudança
+        mudanca, self._mudanca = self._mudanca, asyncio.Event()
+        mudanca.set()
+
+class GerenciadorJobs:
+    """Os métodos públicos (exceto `obter`) devem ser chamados no event loop da app."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefas: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def iniciar(self):
+        self._loop = asyncio.get_running_loop()
+        self._fila = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=settings.JOBS_MAX_CONCORRENTES, thread_name_prefix="projel-job")
+        self._tarefas = [asyncio.create_task(self._consumir()) for _ in range(settings.JOBS_MAX_CONCORRENTES)]
+
+    async def encerrar(self):
+        for job in self._jobs.values():
+            if not job.encerrado:
+                job.cancelamento.set()
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._fila = None
+
+    def submeter(self, projeto: ProjetoEletrico, locais: List[Local], zonas: List[Zona],
+                 circuitos: List[Circuito], has_dr: bool = False, compacto: bool = False) -> Job:
+        if self._fila is None:
+            raise RuntimeError("GerenciadorJobs não iniciado (lifespan da app)")
+        self._expurgar()
+        if sum(1 for j in self._jobs.values() if not j.encerrado) >= settings.JOBS_MAX_ATIVOS:
+            raise FilaJobsCheia()
+        job = Job(projeto, locais, zonas, circuitos, has_dr, compacto)
+        self._jobs[job.id] = job
+        self._fila.put_nowait(job)
+        return job
+
+    def obter(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancelar(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.encerrado:
+            return job
+        job.cancelamento.set()
+        if job.estado == EstadoJob.PENDENTE:
+            self._finalizar(job, EstadoJob.CANCELADO)
+        return job
+
+    def _expurgar(self):
+        limite = time.monotonic() - settings.JOBS_RETENCAO_S
+        for job_id in [i for i, j in self._jobs.items() if j.encerrado and j.fim is not None and j.fim < limite]:
+            del self._jobs[job_id]
+
+    def _finalizar(self, job: Job, estado: EstadoJob, mensagem_erro: Optional[str] = None):
+        job.estado = estado
+        job.mensagem_erro = mensagem_erro
+        job.fim = time.monotonic()
+        if job.inicio is None:
+            job.inicio = job.fim
+        job.projeto = job.locais = job.zonas = job.circuitos = None  # a entrada não é mais necessária
+        job._sinalizar()
+
+    async def _consumir(self):
+        while True:
+            job = await self._fila.get()
+            try:
+                if job.encerrado:
+                    continue
+                job.estado = EstadoJob.EXECUTANDO
+                job.inicio = time.monotonic()
+                job._sinalizar()
+                try:
+                    await self._loop.run_in_executor(self._executor, self._executar, job)
+                except Exception as e:
+                    logger.exception("Job de dimensionamento falhou", extra={"dados": {"job_id": job.id}})
+                    self._finalizar(job, EstadoJob.FALHOU, str(e))
+                    continue
+                self._finalizar(job, EstadoJob.CANCELADO if job.cancelamento.is_set() else EstadoJob.CONCLUIDO)
+            finally:
+                self._fila.task_done()
+
+    def _executar(self, job: Job):
+        """Roda na thread do executor: calcula, acumula e avisa o loop do progresso."""
+        pool = obter_pool_calculo() if len(job.circuitos) >= settings.CALCULO_MIN_CIRCUITOS_POOL else None
+        resultados = DimensionadorProjeto(registrar_memoria=not job.compacto).iterar_projeto(
+            job.projeto, job.locais, job.zonas, job.circuitos, job.has_dr,
+            executor=pool,
+            tamanho_lote=settings.CALCULO_STREAM_TAMANHO_LOTE,
+            max_lotes_em_voo=2 * settings.CALCULO_MAX_WORKERS
+        )
+        ultimo_aviso = time.monotonic()
+        try:
+            for resultado in resultados:
+                if job.cancelamento.is_set():
+                    return
+                job.resultados.append(serializar_resultado(resultado, job.compacto))
+                job.por_status[resultado.status_global.value] += 1
+                job.concluidos += 1
+                agora = time.monotonic()
+                if agora - ultimo_aviso >= settings.JOBS_INTERVALO_PROGRESSO_S:
+                    self._loop.call_soon_threadsafe(job._sinalizar)
+                    ultimo_aviso = agora
+        finally:
+            resultados.close()
+
+gerenciador_jobs = GerenciadorJobs()
@@ -0,0 +1,72 @@
+"""
+Integração do logging estruturado (domain_core.engine.log_estruturado) com a API:
+configuração a partir das settings e ID de correlação por requisição.
+"""
+import logging
+import re
+import uuid
+from time import perf_counter
+
+from backend.core.config import settings
+from domain_core.engine.log_estruturado import (
+    configurar_logging, definir_id_correlacao, obter_logger, restaurar_id_correlacao
+)
+
+CABECALHO_CORRELACAO = "X-Request-ID"
+_CABECALHO_ASGI = CABECALHO_CORRELACAO.lower().encode("latin-1")
+# IDs vindos do cliente só são aceitos se forem curtos e "seguros" para log
+_ID_VALIDO = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+logger = obter_logger("api.http")
+
+def configurar_logging_api():
+    configurar_logging(nivel=settings.LOG_NIVEL, formato=settings.LOG_FORMATO)
+
+class MiddlewareCorrelacao:
+    """
+    Middleware ASGI: reaproveita o X-Request-ID recebido (ou gera um), expõe-no no contexto
+    de logging da requisição e o devolve no cabeçalho da resposta.
+    Erros 5xx são logados em ERROR; as demais requisições só em DEBUG.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        id_correlacao = None
+        for nome, valor in scope.get("headers", ()):
+            if nome == _CABECALHO_ASGI:
+                valor = valor.decode("latin-1")
+                if _ID_VALIDO.match(valor):
+                    id_correlacao = valor
+                break
+        if id_correlacao is None:
+            id_correlacao = uuid.uuid4().hex
+
+        status_code = 500
+
+        async def send_com_id(mensagem):
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+                mensagem["headers"] = list(mensagem.get("headers", [])) + [
+                    (_CABECALHO_ASGI, id_correlacao.encode("latin-1"))
+                ]
+            await send(mensagem)
+
+        token = definir_id_correlacao(id_correlacao)
+        inicio = perf_counter()
+        try:
+            await self.app(scope, receive, send_com_id)
+        finally:
+            if status_code >= 500 or logger.isEnabledFor(logging.DEBUG):
+                logger.log(
+                    logging.ERROR if status_code >= 500 else logging.DEBUG,
+                    "%s %s -> %s", scope["method"], scope["path"], status_code,
+                    extra={"dados": {"duracao_ms": round((perf_counter() - inicio) * 1000, 3)}}
+                )
+            restaurar_id_correlacao(token)
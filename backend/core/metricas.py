@@ -0,0 +1,289 @@
+"""
+Métricas da API no formato de exposição de texto do Prometheus (versão 0.0.4).
+
+Implementação própria e enxuta (contadores, medidores e histogramas com rótulos) para não
+adicionar dependências. Exposta em GET /api/v1/metrics.
+
+- `MiddlewareMetricas`: latência por rota (template da rota, não a URL concreta), requisições
+  em andamento e tamanho dos corpos de requisição/resposta.
+- `ObservadorPrometheus`: recebe os eventos de `domain_core.engine.telemetria` e os converte em
+  `projel_<nome>_total` (contadores) e `projel_<nome>_segundos` (histogramas).
+- Coletores: valores lidos no momento da coleta (ex: estatísticas dos caches).
+"""
+import math
+from bisect import bisect_left
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from domain_core.engine import telemetria
+
+BUCKETS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_LATENCIA_DOMINIO = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.1)
+BUCKETS_BYTES = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+Rotulos = Tuple[str, ...]
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(str(v))}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _formatar_valor(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict[str, str]) -> Rotulos:
+        if len(rotulos) != len(self.rotulos):
+            raise ValueError(f"Métrica '{self.nome}' espera os rótulos {self.rotulos}, recebeu {tuple(rotulos)}")
+        return tuple(str(rotulos[n]) for n in self.rotulos)
+
+    def renderizar(self) -> List[str]:
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        linhas.extend(self._amostras())
+        return linhas
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, valor: float = 1.0, **rotulos: str):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            itens = list(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(self.rotulos, k)} {_formatar_valor(v)}" for k, v in itens]
+
+class Medidor(Contador):
+    """Gauge: valor que sobe e desce (ex: requisições em andamento)."""
+    tipo = "gauge"
+
+    def decrementar(self, valor: float = 1.0, **rotulos: str):
+        self.incrementar(-valor, **rotulos)
+
+    def definir(self, valor: float, **rotulos: str):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = valor
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), buckets: Sequence[float] = BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+        # Por série: contagens por bucket (não cumulativas), soma e total
+        self._series: Dict[Rotulos, Tuple[List[int], List[float]]] = {}
+
+    def observar(self, valor: float, **rotulos: str):
+        chave = self._chave(rotulos)
+        posicao = bisect_left(self.buckets, valor)  # primeiro bucket com le >= valor
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = ([0] * (len(self.buckets) + 1), [0.0])
+            serie[0][posicao] += 1
+            serie[1][0] += valor
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            series = [(k, list(contagens), soma[0]) for k, (contagens, soma) in self._series.items()]
+        linhas = []
+        for chave, contagens, soma in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (math.inf,), contagens):
+                acumulado += contagem
+                le = f'le="{_formatar_valor(limite)}"'
+                linhas.append(f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, le)} {acumulado}")
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            linhas.append(f"{self.nome}_sum{rotulos} {_formatar_valor(soma)}")
+            linhas.append(f"{self.nome}_count{rotulos} {acumulado}")
+        return linhas
+
+# Coletor: devolve (nome, tipo, ajuda, [(rótulos, valor)]) lidos no momento da coleta
+Coletor = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._coletores: List[Coletor] = []
+        self._lock = threading.Lock()
+
+    def _obter_ou_criar(self, classe, nome: str, *args, **kwargs):
+        with self._lock:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = classe(nome, *args, **kwargs)
+            elif not isinstance(metrica, classe):
+                raise ValueError(f"Métrica '{nome}' já registrada como {metrica.tipo}")
+            return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self._obter_ou_criar(Contador, nome, ajuda, rotulos)
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Medidor:
+        return self._obter_ou_criar(Medidor, nome, ajuda, rotulos)
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   buckets: Sequence[float] = BUCKETS_LATENCIA) -> Histograma:
+        return self._obter_ou_criar(Histograma, nome, ajuda, rotulos, buckets=buckets)
+
+    def registrar_coletor(self, coletor: Coletor):
+        self._coletores.append(coletor)
+
+    def renderizar(self) -> str:
+        with self._lock:
+            metricas = sorted(self._metricas.values(), key=lambda m: m.nome)
+        linhas: List[str] = []
+        for metrica in metricas:
+            linhas.extend(metrica.renderizar())
+        for coletor in self._coletores:
+            for nome, tipo, ajuda, amostras in coletor():
+                linhas.append(f"# HELP {nome} {ajuda}")
+                linhas.append(f"# TYPE {nome} {tipo}")
+                for rotulos, valor in amostras:
+                    linhas.append(f"{nome}{_formatar_rotulos(list(rotulos), list(rotulos.values()))} {_formatar_valor(valor)}")
+        return "\n".join(linhas) + "\n"
+
+registro_metricas = RegistroMetricas()
+
+# --- HTTP ---
+
+http_requisicoes = registro_metricas.contador(
+    "projel_http_requisicoes_total", "Requisições HTTP concluídas.", ("metodo", "rota", "status"))
+http_duracao = registro_metricas.histograma(
+    "projel_http_duracao_segundos", "Latência das requisições HTTP.", ("metodo", "rota"))
+http_em_andamento = registro_metricas.medidor(
+    "projel_http_requisicoes_em_andamento", "Requisições HTTP em processamento.", ("metodo",))
+http_bytes_requisicao = registro_metricas.histograma(
+    "projel_http_requisicao_bytes", "Tamanho do corpo das requisições.", ("metodo", "rota"), buckets=BUCKETS_BYTES)
+http_bytes_resposta = registro_metricas.histograma(
+    "projel_http_resposta_bytes", "Tamanho do corpo das respostas.", ("metodo", "rota"), buckets=BUCKETS_BYTES)
+
+# --- Cache de resultados (/calculos) ---
+
+cache_resultados_consultas = registro_metricas.contador(
+    "projel_cache_resultados_consultas_total",
+    "Origem das respostas de /calculos/simular (memoria, disco, etag ou calculo).", ("origem",))
+
+ROTA_NAO_ENCONTRADA = "nao_encontrada"
+
+def _rota(scope) -> str:
+    """
+    Template da rota casada (ex: /api/v1/zonas/{zona_id}), mantendo limitada a cardinalidade
+    dos rótulos. Versões recentes do FastAPI guardam nos routers incluídos só o caminho relativo
+    (ex: /{zona_id}); o prefixo é recuperado casando a regex da rota com um sufixo do caminho.
+    """
+    rota = scope.get("route")
+    template = getattr(rota, "path", None)
+    regex = getattr(rota, "path_regex", None)
+    if not template or regex is None:
+        return ROTA_NAO_ENCONTRADA
+    caminho = scope["path"]
+    inicio = 0
+    while inicio >= 0:
+        if regex.match(caminho[inicio:]):
+            return caminho[:inicio] + template
+        inicio = caminho.find("/", inicio + 1)
+    return template
+
+class MiddlewareMetricas:
+    """Middleware ASGI puro (sem BaseHTTPMiddleware: não bufferiza nem muda o streaming)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        estado = {"status": 500, "bytes_req": 0, "bytes_resp": 0}
+
+        async def receive_medido():
+            mensagem = await receive()
+            if mensagem["type"] == "http.request":
+                estado["bytes_req"] += len(mensagem.get("body", b""))
+            return mensagem
+
+        async def send_medido(mensagem):
+            if mensagem["type"] == "http.response.start":
+                estado["status"] = mensagem["status"]
+            elif mensagem["type"] == "http.response.body":
+                estado["bytes_resp"] += len(mensagem.get("body", b""))
+            await send(mensagem)
+
+        http_em_andamento.incrementar(metodo=metodo)
+        inicio = perf_counter()
+        try:
+            await self.app(scope, receive_medido, send_medido)
+        finally:
+            duracao = perf_counter() - inicio
+            http_em_andamento.decrementar(metodo=metodo)
+            rota = _rota(scope)
+            http_requisicoes.incrementar(metodo=metodo, rota=rota, status=str(estado["status"]))
+            http_duracao.observar(duracao, metodo=metodo, rota=rota)
+            http_bytes_requisicao.observar(estado["bytes_req"], metodo=metodo, rota=rota)
+            http_bytes_resposta.observar(estado["bytes_resp"], metodo=metodo, rota=rota)
+
+class ObservadorPrometheus(telemetria.ObservadorTelemetria):
+    """Converte os eventos do domínio em métricas do registro (criadas na primeira ocorrência)."""
+
+    def __init__(self, registro: RegistroMetricas = registro_metricas):
+        self.registro = registro
+
+    def incrementar(self, nome: str, valor: float = 1.0, **rotulos: str) -> None:
+        self.registro.contador(
+            f"projel_{nome}_total", f"Evento do motor de cálculo: {nome}.", tuple(sorted(rotulos))
+        ).incrementar(valor, **rotulos)
+
+    def observar_duracao(self, nome: str, segundos: float, **rotulos: str) -> None:
+        self.registro.histograma(
+            f"projel_{nome}_segundos", f"Duração no motor de cálculo: {nome}.", tuple(sorted(rotulos)),
+            buckets=BUCKETS_LATENCIA_DOMINIO
+        ).observar(segundos, **rotulos)
+
+def _coletor_caches():
+    from domain_core.engine.regras_zona import RegrasZonaEngine
+    from backend.core.cache_resultados import cache_resultados
+
+    caches = (("restricoes_zona", RegrasZonaEngine.estatisticas_cache()), ("resultados", cache_resultados.estatisticas()))
+    yield ("projel_cache_consultas_total", "counter", "Consultas aos caches em memória.", [
+        ({"cache": nome, "resultado": resultado}, stats[chave])
+        for nome, stats in caches
+        for resultado, chave in (("acerto", "acertos"), ("falha", "falhas"))
+    ])
+    yield ("projel_cache_itens", "gauge", "Itens nos caches em memória.", [
+        ({"cache": nome}, stats["tamanho"] if "tamanho" in stats else stats["itens"]) for nome, stats in caches
+    ])
+    yield ("projel_cache_resultados_bytes", "gauge", "Bytes ocupados pelo cache de resultados.",
+           [({}, caches[1][1]["bytes"])])
+
+registro_metricas.registrar_coletor(_coletor_caches)
+
+def instalar_observador_dominio():
+    telemetria.registrar_observador(ObservadorPrometheus(registro_metricas))
@@ -0,0 +1,35 @@
+"""
+Respostas estáticas por deploy (opções de enums, presets de zonas): serializadas uma vez,
+na importação dos endpoints, e servidas como bytes com ETag forte e Cache-Control longo.
+
+O ETag é o hash do corpo somado à versão dos dados normativos: mudar um Enum, uma descrição
+ou os YAMLs da norma muda o ETag, e os clientes revalidam na próxima requisição.
+"""
+import hashlib
+import json
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Response, status
+
+from backend.core.config import settings
+from backend.core.cache_resultados import etag_corresponde
+from domain_core.engine.normative_repository import NormativeRepository
+
+class RespostaEstatica(NamedTuple):
+    corpo: bytes
+    etag: str
+
+def montar_resposta_estatica(dados: Any) -> RespostaEstatica:
+    corpo = json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(NormativeRepository().versao_dados.encode('ascii'))
+    digest.update(corpo)
+    return RespostaEstatica(corpo=corpo, etag=f'"{digest.hexdigest()[:32]}"')
+
+def responder_estatica(resposta: RespostaEstatica, if_none_match: Optional[str]) -> Response:
+    cabecalhos = {
+        "ETag": resposta.etag,
+        "Cache-Control": f"public, max-age={settings.RESPOSTAS_ESTATICAS_MAX_AGE_S}",
+    }
+    if etag_corresponde(if_none_match, resposta.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    return Response(content=resposta.corpo, media_type="application/json", headers=cabecalhos)
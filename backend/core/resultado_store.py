@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.core.database import PoolConexoesSQLite, obter_pool_db
+from domain_core.engine.normative_repository import NormativeRepository
+
+class ResultadoStore:
+    """
+    Persistência em SQLite dos resultados de dimensionamento, endereçados pelo hash de conteúdo
+    da simulação (ver cache_resultados.chave_simulacao). Guarda o JSON já serializado,
+    sem depender dos modelos do domain_core, e sobrevive a reinícios do servidor.
+
+    As chaves vêm de entradas dos usuários: a tabela é podada por idade (`ttl_s`) e, acima de
+    `max_itens`, pelos resultados gravados há mais tempo. A poda roda na abertura e a cada
+    ~10% de `max_itens` inserções, não a cada gravação.
+    """
+
+    def __init__(self, pool: PoolConexoesSQLite, versao_normativa: str,
+                 max_itens: int = 100_000, ttl_s: Optional[float] = None):
+        self.pool = pool
+        self.versao_normativa = versao_normativa
+        self.max_itens = max_itens
+        self.ttl_s = ttl_s
+        self._insercoes_desde_poda = 0
+        self._criar_tabela()
+
+    def _criar_tabela(self):
+        with self.pool.conexao() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resultados_dimensionamento (
+                    chave TEXT PRIMARY KEY,
+                    versao_normativa TEXT NOT NULL,
+                    corpo BLOB NOT NULL,
+                    criado_em REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_resultados_criado_em ON resultados_dimensionamento (criado_em)"
+            )
+            # Resultados de outra versão das tabelas/regras nunca mais serão consultados
+            conn.execute(
+                "DELETE FROM resultados_dimensionamento WHERE versao_normativa != ?",
+                (self.versao_normativa,)
+            )
+            self._podar(conn)
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        with self.pool.conexao() as conn:
+            linha = conn.execute(
+                "SELECT corpo FROM resultados_dimensionamento WHERE chave = ?", (chave,)
+            ).fetchone()
+        return bytes(linha[0]) if linha else None
+
+    def obter_varios(self, chaves: List[str]) -> Dict[str, bytes]:
+        encontrados: Dict[str, bytes] = {}
+        # Limite de variáveis por statement do SQLite
+        passo = 500
+        with self.pool.conexao() as conn:
+            for i in range(0, len(chaves), passo):
+                bloco = chaves[i:i + passo]
+                marcadores = ",".join("?" * len(bloco))
+                for chave, corpo in conn.execute(
+                    f"SELECT chave, corpo FROM resultados_dimensionamento WHERE chave IN ({marcadores})", bloco
+                ):
+                    encontrados[chave] = bytes(corpo)
+        return encontrados
+
+    def salvar(self, chave: str, corpo: bytes):
+        self.salvar_lote([(chave, corpo)])
+
+    def salvar_lote(self, itens: Iterable[Tuple[str, bytes]]):
+        """Insere/atualiza vários resultados numa única transação (executemany)."""
+        agora = time.time()
+        linhas = [(chave, self.versao_normativa, corpo, agora) for chave, corpo in itens]
+        if not linhas:
+            return
+        with self.pool.conexao() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO resultados_dimensionamento (chave, versao_normativa, corpo, criado_em) "
+                "VALUES (?, ?, ?, ?)",
+                linhas
+            )
+            # Contagem aproximada entre threads: só decide quando podar
+            self._insercoes_desde_poda += len(linhas)
+            if self._insercoes_desde_poda >= max(1, self.max_itens // 10):
+                self._podar(conn)
+
+    def _podar(self, conn):
+        """Remove resultados expirados e, acima de `max_itens`, os gravados há mais tempo."""
+        self._insercoes_desde_poda = 0
+        if self.ttl_s is not None:
+            conn.execute(
+                "DELETE FROM resultados_dimensionamento WHERE criado_em < ?", (time.time() - self.ttl_s,)
+            )
+        excedente = conn.execute("SELECT COUNT(*) FROM resultados_dimensionamento").fetchone()[0] - self.max_itens
+        if excedente > 0:
+            conn.execute(
+                "DELETE FROM resultados_dimensionamento WHERE chave IN ("
+                "SELECT chave FROM resultados_dimensionamento ORDER BY criado_em LIMIT ?)",
+                (excedente,)
+            )
+
+_store: Optional[ResultadoStore] = None
+_store_lock = threading.Lock()
+
+def obter_resultado_store() -> Optional[ResultadoStore]:
+    """Store compartilhado, ou None se a persistência estiver desligada (RESULTADOS_PERSISTIR=False)."""
+    global _store
+    if not settings.RESULTADOS_PERSISTIR:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResultadoStore(
+                obter_pool_db(), NormativeRepository().versao_dados,
+                max_itens=settings.RESULTADOS_MAX_ITENS, ttl_s=settings.RESULTADOS_TTL_S
+            )
+        return _store
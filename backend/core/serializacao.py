@@ -0,0 +1,69 @@
+"""
+Serialização JSON dos caminhos quentes da API.
+
+- Resultados do motor (`ResultadoDimensionamento`): serializador Rust do pydantic-core direto
+  para bytes (sem dict intermediário). Em 1k resultados é mais rápido que `model_dump()` + orjson.
+- Demais respostas (dicts/listas montados nos endpoints): orjson quando instalado, com
+  fallback para o `json` da stdlib. `RespostaJSONRapida` é a classe de resposta padrão da app.
+- Modo compacto: o resultado sem `memoria` (~25% menor). A memória de cálculo só interessa a
+  quem vai exibi-la; listagens e integrações pedem `?compacto=true`.
+
+Benchmark: `python -m backend.benchmarks`.
+"""
+import json
+from typing import Any, Iterable, List
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from domain_core.schemas.resultados import ResultadoDimensionamento
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+CAMPOS_COMPACTO = {"memoria"}
+
+_ADAPTADOR_RESULTADO = TypeAdapter(ResultadoDimensionamento)
+_ADAPTADOR_RESULTADOS = TypeAdapter(List[ResultadoDimensionamento])
+_EXCLUIR_COMPACTO_LISTA = {"__all__": CAMPOS_COMPACTO}
+
+def _padrao(valor: Any) -> Any:
+    if isinstance(valor, BaseModel):
+        return valor.model_dump(mode="json")
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+def dumps_json(dados: Any) -> bytes:
+    """JSON compacto em UTF-8 (orjson se disponível; BaseModels aninhados são aceitos)."""
+    if orjson is not None:
+        return orjson.dumps(dados, default=_padrao)
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":"), default=_padrao).encode("utf-8")
+
+def loads_json(corpo: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(corpo)
+    return json.loads(corpo)
+
+class RespostaJSONRapida(JSONResponse):
+    """JSONResponse com `dumps_json` (o `render` padrão usa json.dumps com indentação de espaços)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+def serializar_resultado(resultado: ResultadoDimensionamento, compacto: bool = False) -> bytes:
+    return _ADAPTADOR_RESULTADO.dump_json(resultado, exclude=CAMPOS_COMPACTO if compacto else None)
+
+def serializar_resultados(resultados: List[ResultadoDimensionamento], compacto: bool = False) -> bytes:
+    return _ADAPTADOR_RESULTADOS.dump_json(resultados, exclude=_EXCLUIR_COMPACTO_LISTA if compacto else None)
+
+def compactar_corpo(corpo: bytes) -> bytes:
+    """Versão compacta de um resultado já serializado (ex: vindo do cache)."""
+    dados = loads_json(corpo)
+    for campo in CAMPOS_COMPACTO:
+        dados.pop(campo, None)
+    return dumps_json(dados)
+
+def juntar_lista(corpos: Iterable[bytes]) -> bytes:
+    """Lista JSON a partir de elementos já serializados."""
+    return b"[" + b",".join(corpos) + b"]"
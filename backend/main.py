@@ -1,5 +1,6 @@
 import sys
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,10 +10,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.core.config import settings
 from backend.api.v1.api import api_router
+from backend.core.executor import encerrar_pool_calculo
+from backend.core.database import fechar_pool_db
+from backend.core.jobs import gerenciador_jobs
+from backend.core.metricas import MiddlewareMetricas, instalar_observador_dominio
+from backend.core.log import MiddlewareCorrelacao, configurar_logging_api
+from backend.core.compressao import MiddlewareCompressao
+from backend.core.serializacao import RespostaJSONRapida
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await gerenciador_jobs.iniciar()
+    yield
+    await gerenciador_jobs.encerrar()
+    encerrar_pool_calculo()
+    fechar_pool_db()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    default_response_class=RespostaJSONRapida
 )
 
 # Configuração de CORS (Crucial para o Frontend chamar o Backend)
@@ -25,6 +43,18 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# gzip/br negociado por Accept-Encoding (as métricas contam os bytes já comprimidos)
+app.add_middleware(MiddlewareCompressao)
+
+configurar_logging_api()
+
+# ID de correlação (X-Request-ID) em todos os logs da requisição
+app.add_middleware(MiddlewareCorrelacao)
+
+# Métricas Prometheus em /api/v1/metrics (HTTP + eventos do motor de cálculo)
+app.add_middleware(MiddlewareMetricas)
+instalar_observador_dominio()
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -0,0 +1,12 @@
+"""
+Camada de persistência (SQLite) das entidades do projeto.
+Os repositórios guardam o JSON do modelo do domain_core e indexam as colunas de consulta.
+"""
+from backend.repositories.base import Pagina, RepositorioSQLite
+from backend.repositories.entidades import (
+    repositorio_projetos,
+    repositorio_zonas,
+    repositorio_locais,
+    repositorio_cargas,
+    repositorio_circuitos,
+)
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from backend.core.database import PoolConexoesSQLite
+
+M = TypeVar("M", bound=BaseModel)
+
+class Pagina(BaseModel, Generic[M]):
+    itens: List[M]
+    total: int
+    limite: int
+    offset: int
+
+class RepositorioSQLite(Generic[M]):
+    """
+    Repositório genérico: uma tabela por entidade com `id`, as colunas indexadas
+    (ex: projeto_id, zona_id) e o modelo serializado em `dados`.
+    """
+
+    def __init__(self, pool: PoolConexoesSQLite, tabela: str, modelo: Type[M], colunas_indexadas: Sequence[str]):
+        self.pool = pool
+        self.tabela = tabela
+        self.modelo = modelo
+        self.colunas_indexadas = tuple(colunas_indexadas)
+        self._criar_tabela()
+
+    def _criar_tabela(self):
+        colunas = "".join(f", {c} TEXT" for c in self.colunas_indexadas)
+        with self.pool.conexao() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.tabela} (id TEXT PRIMARY KEY{colunas}, dados TEXT NOT NULL)")
+            for coluna in self.colunas_indexadas:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.tabela}_{coluna} ON {self.tabela} ({coluna})")
+
+    def _linha(self, obj: M, extras: Optional[Dict[str, Any]]) -> Tuple:
+        extras = extras or {}
+        valores = [extras[c] if c in extras else getattr(obj, c, None) for c in self.colunas_indexadas]
+        return (obj.id, *valores, obj.model_dump_json())
+
+    def salvar(self, obj: M, **extras: Any) -> M:
+        self.salvar_lote([obj], [extras] if extras else None)
+        return obj
+
+    def salvar_lote(self, objs: Iterable[M], extras: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Upsert em lote numa única transação. `extras` sobrepõe colunas indexadas por objeto."""
+        objs = list(objs)
+        linhas = [self._linha(obj, extras[i] if extras else None) for i, obj in enumerate(objs)]
+        if not linhas:
+            return 0
+        colunas = ("id", *self.colunas_indexadas, "dados")
+        marcadores = ",".join("?" * len(colunas))
+        with self.pool.conexao() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.tabela} ({', '.join(colunas)}) VALUES ({marcadores})", linhas
+            )
+        return len(linhas)
+
+    def obter(self, id: str) -> Optional[M]:
+        with self.pool.conexao() as conn:
+            linha = conn.execute(f"SELECT dados FROM {self.tabela} WHERE id = ?", (id,)).fetchone()
+        return self.modelo.model_validate_json(linha[0]) if linha else None
+
+    def obter_varios(self, ids: Sequence[str]) -> Dict[str, M]:
+        encontrados: Dict[str, M] = {}
+        passo = 500  # Limite de variáveis por statement do SQLite
+        with self.pool.conexao() as conn:
+            for i in range(0, len(ids), passo):
+                bloco = list(ids[i:i + passo])
+                marcadores = ",".join("?" * len(bloco))
+                for id_, dados in conn.execute(f"SELECT id, dados FROM {self.tabela} WHERE id IN ({marcadores})", bloco):
+                    encontrados[id_] = self.modelo.model_validate_json(dados)
+        return encontrados
+
+    def _filtros(self, filtros: Dict[str, Optional[str]]) -> Tuple[str, List[str]]:
+        clausulas, parametros = [], []
+        for coluna, valor in filtros.items():
+            if valor is None:
+                continue
+            if coluna not in self.colunas_indexadas:
+                raise ValueError(f"Coluna '{coluna}' não é indexada em {self.tabela}")
+            clausulas.append(f"{coluna} = ?")
+            parametros.append(valor)
+        return (" WHERE " + " AND ".join(clausulas) if clausulas else ""), parametros
+
+    def listar(self, limite: int = 100, offset: int = 0, **filtros: Optional[str]) -> Pagina[M]:
+        where, parametros = self._filtros(filtros)
+        with self.pool.conexao() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM {self.tabela}{where}", parametros).fetchone()[0]
+            linhas = conn.execute(
+                f"SELECT dados FROM {self.tabela}{where} ORDER BY rowid LIMIT ? OFFSET ?",
+                [*parametros, limite, offset]
+            ).fetchall()
+        itens = [self.modelo.model_validate_json(l[0]) for l in linhas]
+        return Pagina[self.modelo](itens=itens, total=total, limite=limite, offset=offset)
+
+    def listar_todos(self, **filtros: Optional[str]) -> List[M]:
+        where, parametros = self._filtros(filtros)
+        with self.pool.conexao() as conn:
+            linhas = conn.execute(f"SELECT dados FROM {self.tabela}{where} ORDER BY rowid", parametros).fetchall()
+        return [self.modelo.model_validate_json(l[0]) for l in linhas]
+
+    def remover(self, id: str) -> bool:
+        with self.pool.conexao() as conn:
+            return conn.execute(f"DELETE FROM {self.tabela} WHERE id = ?", (id,)).rowcount > 0
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from backend.core.database import obter_pool_db
+from backend.repositories.base import RepositorioSQLite
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.zona import Zona
+from domain_core.schemas.local import Local
+from domain_core.schemas.carga import Carga
+from domain_core.schemas.circuito import Circuito
+
+_projetos: Optional[RepositorioSQLite[ProjetoEletrico]] = None
+_zonas: Optional[RepositorioSQLite[Zona]] = None
+_locais: Optional[RepositorioSQLite[Local]] = None
+_cargas: Optional[RepositorioSQLite[Carga]] = None
+_circuitos: Optional[RepositorioSQLite[Circuito]] = None
+
+def repositorio_projetos() -> RepositorioSQLite[ProjetoEletrico]:
+    global _projetos
+    if _projetos is None:
+        _projetos = RepositorioSQLite(obter_pool_db(), "projetos", ProjetoEletrico, ())
+    return _projetos
+
+def repositorio_zonas() -> RepositorioSQLite[Zona]:
+    global _zonas
+    if _zonas is None:
+        _zonas = RepositorioSQLite(obter_pool_db(), "zonas", Zona, ("projeto_id",))
+    return _zonas
+
+def repositorio_locais() -> RepositorioSQLite[Local]:
+    global _locais
+    if _locais is None:
+        _locais = RepositorioSQLite(obter_pool_db(), "locais", Local, ("projeto_id", "zona_id"))
+    return _locais
+
+def repositorio_cargas() -> RepositorioSQLite[Carga]:
+    global _cargas
+    if _cargas is None:
+        _cargas = RepositorioSQLite(obter_pool_db(), "cargas", Carga, ("projeto_id", "zona_id", "local_id"))
+    return _cargas
+
+def repositorio_circuitos() -> RepositorioSQLite[Circuito]:
+    """Circuitos não têm projeto_id no modelo: a coluna é preenchida a partir da zona ao salvar."""
+    global _circuitos
+    if _circuitos is None:
+        _circuitos = RepositorioSQLite(obter_pool_db(), "circuitos", Circuito, ("projeto_id", "zona_id"))
+    return _circuitos
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Corrige imports adicionando raiz do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.core import database, resultado_store
+from backend.core.cache_resultados import cache_resultados
+from backend.core.config import settings
+from backend.main import app
+from backend.repositories import entidades
+
+def _zerar_estado():
+    """Singletons do processo: pool/banco, store de resultados, repositórios e cache em memória."""
+    database.fechar_pool_db()
+    resultado_store._store = None
+    for nome in ("_projetos", "_zonas", "_locais", "_cargas", "_circuitos"):
+        setattr(entidades, nome, None)
+    cache_resultados.limpar()
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    """App com banco SQLite temporário e caches vazios; o lifespan inicia o gerenciador de jobs."""
+    monkeypatch.setattr(settings, "DATABASE_PATH", str(tmp_path / "projel_teste.db"))
+    _zerar_estado()
+    with TestClient(app) as c:
+        yield c
+    _zerar_estado()
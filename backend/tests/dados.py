@@ -0,0 +1,44 @@
+"""Corpos JSON das requisições usados nos testes da API (mesmo contexto dos testes do domain_core)."""
+from typing import Optional
+
+from backend.core.config import settings
+
+API = settings.API_V1_STR
+
+def projeto_json(projeto_id: str = "p1") -> dict:
+    return {
+        "id": projeto_id, "nome": "Casa", "tipo_instalacao": "Residencial",
+        "tensao_sistema": "220/127", "sistema": "Trifásico", "esquema_aterramento": "TN-S",
+    }
+
+def zona_json(zona_id: str = "z1", projeto_id: str = "p1") -> dict:
+    return {"id": zona_id, "projeto_id": projeto_id, "nome": "Quarto", "data_criacao": "2024-01-01T00:00"}
+
+def local_json(local_id: str = "l1", zona_id: str = "z1", projeto_id: str = "p1") -> dict:
+    return {
+        "id": local_id, "zona_id": zona_id, "projeto_id": projeto_id, "nome": "Dormitório 1",
+        "area_m2": 12.0, "perimetro_m": 14.0, "data_criacao": "2024-01-01T00:00",
+    }
+
+def circuito_json(circuito_id: str = "c1", potencia: float = 2000, zona_id: str = "z1") -> dict:
+    return {
+        "id": circuito_id, "identificador": circuito_id, "tipo_circuito": "tomadas_uso_geral",
+        "zona_id": zona_id, "tensao_nominal": 220, "comprimento_m": 15,
+        "metodo_instalacao": "B1", "material_condutor": "cobre", "isolacao": "PVC_70C",
+        "temperatura_ambiente": 30, "circuitos_agrupados": 1,
+        "potencia_instalada_W": potencia,
+    }
+
+def simulacao_json(circuito: Optional[dict] = None) -> dict:
+    """Corpo de /calculos/simular."""
+    return {
+        "projeto": projeto_json(), "locais": [local_json()], "zona_governante": zona_json(),
+        "circuito": circuito or circuito_json(), "has_dr": False,
+    }
+
+def simulacao_projeto_json(circuitos: list) -> dict:
+    """Corpo de /calculos/simular-projeto (e do stream e dos jobs)."""
+    return {
+        "projeto": projeto_json(), "locais": [local_json()], "zonas": [zona_json()],
+        "circuitos": circuitos, "has_dr": False,
+    }
@@ -0,0 +1,53 @@
+from backend.tests.dados import API, circuito_json, simulacao_json, simulacao_projeto_json
+
+URL_SIMULAR = f"{API}/calculos/simular"
+
+def test_simular_repetido_e_servido_do_cache_com_o_mesmo_etag(cliente):
+    primeira = cliente.post(URL_SIMULAR, json=simulacao_json())
+    segunda = cliente.post(URL_SIMULAR, json=simulacao_json())
+
+    assert primeira.status_code == segunda.status_code == 200
+    assert primeira.headers["X-Cache"] == "MISS"
+    assert segunda.headers["X-Cache"] == "HIT"
+    assert segunda.headers["ETag"] == primeira.headers["ETag"]
+    assert segunda.json() == primeira.json()
+    assert primeira.json()["circuito_id"] == "c1"
+
+def test_if_none_match_com_o_etag_devolve_304_sem_corpo(cliente):
+    etag = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "identity"}).headers["ETag"]
+
+    for enviado in (etag, f"W/{etag}", f'"outro", {etag}'):
+        resposta = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"If-None-Match": enviado})
+        assert resposta.status_code == 304
+        assert resposta.content == b""
+
+    resposta = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"If-None-Match": '"outro"'})
+    assert resposta.status_code == 200
+
+def test_entrada_diferente_gera_outro_etag(cliente):
+    base = cliente.post(URL_SIMULAR, json=simulacao_json())
+    outra = cliente.post(URL_SIMULAR, json=simulacao_json(circuito_json(potencia=1000)))
+
+    assert outra.headers["X-Cache"] == "MISS"
+    assert outra.headers["ETag"] != base.headers["ETag"]
+
+def test_lote_isola_falhas_por_circuito_e_preserva_ordem(cliente):
+    circuitos = [
+        circuito_json("c1", 2000),
+        circuito_json("c2", 2000, zona_id="zona-inexistente"),
+        circuito_json("c3", 500000),  # Excede as tabelas de ampacidade
+        circuito_json("c4", 1000),
+    ]
+    resposta = cliente.post(f"{API}/calculos/simular-projeto", json=simulacao_projeto_json(circuitos))
+
+    assert resposta.status_code == 200
+    resultados = resposta.json()
+    assert [r["circuito_id"] for r in resultados] == ["c1", "c2", "c3", "c4"]
+    assert [r["status_global"] for r in resultados] == ["atende", "nao_atende", "nao_atende", "atende"]
+    assert "zona-inexistente" in resultados[1]["erros_entrada"][0]
+
+def test_lote_reaproveita_o_resultado_de_simular(cliente):
+    individual = cliente.post(URL_SIMULAR, json=simulacao_json()).json()
+    lote = cliente.post(f"{API}/calculos/simular-projeto", json=simulacao_projeto_json([circuito_json()])).json()
+
+    assert lote == [individual]
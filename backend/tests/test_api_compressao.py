@@ -0,0 +1,59 @@
+import gzip
+
+from backend.tests.dados import API, circuito_json, simulacao_json, simulacao_projeto_json
+from domain_core.schemas.resultados import ResultadoDimensionamento
+
+URL_SIMULAR = f"{API}/calculos/simular"
+
+def test_serializacao_rapida_respeita_o_schema_do_resultado(cliente):
+    corpo = cliente.post(URL_SIMULAR, json=simulacao_json()).content
+    resultado = ResultadoDimensionamento.model_validate_json(corpo)
+
+    assert resultado.circuito_id == "c1"
+    assert resultado.memoria
+
+def test_resposta_grande_e_comprimida_com_etag_forte_da_codificacao(cliente):
+    base = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "identity"})
+    comprimida = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in base.headers
+    assert comprimida.headers["Content-Encoding"] == "gzip"
+    assert comprimida.headers["ETag"] == base.headers["ETag"][:-1] + '-gzip"'
+    assert "Accept-Encoding" in comprimida.headers["Vary"]
+    assert comprimida.content == base.content  # o httpx descomprime
+
+def test_etag_da_codificacao_revalida_com_304(cliente):
+    etag = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    resposta = cliente.post(URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert resposta.status_code == 304
+    assert resposta.headers["ETag"] == etag
+    assert "Accept-Encoding" in resposta.headers["Vary"]
+
+def test_resposta_pequena_nao_e_comprimida(cliente):
+    resposta = cliente.get(f"{API}/health", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in resposta.headers
+
+def test_corpo_gzip_e_valido(cliente):
+    with cliente.stream("POST", URL_SIMULAR, json=simulacao_json(), headers={"Accept-Encoding": "gzip"}) as resposta:
+        bruto = b"".join(resposta.iter_raw())
+
+    assert gzip.decompress(bruto) == cliente.post(URL_SIMULAR, json=simulacao_json()).content
+
+def test_modo_compacto_omite_a_memoria_com_etag_proprio(cliente):
+    completo = cliente.post(URL_SIMULAR, json=simulacao_json())
+    compacto = cliente.post(URL_SIMULAR, params={"compacto": "true"}, json=simulacao_json())
+
+    assert "memoria" in completo.json()
+    assert "memoria" not in compacto.json()
+    assert compacto.headers["ETag"] != completo.headers["ETag"]
+    sem_memoria = {k: v for k, v in completo.json().items() if k != "memoria"}
+    assert compacto.json() == sem_memoria
+
+def test_lote_compacto_omite_a_memoria_de_todos_os_circuitos(cliente):
+    corpo = simulacao_projeto_json([circuito_json("c1", 2000), circuito_json("c2", 2000, zona_id="zona-inexistente")])
+    resultados = cliente.post(f"{API}/calculos/simular-projeto", params={"compacto": "true"}, json=corpo).json()
+
+    assert [r["circuito_id"] for r in resultados] == ["c1", "c2"]
+    assert all("memoria" not in r for r in resultados)
@@ -0,0 +1,53 @@
+import pytest
+
+from backend.tests.dados import API, circuito_json, local_json, projeto_json, zona_json
+
+@pytest.fixture
+def projeto_persistido(cliente):
+    assert cliente.put(f"{API}/projetos/p1", json=projeto_json()).status_code == 200
+    assert cliente.put(f"{API}/zonas/lote", json=[zona_json()]).status_code == 200
+    assert cliente.put(f"{API}/locais/lote", json=[local_json()]).status_code == 200
+    resposta = cliente.put(f"{API}/circuitos/lote", json=[circuito_json("c1", 2000), circuito_json("c2", 1000)])
+    assert resposta.status_code == 200
+    return cliente
+
+def test_entidades_salvas_em_lote_sao_lidas_por_id_e_por_projeto(projeto_persistido):
+    cliente = projeto_persistido
+
+    assert cliente.get(f"{API}/projetos/p1").json()["nome"] == "Casa"
+    assert cliente.get(f"{API}/circuitos/c2").json()["potencia_instalada_W"] == 1000
+    pagina = cliente.get(f"{API}/circuitos/", params={"projeto_id": "p1"}).json()
+    assert sorted(c["id"] for c in pagina["itens"]) == ["c1", "c2"]
+    assert cliente.get(f"{API}/circuitos/inexistente").status_code == 404
+
+def test_projeto_com_id_divergente_da_rota_e_rejeitado(cliente):
+    assert cliente.put(f"{API}/projetos/outro", json=projeto_json()).status_code == 422
+
+def test_circuitos_de_zona_nao_persistida_sao_rejeitados(cliente):
+    resposta = cliente.put(f"{API}/circuitos/lote", json=[circuito_json(zona_id="z-fantasma")])
+
+    assert resposta.status_code == 422
+    assert "z-fantasma" in resposta.json()["detail"]
+
+def test_simular_por_id_equivale_a_simular_com_o_contexto_completo(projeto_persistido):
+    cliente = projeto_persistido
+    por_id = cliente.post(f"{API}/calculos/simular-por-id", json={"circuito_id": "c1"})
+    completo = cliente.post(f"{API}/calculos/simular", json={
+        "projeto": projeto_json(), "locais": [local_json()], "zona_governante": zona_json(),
+        "circuito": circuito_json("c1", 2000),
+    })
+
+    assert por_id.status_code == 200
+    assert por_id.headers["ETag"] == completo.headers["ETag"]
+    assert completo.headers["X-Cache"] == "HIT"
+    assert por_id.json() == completo.json()
+
+def test_simular_por_id_de_circuito_inexistente_devolve_404(cliente):
+    assert cliente.post(f"{API}/calculos/simular-por-id", json={"circuito_id": "nada"}).status_code == 404
+
+def test_simular_projeto_persistido(projeto_persistido):
+    resposta = projeto_persistido.post(f"{API}/calculos/projetos/p1/simular")
+
+    assert resposta.status_code == 200
+    assert sorted(r["circuito_id"] for r in resposta.json()) == ["c1", "c2"]
+    assert projeto_persistido.post(f"{API}/calculos/projetos/nada/simular").status_code == 404
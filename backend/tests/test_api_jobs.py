@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.config import settings
+from backend.core.jobs import GerenciadorJobs, gerenciador_jobs
+from backend.tests.dados import API, circuito_json, simulacao_projeto_json
+
+URL_JOBS = f"{API}/jobs"
+
+def _submeter(cliente, circuitos) -> str:
+    resposta = cliente.post(f"{URL_JOBS}/", json=simulacao_projeto_json(circuitos))
+    assert resposta.status_code == 202
+    job_id = resposta.json()["id"]
+    assert resposta.headers["Location"] == f"{URL_JOBS}/{job_id}"
+    return job_id
+
+def _aguardar(cliente, job_id: str, *estados: str, timeout_s: float = 10.0) -> dict:
+    limite = time.monotonic() + timeout_s
+    while True:
+        progresso = cliente.get(f"{URL_JOBS}/{job_id}").json()
+        if progresso["estado"] in estados:
+            return progresso
+        assert time.monotonic() < limite, f"job ainda em '{progresso['estado']}'"
+        time.sleep(0.01)
+
+@pytest.fixture
+def portao(monkeypatch):
+    """Segura os jobs no início da execução (estado 'executando') até `portao.set()`."""
+    evento = threading.Event()
+
+    def executar(job):
+        evento.wait(10)
+        GerenciadorJobs._executar(gerenciador_jobs, job)
+
+    monkeypatch.setattr(gerenciador_jobs, "_executar", executar)
+    yield evento
+    evento.set()
+
+@pytest.fixture
+def uma_vaga(monkeypatch):
+    """Um job por vez (antes de `cliente`: as tarefas consumidoras nascem no lifespan)."""
+    monkeypatch.setattr(settings, "JOBS_MAX_CONCORRENTES", 1)
+
+def test_job_conclui_com_os_resultados_do_lote(cliente):
+    circuitos = [circuito_json("c1", 2000), circuito_json("c2", 2000, zona_id="zona-inexistente")]
+    job_id = _submeter(cliente, circuitos)
+    progresso = _aguardar(cliente, job_id, "concluido")
+
+    assert (progresso["total"], progresso["concluidos"]) == (2, 2)
+    assert progresso["por_status"] == {"atende": 1, "nao_atende": 1}
+    resultados = cliente.get(f"{URL_JOBS}/{job_id}/resultado").json()
+    lote = cliente.post(f"{API}/calculos/simular-projeto", json=simulacao_projeto_json(circuitos)).json()
+    assert resultados == lote
+
+def test_resultado_de_job_em_andamento_devolve_409(cliente, portao):
+    job_id = _submeter(cliente, [circuito_json()])
+    _aguardar(cliente, job_id, "executando")
+
+    assert cliente.get(f"{URL_JOBS}/{job_id}/resultado").status_code == 409
+    portao.set()
+    _aguardar(cliente, job_id, "concluido")
+    assert cliente.get(f"{URL_JOBS}/{job_id}/resultado").status_code == 200
+
+def test_cancelar_job_em_execucao(cliente, portao):
+    job_id = _submeter(cliente, [circuito_json(f"c{i}") for i in range(5)])
+    _aguardar(cliente, job_id, "executando")
+
+    assert cliente.delete(f"{URL_JOBS}/{job_id}").status_code == 200
+    portao.set()
+    progresso = _aguardar(cliente, job_id, "cancelado", "concluido", "falhou")
+    assert progresso["estado"] == "cancelado"
+    assert progresso["concluidos"] < progresso["total"]
+    assert cliente.get(f"{URL_JOBS}/{job_id}/resultado").status_code == 200
+
+def test_cancelar_job_na_fila_nao_o_executa(uma_vaga, cliente, portao):
+    primeiro = _submeter(cliente, [circuito_json()])
+    _aguardar(cliente, primeiro, "executando")
+    na_fila = _submeter(cliente, [circuito_json()])
+
+    cancelado = cliente.delete(f"{URL_JOBS}/{na_fila}").json()
+    assert (cancelado["estado"], cancelado["concluidos"]) == ("cancelado", 0)
+    portao.set()
+    _aguardar(cliente, primeiro, "concluido")
+    assert cliente.get(f"{URL_JOBS}/{na_fila}").json()["concluidos"] == 0
+
+def test_job_inexistente_devolve_404(cliente):
+    for metodo, rota in (("GET", ""), ("DELETE", ""), ("GET", "/resultado"), ("GET", "/eventos")):
+        assert cliente.request(metodo, f"{URL_JOBS}/nada{rota}").status_code == 404
+
+def test_eventos_sse_terminam_com_fim(cliente):
+    job_id = _submeter(cliente, [circuito_json()])
+    with cliente.stream("GET", f"{URL_JOBS}/{job_id}/eventos") as resposta:
+        assert resposta.headers["content-type"].startswith("text/event-stream")
+        corpo = "".join(resposta.iter_text())
+
+    eventos = [bloco.split("\n") for bloco in corpo.split("\n\n") if bloco]
+    assert [linhas[1] for linhas in eventos][-1] == "event: fim"
+    assert all(linhas[1] in ("event: progresso", "event: fim") for linhas in eventos)
+    assert [linhas[0] for linhas in eventos] == [f"id: {i}" for i in range(1, len(eventos) + 1)]
+    assert '"estado":"concluido"' in eventos[-1][2]
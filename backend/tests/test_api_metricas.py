@@ -0,0 +1,41 @@
+from backend.tests.dados import API, simulacao_json
+
+def _amostra(cliente, linha_sem_valor: str) -> float:
+    """Valor atual de uma série (0 se ainda não existe): o registro de métricas é do processo."""
+    texto = cliente.get(f"{API}/metrics").text
+    for linha in texto.splitlines():
+        if linha.startswith(linha_sem_valor + " "):
+            return float(linha.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_metrics_no_formato_de_texto_do_prometheus(cliente):
+    resposta = cliente.get(f"{API}/metrics")
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE projel_http_requisicoes_total counter" in resposta.text
+    assert "# TYPE projel_http_duracao_segundos histogram" in resposta.text
+
+def test_requisicoes_sao_contadas_pelo_template_da_rota(cliente):
+    serie = 'projel_http_requisicoes_total{metodo="GET",rota="/api/v1/circuitos/{circuito_id}",status="404"}'
+    antes = _amostra(cliente, serie)
+    cliente.get(f"{API}/circuitos/a")
+    cliente.get(f"{API}/circuitos/b")
+
+    assert _amostra(cliente, serie) == antes + 2
+
+def test_origem_das_respostas_de_simular_e_contada(cliente):
+    calculo = 'projel_cache_resultados_consultas_total{origem="calculo"}'
+    memoria = 'projel_cache_resultados_consultas_total{origem="memoria"}'
+    antes = _amostra(cliente, calculo), _amostra(cliente, memoria)
+    cliente.post(f"{API}/calculos/simular", json=simulacao_json())
+    cliente.post(f"{API}/calculos/simular", json=simulacao_json())
+
+    assert (_amostra(cliente, calculo), _amostra(cliente, memoria)) == (antes[0] + 1, antes[1] + 1)
+
+def test_eventos_do_motor_viram_contadores(cliente):
+    serie = 'projel_dimensionamento_circuitos_total{status="atende"}'
+    antes = _amostra(cliente, serie)
+    cliente.post(f"{API}/calculos/simular", json=simulacao_json())
+
+    assert _amostra(cliente, serie) == antes + 1
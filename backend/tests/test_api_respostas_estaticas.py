@@ -0,0 +1,37 @@
+import pytest
+
+from backend.core.config import settings
+from backend.tests.dados import API
+from domain_core.enums.circuitos import MetodoInstalacao, TipoCircuito
+
+# Sem compressão: o ETag é o da resposta original (ver test_api_compressao)
+SEM_COMPRESSAO = {"Accept-Encoding": "identity"}
+
+@pytest.mark.parametrize("rota", ["/circuitos/opcoes", "/zonas/opcoes-influencias", "/zonas/presets/residencial"])
+def test_resposta_estatica_tem_etag_forte_e_revalida_com_304(cliente, rota):
+    resposta = cliente.get(API + rota, headers=SEM_COMPRESSAO)
+    etag = resposta.headers["ETag"]
+
+    assert resposta.status_code == 200
+    assert etag.startswith('"') and etag.endswith('"')
+    assert resposta.headers["Cache-Control"] == f"public, max-age={settings.RESPOSTAS_ESTATICAS_MAX_AGE_S}"
+    assert resposta.json()
+
+    revalidada = cliente.get(API + rota, headers={**SEM_COMPRESSAO, "If-None-Match": etag})
+    assert revalidada.status_code == 304
+    assert revalidada.content == b""
+    assert revalidada.headers["ETag"] == etag
+
+def test_opcoes_de_circuitos_listam_os_enums_do_domain_core(cliente):
+    opcoes = cliente.get(f"{API}/circuitos/opcoes").json()
+
+    assert [o["codigo"] for o in opcoes["tipos"]] == [e.value for e in TipoCircuito]
+    assert [o["codigo"] for o in opcoes["metodos_instalacao"]] == [e.value for e in MetodoInstalacao]
+
+def test_presets_ignoram_caixa_e_tipo_desconhecido_vira_lista_vazia(cliente):
+    minusculo = cliente.get(f"{API}/zonas/presets/residencial", headers=SEM_COMPRESSAO)
+    maiusculo = cliente.get(f"{API}/zonas/presets/Residencial", headers=SEM_COMPRESSAO)
+    comercial = cliente.get(f"{API}/zonas/presets/comercial", headers=SEM_COMPRESSAO)
+
+    assert maiusculo.headers["ETag"] == minusculo.headers["ETag"] != comercial.headers["ETag"]
+    assert cliente.get(f"{API}/zonas/presets/industrial").json() == []
@@ -0,0 +1,51 @@
+import json
+
+from backend.tests.dados import API, circuito_json, simulacao_projeto_json
+
+URL_STREAM = f"{API}/calculos/simular-projeto/stream"
+
+def _linhas(resposta) -> list:
+    corpo = resposta.content
+    assert corpo.endswith(b"\n")
+    return [json.loads(linha) for linha in corpo.split(b"\n")[:-1]]
+
+def test_stream_envia_uma_linha_por_circuito_e_o_resumo_no_fim(cliente):
+    circuitos = [circuito_json(f"c{i}", 500 + 100 * i) for i in range(5)]
+    resposta = cliente.post(URL_STREAM, json=simulacao_projeto_json(circuitos))
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("application/x-ndjson")
+    assert resposta.headers["X-Cache"] == "BYPASS"
+    linhas = _linhas(resposta)
+    assert [l["tipo"] for l in linhas] == ["resultado"] * 5 + ["resumo"]
+    assert [l["dados"]["circuito_id"] for l in linhas[:-1]] == [c["id"] for c in circuitos]
+    resumo = linhas[-1]["dados"]
+    assert resumo["total"] == 5
+    assert resumo["por_status"] == {"atende": 5}
+    assert resumo["duracao_ms"] >= 0
+
+def test_stream_isola_falhas_por_circuito(cliente):
+    circuitos = [circuito_json("c1"), circuito_json("c2", zona_id="zona-inexistente"), circuito_json("c3")]
+    linhas = _linhas(cliente.post(URL_STREAM, json=simulacao_projeto_json(circuitos)))
+
+    assert [l["dados"]["status_global"] for l in linhas[:-1]] == ["atende", "nao_atende", "atende"]
+    assert "zona-inexistente" in linhas[1]["dados"]["erros_entrada"][0]
+    assert linhas[-1]["dados"]["por_status"] == {"atende": 2, "nao_atende": 1}
+
+def test_stream_equivale_ao_lote(cliente):
+    circuitos = [circuito_json("c1", 2000), circuito_json("c2", 1000)]
+    lote = cliente.post(f"{API}/calculos/simular-projeto", json=simulacao_projeto_json(circuitos)).json()
+    linhas = _linhas(cliente.post(URL_STREAM, json=simulacao_projeto_json(circuitos)))
+
+    assert [l["dados"] for l in linhas[:-1]] == lote
+
+def test_stream_compacto_omite_a_memoria(cliente):
+    linhas = _linhas(cliente.post(URL_STREAM, params={"compacto": "true"}, json=simulacao_projeto_json([circuito_json()])))
+
+    assert "memoria" not in linhas[0]["dados"]
+
+def test_stream_de_projeto_vazio_so_tem_o_resumo(cliente):
+    linhas = _linhas(cliente.post(URL_STREAM, json=simulacao_projeto_json([])))
+
+    assert [l["tipo"] for l in linhas] == ["resumo"]
+    assert (linhas[0]["dados"]["total"], linhas[0]["dados"]["por_status"]) == (0, {})
@@ -0,0 +1,29 @@
+import sqlite3
+
+import pytest
+
+from backend.core import database
+from backend.core.database import PoolConexoesSQLite
+
+def test_falha_ao_abrir_conexao_devolve_a_vaga_do_pool(tmp_path, monkeypatch):
+    pool = PoolConexoesSQLite(str(tmp_path / "pool.db"), tamanho=1)
+    conectar = sqlite3.connect
+    falhas = iter([sqlite3.OperationalError("unable to open database file")] * 2)
+
+    def connect(*args, **kwargs):
+        erro = next(falhas, None)
+        if erro is not None:
+            raise erro
+        return conectar(*args, **kwargs)
+
+    monkeypatch.setattr(database.sqlite3, "connect", connect)
+    for _ in range(2):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.conexao():
+                pass
+        # Com a vaga presa, a próxima chamada esperaria para sempre por uma conexão livre
+        assert pool._criadas == 0
+
+    with pool.conexao() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    pool.fechar()
@@ -0,0 +1,50 @@
+import pytest
+
+from backend.core.cache_resultados import cache_resultados
+from backend.core.database import PoolConexoesSQLite
+from backend.core.resultado_store import ResultadoStore
+from backend.tests.dados import API, circuito_json, simulacao_json, simulacao_projeto_json
+
+URL_SIMULAR = f"{API}/calculos/simular"
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = PoolConexoesSQLite(str(tmp_path / "resultados.db"), 1)
+    yield pool
+    pool.fechar()
+
+def test_resultado_sobrevive_ao_cache_em_memoria(cliente):
+    calculado = cliente.post(URL_SIMULAR, json=simulacao_json())
+    cache_resultados.limpar()  # como num reinício do servidor
+    do_disco = cliente.post(URL_SIMULAR, json=simulacao_json())
+    da_memoria = cliente.post(URL_SIMULAR, json=simulacao_json())
+
+    assert [r.headers["X-Cache"] for r in (calculado, do_disco, da_memoria)] == ["MISS", "HIT-DISK", "HIT"]
+    assert do_disco.content == calculado.content
+    assert do_disco.headers["ETag"] == calculado.headers["ETag"]
+
+def test_lote_le_do_disco_os_circuitos_ja_calculados(cliente):
+    corpo = simulacao_projeto_json([circuito_json("c1", 2000), circuito_json("c2", 1000)])
+    calculado = cliente.post(f"{API}/calculos/simular-projeto", json=corpo)
+    cache_resultados.limpar()
+    do_disco = cliente.post(f"{API}/calculos/simular-projeto", json=corpo)
+
+    assert do_disco.status_code == 200
+    assert do_disco.json() == calculado.json()
+
+def test_store_mantem_no_maximo_max_itens(pool):
+    store = ResultadoStore(pool, "v1", max_itens=3)
+    for i in range(5):
+        store.salvar(f"k{i}", b"{}")
+
+    assert len(store.obter_varios([f"k{i}" for i in range(5)])) == 3
+    assert store.obter("k4") == b"{}"
+
+def test_store_descarta_expirados_e_outras_versoes_ao_abrir(pool):
+    ResultadoStore(pool, "v1").salvar("k", b"{}")
+
+    assert ResultadoStore(pool, "v1").obter("k") == b"{}"
+    assert ResultadoStore(pool, "v1", ttl_s=0.0).obter("k") is None
+
+    ResultadoStore(pool, "v1").salvar("k", b"{}")
+    assert ResultadoStore(pool, "v2").obter("k") is None
@@ -0,0 +1,299 @@
+"""
+Teste de carga HTTP assíncrono dos endpoints de cálculo.
+
+Gera requisições a partir do gerador de projetos sintéticos, dispara-as com concorrência
+configurável (httpx assíncrono) e reporta, por endpoint, latência p50/p95/p99, vazão e taxa
+de erros. O relatório pode ser exportado em JSON e comparado com uma execução anterior.
+
+    # App em processo (httpx.ASGITransport, sem rede)
+    python -m backend.tools.teste_carga --requisicoes 2000 --concorrencia 32
+
+    # Uvicorn local em subprocesso (inclui o custo de rede/serialização HTTP real)
+    python -m backend.tools.teste_carga --modo uvicorn --workers 2 --saida atual.json --comparar base.json
+
+    # Servidor já em execução
+    python -m backend.tools.teste_carga --url http://localhost:8000
+
+No modo ASGI cliente e app dividem o mesmo event loop: as latências incluem o custo do
+cliente, então compare execuções do mesmo modo entre si.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+import httpx
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(RAIZ_REPO)
+
+from domain_core.services.gerador_projeto_sintetico import GeradorProjetoSintetico, ParametrosGerador
+
+FORMATO_RELATORIO = 1
+PREFIXO_API = "/api/v1"
+
+class Cenario(NamedTuple):
+    nome: str
+    caminho: str
+    corpos: List[bytes]
+
+def _json(dados: Dict[str, Any]) -> bytes:
+    return json.dumps(dados, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def montar_cenarios(nomes: List[str], distintos: int, seed: int) -> List[Cenario]:
+    """
+    Pré-serializa `distintos` corpos por endpoint (a serialização não entra na medição).
+    Com menos corpos distintos que requisições, os corpos se repetem e o cache de resultados entra em jogo.
+    """
+    projeto = GeradorProjetoSintetico(ParametrosGerador(seed=seed, num_circuitos=distintos)).gerar()
+    projeto_json = projeto.projeto.model_dump(mode="json")
+    zonas = {z.id: z for z in projeto.zonas}
+    zonas_json = [z.model_dump(mode="json") for z in projeto.zonas]
+    locais_por_zona = defaultdict(list)
+    for local in projeto.locais:
+        locais_por_zona[local.zona_id].append(local.model_dump(mode="json"))
+    cargas = {c.id: c.model_dump(mode="json") for c in projeto.cargas}
+
+    construtores = {
+        "simular": (f"{PREFIXO_API}/calculos/simular", lambda c: {
+            "projeto": projeto_json,
+            "locais": locais_por_zona[c.zona_id],
+            "zona_governante": zonas[c.zona_id].model_dump(mode="json"),
+            "circuito": c.model_dump(mode="json"),
+        }),
+        "analisar-rascunho": (f"{PREFIXO_API}/propostas/analisar-rascunho", lambda c: {
+            "cargas_selecionadas": [cargas[i] for i in c.cargas_ids],
+            "zonas_do_projeto": zonas_json,
+        }),
+    }
+    cenarios = []
+    for nome in nomes:
+        caminho, construir = construtores[nome]
+        cenarios.append(Cenario(nome, caminho, [_json(construir(c)) for c in projeto.circuitos]))
+    return cenarios
+
+def percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por posto mais próximo (nearest-rank) sobre uma lista já ordenada."""
+    if not ordenadas:
+        return 0.0
+    posto = max(1, -(-len(ordenadas) * p // 100))
+    return ordenadas[int(posto) - 1]
+
+class EstatisticasEndpoint:
+    def __init__(self):
+        self.latencias: List[float] = []
+        self.status: Counter = Counter()
+        self.erros = 0
+
+    def registrar(self, latencia_s: float, status_code: Optional[int]):
+        self.latencias.append(latencia_s)
+        self.status[str(status_code) if status_code is not None else "falha_conexao"] += 1
+        if status_code is None or status_code >= 400:
+            self.erros += 1
+
+    def resumo(self, duracao_s: float) -> Dict[str, Any]:
+        ordenadas = sorted(self.latencias)
+        total = len(ordenadas)
+        em_ms = lambda v: round(v * 1000, 3)
+        return {
+            "requisicoes": total,
+            "erros": self.erros,
+            "taxa_erros": round(self.erros / total, 4) if total else 0.0,
+            "status": dict(self.status),
+            "duracao_s": round(duracao_s, 3),
+            "vazao_rps": round(total / duracao_s, 1) if duracao_s > 0 else 0.0,
+            "latencia_ms": {
+                "min": em_ms(ordenadas[0]) if ordenadas else 0.0,
+                "p50": em_ms(percentil(ordenadas, 50)),
+                "p95": em_ms(percentil(ordenadas, 95)),
+                "p99": em_ms(percentil(ordenadas, 99)),
+                "max": em_ms(ordenadas[-1]) if ordenadas else 0.0,
+                "media": em_ms(sum(ordenadas) / total) if total else 0.0,
+            },
+        }
+
+async def executar_cenario(
+    cliente: httpx.AsyncClient, cenario: Cenario, requisicoes: int, concorrencia: int, aquecimento: int = 0
+) -> Dict[str, Any]:
+    estatisticas = EstatisticasEndpoint()
+    cabecalhos = {"content-type": "application/json"}
+
+    async def disparar(indice: int, medir: bool):
+        corpo = cenario.corpos[indice % len(cenario.corpos)]
+        inicio = time.perf_counter()
+        try:
+            resposta = await cliente.post(cenario.caminho, content=corpo, headers=cabecalhos)
+            status_code = resposta.status_code
+        except httpx.HTTPError:
+            status_code = None
+        if medir:
+            estatisticas.registrar(time.perf_counter() - inicio, status_code)
+
+    for i in range(aquecimento):
+        await disparar(i, medir=False)
+
+    proximo = iter(range(requisicoes))
+
+    async def trabalhador():
+        for indice in proximo:
+            await disparar(indice, medir=True)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(max(1, concorrencia))))
+    return estatisticas.resumo(time.perf_counter() - inicio)
+
+@asynccontextmanager
+async def cliente_asgi() -> AsyncIterator[httpx.AsyncClient]:
+    from backend.main import app
+    async with app.router.lifespan_context(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste-carga", timeout=None) as cliente:
+            yield cliente
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@asynccontextmanager
+async def cliente_uvicorn(workers: int, limite_conexoes: int) -> AsyncIterator[httpx.AsyncClient]:
+    porta = _porta_livre()
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(porta),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=RAIZ_REPO, env=os.environ.copy()
+    )
+    url = f"http://127.0.0.1:{porta}"
+    try:
+        await _aguardar_servidor(url, processo)
+        async with _cliente_http(url, limite_conexoes) as cliente:
+            yield cliente
+    finally:
+        processo.terminate()
+        try:
+            processo.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+async def _aguardar_servidor(url: str, processo: subprocess.Popen, timeout_s: float = 30.0):
+    limite = time.monotonic() + timeout_s
+    async with httpx.AsyncClient() as cliente:
+        while time.monotonic() < limite:
+            if processo.poll() is not None:
+                raise RuntimeError(f"uvicorn terminou durante a inicialização (código {processo.returncode})")
+            try:
+                if (await cliente.get(f"{url}{PREFIXO_API}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"uvicorn não respondeu em {timeout_s:.0f}s")
+
+def _cliente_http(url: str, limite_conexoes: int) -> httpx.AsyncClient:
+    limites = httpx.Limits(max_connections=limite_conexoes, max_keepalive_connections=limite_conexoes)
+    return httpx.AsyncClient(base_url=url, timeout=httpx.Timeout(60.0), limits=limites)
+
+async def executar(args: argparse.Namespace) -> Dict[str, Any]:
+    distintos = args.distintos or args.requisicoes
+    cenarios = montar_cenarios(args.endpoints, distintos, args.seed)
+
+    if args.url:
+        contexto = _cliente_http(args.url.rstrip("/"), args.concorrencia)
+        modo = "url"
+    elif args.modo == "uvicorn":
+        contexto = cliente_uvicorn(args.workers, args.concorrencia)
+        modo = "uvicorn"
+    else:
+        contexto = cliente_asgi()
+        modo = "asgi"
+
+    resultados = {}
+    async with contexto as cliente:
+        for cenario in cenarios:
+            resultados[cenario.nome] = await executar_cenario(
+                cliente, cenario, args.requisicoes, args.concorrencia, args.aquecimento
+            )
+
+    return {
+        "formato": FORMATO_RELATORIO,
+        "gerado_em": datetime.now(timezone.utc).isoformat(),
+        "configuracao": {
+            "modo": modo,
+            "url": args.url,
+            "workers": args.workers if modo == "uvicorn" else None,
+            "concorrencia": args.concorrencia,
+            "requisicoes": args.requisicoes,
+            "distintos": distintos,
+            "aquecimento": args.aquecimento,
+            "seed": args.seed,
+        },
+        "endpoints": resultados,
+    }
+
+def imprimir_relatorio(relatorio: Dict[str, Any], base: Optional[Dict[str, Any]] = None):
+    cfg = relatorio["configuracao"]
+    print(f"Modo={cfg['modo']} concorrência={cfg['concorrencia']} requisições={cfg['requisicoes']} distintas={cfg['distintos']}")
+    print(f"{'endpoint':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'erros':>8}")
+    for nome, r in relatorio["endpoints"].items():
+        lat = r["latencia_ms"]
+        print(f"{nome:<20}{r['vazao_rps']:>10.1f}{lat['p50']:>10.2f}{lat['p95']:>10.2f}{lat['p99']:>10.2f}{r['erros']:>8}")
+        anterior = (base or {}).get("endpoints", {}).get(nome)
+        if anterior:
+            print(f"{'  vs base':<20}" + "".join(
+                f"{_variacao(atual, antes):>10}" for atual, antes in (
+                    (r["vazao_rps"], anterior["vazao_rps"]),
+                    (lat["p50"], anterior["latencia_ms"]["p50"]),
+                    (lat["p95"], anterior["latencia_ms"]["p95"]),
+                    (lat["p99"], anterior["latencia_ms"]["p99"]),
+                )
+            ))
+
+def _variacao(atual: float, antes: float) -> str:
+    if not antes:
+        return "-"
+    return f"{(atual - antes) / antes * 100:+.1f}%"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP dos endpoints de cálculo.")
+    parser.add_argument("--modo", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--url", help="Servidor já em execução (ignora --modo)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn (modo uvicorn)")
+    parser.add_argument("--endpoints", nargs="+", default=["simular", "analisar-rascunho"],
+                        choices=["simular", "analisar-rascunho"])
+    parser.add_argument("--requisicoes", type=int, default=1000, help="Requisições medidas por endpoint")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--distintos", type=int, default=0,
+                        help="Corpos distintos por endpoint (0 = um por requisição, sem repetição)")
+    parser.add_argument("--aquecimento", type=int, default=20, help="Requisições descartadas antes da medição")
+    parser.add_argument("--seed", type=int, default=5410)
+    parser.add_argument("--saida", help="Exporta o relatório em JSON")
+    parser.add_argument("--comparar", help="Relatório JSON anterior para comparação")
+    parser.add_argument("--banco", help="DATABASE_PATH do app (padrão: arquivo temporário)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="projel-carga-") as tmp:
+        # O app testado não deve escrever no banco de desenvolvimento
+        os.environ["DATABASE_PATH"] = args.banco or os.path.join(tmp, "carga.db")
+        relatorio = asyncio.run(executar(args))
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+    imprimir_relatorio(relatorio, base)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    return 1 if any(r["erros"] for r in relatorio["endpoints"].values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
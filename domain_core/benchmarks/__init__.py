@@ -0,0 +1,3 @@
+"""
+Benchmarks do motor de cálculo. Não fazem parte da suíte de testes padrão.
+"""
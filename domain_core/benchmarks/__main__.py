@@ -0,0 +1,96 @@
+"""
+Executor da suíte de benchmarks com baselines JSON (pytest-benchmark).
+
+    python -m domain_core.benchmarks             # compara com a última baseline salva
+    python -m domain_core.benchmarks --salvar    # salva uma nova baseline
+
+A comparação falha (código de saída 1) se o tempo mínimo de algum benchmark piorar mais que
+--limite (padrão 25%). Benchmarks dominados por I/O (`extra_info["io"]`, ex: carga dos YAMLs e
+do snapshot) usam --limite-io (padrão 100%): o disco e o cache de páginas do SO variam muito
+entre execuções.
+
+As baselines são locais (não versionadas): ficam em <suíte>/baselines/<máquina>/, uma pasta por
+plataforma/interpretador, como organizado pelo pytest-benchmark. Grave a sua com --salvar na
+máquina em que vai comparar, com a árvore limpa. Os benchmarks da API (serialização e
+compressão) ficam em backend/benchmarks, com o mesmo executor: python -m backend.benchmarks.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+import pytest
+from pytest_benchmark.utils import get_machine_id
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+def _percentual(valor: str) -> float:
+    return float(valor.rstrip("%")) / 100
+
+def _ultima_baseline(armazenamento: str) -> Optional[str]:
+    """Mesma baseline que o `--benchmark-compare` usa: a mais recente desta máquina."""
+    arquivos = sorted(glob.glob(os.path.join(armazenamento, get_machine_id(), "*.json")))
+    return arquivos[-1] if arquivos else None
+
+def _benchmarks(caminho: str) -> Dict[str, dict]:
+    with open(caminho, encoding="utf-8") as f:
+        return {b["fullname"]: b for b in json.load(f)["benchmarks"]}
+
+def _regressoes(atual: str, baseline: str, limite: float, limite_io: float) -> List[str]:
+    anteriores = _benchmarks(baseline)
+    mensagens = []
+    for nome, bench in sorted(_benchmarks(atual).items()):
+        anterior = anteriores.get(nome)
+        if anterior is None:
+            continue
+        tolerancia = limite_io if bench["extra_info"].get("io") else limite
+        variacao = bench["stats"]["min"] / anterior["stats"]["min"] - 1
+        if variacao > tolerancia:
+            mensagens.append(f"{nome}: mínimo +{variacao:.0%} (tolerado {tolerancia:.0%})")
+    return mensagens
+
+def main(argv=None, diretorio: str = DIRETORIO) -> int:
+    """`diretorio`: pasta com os `bench_*.py` (as baselines ficam em `<diretorio>/baselines`)."""
+    armazenamento = os.path.join(diretorio, "baselines")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--salvar", action="store_true", help="grava uma nova baseline em vez de comparar")
+    parser.add_argument("--limite", default="25%", help="regressão tolerada no tempo mínimo (ex: 25%%)")
+    parser.add_argument("--limite-io", default="100%", help="idem, para benchmarks dominados por I/O")
+    parser.add_argument("extras", nargs="*", help="argumentos repassados ao pytest (ex: -k selecao)")
+    args = parser.parse_args(argv)
+
+    pytest_args = sorted(glob.glob(os.path.join(diretorio, "bench_*.py"))) + [
+        "-p", "no:cacheprovider",
+        f"--benchmark-storage=file://{armazenamento}",
+        "--benchmark-columns=min,mean,max,stddev,rounds",
+        "--benchmark-sort=fullname",
+    ]
+    if args.salvar:
+        os.makedirs(armazenamento, exist_ok=True)
+        return pytest.main(pytest_args + ["--benchmark-save=baseline"] + args.extras)
+
+    baseline = _ultima_baseline(armazenamento)
+    if baseline is None:
+        print("Nenhuma baseline encontrada: rode com --salvar primeiro.", file=sys.stderr)
+        return pytest.main(pytest_args + args.extras)
+
+    # A tabela de comparação vem do pytest-benchmark; o veredito (com o limite de I/O) é daqui
+    with tempfile.TemporaryDirectory() as tmp:
+        atual = os.path.join(tmp, "atual.json")
+        codigo = pytest.main(pytest_args + ["--benchmark-compare", f"--benchmark-json={atual}"] + args.extras)
+        if codigo != 0 or not os.path.exists(atual):
+            return codigo
+        regressoes = _regressoes(atual, baseline, _percentual(args.limite), _percentual(args.limite_io))
+
+    if regressoes:
+        print(f"\nRegressões em relação a {os.path.relpath(baseline, diretorio)}:", file=sys.stderr)
+        for mensagem in regressoes:
+            print(f"  {mensagem}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmarks dos caminhos quentes do motor NBR 5410.
+Cada benchmark percorre todos os circuitos do projeto sintético (10, 1k e 100k circuitos).
+"""
+import os
+import shutil
+
+from domain_core.engine.calculo_corrente import CalculoCorrente
+from domain_core.engine.calculo_queda_tensao import CalculoQuedaTensao
+from domain_core.engine.contexto_instalacao import ContextoInstalacao
+from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
+from domain_core.engine.normative_repository import NormativeRepository
+from domain_core.engine.regras_zona import RegrasZonaEngine
+from domain_core.engine.selecao_condutor import SelecaoCondutor
+from domain_core.engine.selecao_disjuntor import SelecaoDisjuntor
+
+def test_calculo_corrente(benchmark, projeto_bench, rodadas):
+    circuitos = projeto_bench.circuitos
+
+    def executar():
+        for c in circuitos:
+            CalculoCorrente.calcular_corrente_projeto(c.potencia_instalada_W, c.tensao_nominal)
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_calculo_queda_tensao(benchmark, projeto_bench, rodadas):
+    circuitos = projeto_bench.circuitos
+
+    def executar():
+        for c in circuitos:
+            CalculoQuedaTensao.calcular_queda_tensao_percentual(
+                c.potencia_instalada_W / c.tensao_nominal, 2.5, c.comprimento_m, c.tensao_nominal, 1, c.material_condutor
+            )
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_selecao_condutor(benchmark, projeto_bench, rodadas):
+    selecao = SelecaoCondutor()
+    circuitos = projeto_bench.circuitos
+
+    def executar():
+        for c in circuitos:
+            selecao.selecionar_secao_por_corrente(
+                c.potencia_instalada_W / c.tensao_nominal, c.material_condutor, c.isolacao, c.metodo_instalacao, 2
+            )
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_selecao_disjuntor(benchmark, projeto_bench, rodadas):
+    circuitos = projeto_bench.circuitos
+
+    def executar():
+        for c in circuitos:
+            ib = c.potencia_instalada_W / c.tensao_nominal
+            SelecaoDisjuntor.selecionar_in_disjuntor(ib, ib * 1.5)
+            SelecaoDisjuntor.selecionar_curva(c.tipo_circuito.value)
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_regras_zona_aplicar_regras(benchmark, projeto_bench, rodadas):
+    engine = RegrasZonaEngine()
+    zonas = {z.id: z for z in projeto_bench.zonas}
+    contextos = [
+        ContextoInstalacao(projeto=projeto_bench.projeto, locais=[], zona_governante=zonas[c.zona_id], circuito=c)
+        for c in projeto_bench.circuitos
+    ]
+
+    def executar():
+        for contexto in contextos:
+            engine.aplicar_regras(contexto)
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_dimensionador_processar_circuito(benchmark, projeto_bench, rodadas):
+    engine = DimensionadorProjeto()
+    zonas = {z.id: z for z in projeto_bench.zonas}
+    projeto, locais = projeto_bench.projeto, projeto_bench.locais
+
+    def executar():
+        for c in projeto_bench.circuitos:
+            engine.processar_circuito(projeto, locais, zonas[c.zona_id], c)
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_dimensionador_processar_projeto(benchmark, projeto_bench, rodadas):
+    engine = DimensionadorProjeto()
+
+    def executar():
+        engine.processar_projeto(projeto_bench.projeto, projeto_bench.locais, projeto_bench.zonas, projeto_bench.circuitos)
+
+    benchmark.pedantic(executar, rounds=rodadas, warmup_rounds=1)
+
+def test_repositorio_carga_fria_yaml(benchmark, tmp_path, monkeypatch):
+    """Parse completo dos YAMLs (sem snapshot compilado)."""
+    benchmark.extra_info["io"] = True
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("PROJEL_NORMATIVE_CACHE_DIR", str(cache_dir))
+
+    def preparar():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return (object.__new__(NormativeRepository),), {}
+
+    benchmark.pedantic(lambda repo: repo._load_data(), setup=preparar, rounds=10)
+
+def test_repositorio_carga_snapshot(benchmark, tmp_path, monkeypatch):
+    """Carregamento a partir do snapshot compilado (início de um worker novo)."""
+    benchmark.extra_info["io"] = True
+    monkeypatch.setenv("PROJEL_NORMATIVE_CACHE_DIR", str(tmp_path / "cache"))
+    object.__new__(NormativeRepository)._load_data()  # gera o snapshot
+
+    def preparar():
+        return (object.__new__(NormativeRepository),), {}
+
+    benchmark.pedantic(lambda repo: repo._load_data(), setup=preparar, rounds=50)
+
+def test_repositorio_acesso_quente(benchmark):
+    """Singleton já carregado: custo de obter o repositório no caminho de cálculo."""
+    NormativeRepository()
+    benchmark(NormativeRepository)
@@ -0,0 +1,55 @@
+"""
+Fixtures da suíte de benchmarks (pytest-benchmark, em requirements-dev.txt).
+
+Os arquivos `bench_*.py` não seguem o padrão `test_*.py`, então não rodam com a suíte
+de testes normal. Use o executor, que salva e compara baselines JSON:
+
+    python -m domain_core.benchmarks                  # compara com a baseline (falha em regressão)
+    python -m domain_core.benchmarks --salvar         # grava uma nova baseline
+    PROJEL_BENCH_100K=1 python -m domain_core.benchmarks   # inclui o projeto de 100k circuitos
+
+Benchmarks dominados por I/O marcam `benchmark.extra_info["io"] = True` e são comparados
+com a tolerância de `--limite-io`.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from domain_core.services.gerador_projeto_sintetico import (
+    GeradorProjetoSintetico, ParametrosGerador, ProjetoSintetico
+)
+
+TAMANHOS = [10, 1_000, 100_000]
+
+def pytest_generate_tests(metafunc):
+    if "num_circuitos" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "num_circuitos",
+            [
+                pytest.param(
+                    n, id=f"{n}c",
+                    marks=[pytest.mark.skipif(
+                        n >= 100_000 and not os.environ.get("PROJEL_BENCH_100K"),
+                        reason="defina PROJEL_BENCH_100K=1 para o projeto de 100k circuitos"
+                    )]
+                )
+                for n in TAMANHOS
+            ],
+            scope="module"
+        )
+
+@pytest.fixture(scope="module")
+def projeto_bench(num_circuitos) -> ProjetoSintetico:
+    return GeradorProjetoSintetico(ParametrosGerador(num_circuitos=num_circuitos)).gerar()
+
+@pytest.fixture
+def rodadas(num_circuitos) -> int:
+    """Menos rodadas para projetos grandes: o tempo total de cada benchmark fica limitado."""
+    if num_circuitos >= 100_000:
+        return 1
+    if num_circuitos >= 1_000:
+        return 20
+    return 200
@@ -0,0 +1,62 @@
+"""
+Compara a seleção escalar de seção (laço Python) com a vetorizada (numpy.searchsorted).
+
+Uso:
+    python -m domain_core.benchmarks.selecao_vetorizada [--tamanhos 10000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from domain_core.engine.selecao_condutor import SelecaoCondutor
+
+PARAMS_TABELA = ("cobre", "PVC_70C", "B1", 2)
+
+def medir(func, repeticoes: int) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def executar(tamanho: int, seed: int = 42):
+    engine = SelecaoCondutor()
+    rng = np.random.default_rng(seed)
+    # Faixa que cobre todas as seções e alguns casos acima da tabela
+    correntes = rng.uniform(0.0, 300.0, size=tamanho)
+    mascara_ilum = rng.random(tamanho) < 0.3
+
+    def escalar():
+        return [
+            engine.selecionar_secao_por_corrente(i, *PARAMS_TABELA, is_iluminacao=il)
+            for i, il in zip(correntes.tolist(), mascara_ilum.tolist())
+        ]
+
+    def vetorizado():
+        return engine.selecionar_secoes_vetorizado(correntes, *PARAMS_TABELA, is_iluminacao=mascara_ilum)
+
+    # Consistência byte a byte com o caminho escalar
+    esperado = np.array([np.nan if s is None else s for s in escalar()], dtype=np.float64)
+    obtido = vetorizado()
+    assert esperado.tobytes() == obtido.tobytes(), "Caminho vetorizado divergiu do escalar"
+
+    repeticoes = 3 if tamanho >= 1_000_000 else 10
+    t_escalar = medir(escalar, max(1, repeticoes // 3))
+    t_vetor = medir(vetorizado, repeticoes)
+    print(
+        f"{tamanho:>10,d} correntes | escalar {t_escalar * 1e3:10.2f} ms | "
+        f"vetorizado {t_vetor * 1e3:8.2f} ms | speedup {t_escalar / t_vetor:7.1f}x"
+    )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 1_000_000])
+    args = parser.parse_args()
+    for n in args.tamanhos:
+        executar(n)
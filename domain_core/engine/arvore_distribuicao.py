@@ -0,0 +1,232 @@
+"""
+Árvore de distribuição (entrada -> QGBT -> quadros -> circuitos) com queda de tensão acumulada.
+
+- A corrente de cada trecho vem da potência a jusante (carga própria + subárvore), convertida
+  com a tensão e as fases do próprio trecho; a queda do trecho usa CalculoQuedaTensao.
+- A queda acumulada num nó é a soma das quedas dos trechos desde a entrada (NBR 5410 6.2.7:
+  o limite vale da origem da instalação até o ponto de utilização).
+- `recalcular()` faz um único percurso em pós-ordem (iterativo, sem recursão): potência da
+  subárvore, queda do trecho e a pior queda abaixo de cada nó.
+- Edições (`atualizar_no`, `remover_no`) refazem só o caminho do nó até a entrada:
+  O(profundidade) para potências e quedas dos trechos (a pior queda abaixo de cada ancestral
+  compara os filhos dele). As somas incrementais acumulam arredondamento de ponto flutuante;
+  `recalcular()` as refaz do zero.
+- A queda acumulada não é guardada por nó: uma edição num alimentador a mudaria na subárvore
+  inteira. `queda_acumulada_pct` soma o caminho até a entrada, também O(profundidade).
+
+Os ids dos nós CIRCUITO devem ser os ids dos `Circuito`: `quedas_montante()` alimenta
+`DimensionadorProjeto.processar_projeto(quedas_montante=...)`.
+"""
+from typing import Dict, Iterable, Optional
+
+from domain_core.enums.distribuicao import TipoNoDistribuicao
+from domain_core.schemas.distribuicao import NoDistribuicao
+from domain_core.engine.calculo_corrente import CalculoCorrente
+from domain_core.engine.calculo_queda_tensao import CalculoQuedaTensao
+
+class _No:
+    __slots__ = ("dados", "pai", "filhos", "potencia_W", "queda_trecho_pct", "pior_abaixo_pct")
+
+    def __init__(self, dados: NoDistribuicao):
+        self.dados = dados
+        self.pai: Optional["_No"] = None
+        self.filhos: Dict[str, "_No"] = {}
+        self.potencia_W = dados.potencia_W
+        self.queda_trecho_pct = 0.0
+        self.pior_abaixo_pct = 0.0
+
+class ArvoreDistribuicao:
+
+    def __init__(self, nos: Iterable[NoDistribuicao]):
+        self._nos: Dict[str, _No] = {}
+        for dados in nos:
+            if dados.id in self._nos:
+                raise ValueError(f"Nó '{dados.id}' repetido na árvore de distribuição.")
+            self._nos[dados.id] = _No(dados)
+
+        raizes = [no for no in self._nos.values() if no.dados.tipo == TipoNoDistribuicao.ENTRADA]
+        if len(raizes) != 1:
+            raise ValueError("A árvore de distribuição precisa de exatamente uma entrada.")
+        self._raiz = raizes[0]
+
+        for no in self._nos.values():
+            if no is not self._raiz:
+                self._ligar(no, self._obter_pai(no.dados))
+        self.recalcular()
+
+    # ------------------------------------------------------------------ consultas
+
+    def __len__(self) -> int:
+        return len(self._nos)
+
+    def __contains__(self, no_id: str) -> bool:
+        return no_id in self._nos
+
+    @property
+    def entrada_id(self) -> str:
+        return self._raiz.dados.id
+
+    def potencia_W(self, no_id: str) -> float:
+        """Potência a jusante do nó (carga própria + subárvore)."""
+        return self._obter(no_id).potencia_W
+
+    def queda_trecho_pct(self, no_id: str) -> float:
+        return self._obter(no_id).queda_trecho_pct
+
+    def queda_acumulada_pct(self, no_id: str) -> float:
+        """Queda da entrada até o nó (inclusive o trecho do próprio nó)."""
+        no = self._obter(no_id)
+        queda = 0.0
+        while no is not None:
+            queda += no.queda_trecho_pct
+            no = no.pai
+        return queda
+
+    def pior_queda_pct(self, no_id: Optional[str] = None) -> float:
+        """Maior queda acumulada entre o nó (padrão: a entrada) e qualquer ponto abaixo dele."""
+        no = self._obter(no_id) if no_id is not None else self._raiz
+        montante = self.queda_acumulada_pct(no.pai.dados.id) if no.pai is not None else 0.0
+        return montante + no.pior_abaixo_pct
+
+    def quedas_acumuladas(self) -> Dict[str, float]:
+        """Queda acumulada de todos os nós num só percurso (O(n))."""
+        quedas: Dict[str, float] = {}
+        pilha = [(self._raiz, 0.0)]
+        while pilha:
+            no, montante = pilha.pop()
+            acumulada = montante + no.queda_trecho_pct
+            quedas[no.dados.id] = acumulada
+            pilha.extend((filho, acumulada) for filho in no.filhos.values())
+        return quedas
+
+    def quedas_montante(self) -> Dict[str, float]:
+        """
+        Para cada nó CIRCUITO, a queda acumulada até o quadro que o alimenta (sem o trecho do
+        próprio circuito, que o DimensionadorProjeto calcula).
+        """
+        quedas = self.quedas_acumuladas()
+        return {
+            no_id: quedas[no.pai.dados.id]
+            for no_id, no in self._nos.items() if no.dados.tipo == TipoNoDistribuicao.CIRCUITO
+        }
+
+    # ------------------------------------------------------------------ cálculo
+
+    def recalcular(self):
+        """Refaz potências e quedas de todos os nós num percurso em pós-ordem."""
+        ordem = []
+        pilha = [self._raiz]
+        while pilha:
+            no = pilha.pop()
+            ordem.append(no)
+            pilha.extend(no.filhos.values())
+        if len(ordem) != len(self._nos):
+            raise ValueError("A árvore de distribuição tem ciclo: há nós que não descendem da entrada.")
+
+        # Pré-ordem invertida: todo filho vem antes do pai
+        for no in reversed(ordem):
+            no.potencia_W = no.dados.potencia_W + sum(filho.potencia_W for filho in no.filhos.values())
+            self._refazer(no)
+
+    # ------------------------------------------------------------------ alterações
+
+    def atualizar_no(self, dados: NoDistribuicao):
+        """
+        Insere ou substitui (mesmo id) um nó: carga, cabo do trecho ou nó a montante.
+        Refaz só o caminho até a entrada (os dois caminhos, se o nó mudou de pai).
+        """
+        no = self._nos.get(dados.id)
+        if dados.tipo == TipoNoDistribuicao.ENTRADA and no is not self._raiz:
+            raise ValueError("A árvore de distribuição já tem uma entrada.")
+        pai = self._obter_pai(dados) if dados.pai_id is not None else None
+
+        if no is None:
+            no = self._nos[dados.id] = _No(dados)
+            self._ligar(no, pai)
+            self._refazer(no)
+            self._propagar(pai, no.potencia_W)
+            return
+
+        if dados.tipo == TipoNoDistribuicao.CIRCUITO and no.filhos:
+            raise ValueError(f"Nó '{dados.id}' alimenta outros nós e não pode ser um circuito terminal.")
+        ancestral = pai
+        while ancestral is not None and pai is not no.pai:
+            if ancestral is no:
+                raise ValueError(f"Mover o nó '{dados.id}' para '{dados.pai_id}' criaria um ciclo.")
+            ancestral = ancestral.pai
+
+        delta_propria = dados.potencia_W - no.dados.potencia_W
+        no.dados = dados
+        if pai is no.pai:
+            self._propagar(no, delta_propria)
+            return
+
+        antigo = no.pai
+        del antigo.filhos[dados.id]
+        self._propagar(antigo, -no.potencia_W)
+        self._ligar(no, pai)
+        no.potencia_W += delta_propria
+        self._refazer(no)
+        self._propagar(pai, no.potencia_W)
+
+    def remover_no(self, no_id: str):
+        """Remove o nó e toda a subárvore dele."""
+        no = self._obter(no_id)
+        if no is self._raiz:
+            raise ValueError("A entrada não pode ser removida da árvore de distribuição.")
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            del self._nos[atual.dados.id]
+            pilha.extend(atual.filhos.values())
+        del no.pai.filhos[no_id]
+        self._propagar(no.pai, -no.potencia_W)
+
+    # ------------------------------------------------------------------ internos
+
+    def _obter(self, no_id: str) -> _No:
+        no = self._nos.get(no_id)
+        if no is None:
+            raise KeyError(f"Nó '{no_id}' não existe na árvore de distribuição.")
+        return no
+
+    def _obter_pai(self, dados: NoDistribuicao) -> _No:
+        pai = self._nos.get(dados.pai_id)
+        if pai is None:
+            raise ValueError(f"Nó '{dados.id}' referencia um nó a montante inexistente: '{dados.pai_id}'.")
+        if pai.dados.tipo == TipoNoDistribuicao.CIRCUITO:
+            raise ValueError(f"Nó '{dados.id}' não pode ser alimentado pelo circuito terminal '{dados.pai_id}'.")
+        return pai
+
+    @staticmethod
+    def _ligar(no: _No, pai: _No):
+        no.pai = pai
+        pai.filhos[no.dados.id] = no
+
+    def _propagar(self, inicio: Optional[_No], delta_potencia_W: float):
+        no = inicio
+        while no is not None:
+            no.potencia_W += delta_potencia_W
+            self._refazer(no)
+            no = no.pai
+
+    @staticmethod
+    def _refazer(no: _No):
+        """Queda do trecho e pior queda abaixo do nó, a partir da potência e dos filhos."""
+        dados = no.dados
+        if dados.secao_mm2 is None or not dados.comprimento_m or not no.potencia_W:
+            queda = 0.0
+        else:
+            corrente = CalculoCorrente.calcular_corrente_projeto(
+                potencia_W=no.potencia_W, tensao_V=dados.tensao_V, fases=dados.fases
+            )
+            queda = CalculoQuedaTensao.calcular_queda_tensao_percentual(
+                corrente_A=corrente,
+                secao_mm2=dados.secao_mm2,
+                comprimento_m=dados.comprimento_m,
+                tensao_V=dados.tensao_V,
+                fases=dados.fases,
+                material=dados.material_condutor
+            )
+        no.queda_trecho_pct = queda
+        no.pior_abaixo_pct = queda + max((filho.pior_abaixo_pct for filho in no.filhos.values()), default=0.0)
@@ -1,23 +1,34 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from domain_core.schemas.projeto import ProjetoEletrico
 from domain_core.schemas.local import Local
 from domain_core.schemas.zona import Zona
 from domain_core.schemas.circuito import Circuito
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class FatorCorrecao(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     tipo: str = Field(..., description="Ex: temperatura, agrupamento, etc.")
     valor: float = Field(..., gt=0)
     referencia: str = Field(...)
 
 class RestricoesNormativas(BaseModel):
-    fatores_correcao: List[FatorCorrecao] = Field(default_factory=list)
+    """
+    Imutável: a mesma instância é compartilhada por todos os circuitos de zonas equivalentes
+    (ver cache em RegrasZonaEngine).
+    """
+    model_config = ConfigDict(frozen=True)
+
+    fatores_correcao: Tuple[FatorCorrecao, ...] = ()
     limite_queda_tensao_pct: float = Field(default=4.0) # Padrão NBR 5410
     exige_dr_30ma: bool = Field(default=False)
     exige_dps: bool = Field(default=False)
     grau_ip_minimo: Optional[str] = None
-    metodos_instalacao_proibidos: List[str] = Field(default_factory=list)
-    observacoes: List[str] = Field(default_factory=list)
+    metodos_instalacao_proibidos: Tuple[str, ...] = ()
+    observacoes: Tuple[str, ...] = ()
+
+# Imutável: pode ser compartilhada como valor inicial de qualquer contexto
+RESTRICOES_PADRAO = RestricoesNormativas()
     
 class ContextoInstalacao(BaseModel):
     """
@@ -1,11 +1,15 @@
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from domain_core.schemas.projeto import ProjetoEletrico
 from domain_core.schemas.local import Local
 from domain_core.schemas.zona import Zona
 from domain_core.schemas.circuito import Circuito
-from domain_core.schemas.resultados import ResultadoDimensionamento
+from domain_core.schemas.resultados import ResultadoDimensionamento, StatusDimensionamento
+from domain_core.schemas.fases import DimensionamentoNeutro, ResultadoBalanceamento
 
-from domain_core.engine.contexto_instalacao import ContextoInstalacao
+from domain_core.engine.modelos_internos import ContextoCircuito
 from domain_core.engine.regras_zona import RegrasZonaEngine
 from domain_core.engine.calculo_corrente import CalculoCorrente
 from domain_core.engine.selecao_condutor import SelecaoCondutor
@@ -13,15 +17,49 @@ from domain_core.engine.calculo_queda_tensao import CalculoQuedaTensao
 from domain_core.engine.selecao_disjuntor import SelecaoDisjuntor
 from domain_core.engine.validacoes_normativas import ValidacoesNormativas
 from domain_core.engine.resultado_builder import ResultadoBuilder
+from domain_core.engine import telemetria
+from domain_core.engine.perfilador_etapas import MARCADOR_NULO, PerfiladorEtapas
+from domain_core.engine.log_estruturado import obter_logger
+
+logger = obter_logger("motor.dimensionador")
+
+
+def _processar_lote(
+    projeto: ProjetoEletrico,
+    locais: List[Local],
+    zonas: Dict[str, Zona],
+    circuitos: Sequence[Circuito],
+    has_dr: bool,
+    medir_alocacoes: Optional[bool] = None,
+    registrar_memoria: bool = True,
+    quedas_montante: Optional[Mapping[str, float]] = None
+) -> Tuple[List[ResultadoDimensionamento], Optional[PerfiladorEtapas]]:
+    """
+    Unidade de trabalho enviada aos processos do pool.
+    Precisa ser uma função de módulo para ser serializável (pickle).
+    Com `medir_alocacoes` diferente de None, o lote é perfilado e o perfil volta junto.
+    """
+    perfilador = PerfiladorEtapas(medir_alocacoes) if medir_alocacoes is not None else None
+    resultados = DimensionadorProjeto(registrar_memoria)._processar_lote(
+        projeto, locais, zonas, circuitos, has_dr, perfilador, quedas_montante
+    )
+    if perfilador is not None:
+        perfilador.encerrar()
+    return resultados, perfilador
+
 
 class DimensionadorProjeto:
     """
     Orquestra o dimensionamento completo de um Circuito embasado no Contexto de um Projeto.
     100% dependente do domínio e do repositório normativo.
+
+    Com `registrar_memoria=False` os resultados saem com a memória de cálculo vazia
+    (lotes que só consomem os números, ex: respostas compactas).
     """
-    def __init__(self):
+    def __init__(self, registrar_memoria: bool = True):
         self.regras_engine = RegrasZonaEngine()
         self.selecionador_cabo = SelecaoCondutor()
+        self.registrar_memoria = registrar_memoria
 
     def processar_circuito(
         self,
@@ -29,35 +67,60 @@ class DimensionadorProjeto:
         locais: List[Local],
         zona_governante: Zona,
         circuito: Circuito,
-        has_dr: bool = False # Flag provisória de UI até estar embedada melhor
+        has_dr: bool = False, # Flag provisória de UI até estar embedada melhor
+        perfilador: Optional[PerfiladorEtapas] = None,
+        queda_montante_pct: float = 0.0
     ) -> ResultadoDimensionamento:
-        
-        # 1. Montar Contexto
-        contexto = ContextoInstalacao(
-             projeto=projeto,
-             locais=locais,
-             zona_governante=zona_governante,
-             circuito=circuito
-        )
+        """
+        Com um `perfilador`, o tempo (e opcionalmente a memória) de cada etapa é registrado nele.
+
+        `queda_montante_pct` é a queda acumulada nos alimentadores até o quadro do circuito
+        (ver ArvoreDistribuicao.quedas_montante): o limite de queda é verificado sobre a soma.
+        `queda_tensao_pct` do resultado continua sendo a do próprio circuito.
+        """
+        marcador = perfilador.iniciar_circuito(circuito.id) if perfilador is not None else MARCADOR_NULO
+        with telemetria.cronometrar("dimensionamento_circuito") if telemetria.ativa() else telemetria.SEM_CRONOMETRO:
+            resultado = self._dimensionar(projeto, locais, zona_governante, circuito, has_dr, marcador, queda_montante_pct)
+        marcador.concluir()
+        if telemetria.ativa():
+            self._registrar_telemetria(resultado)
+        return resultado
+
+    def _dimensionar(
+        self,
+        projeto: ProjetoEletrico,
+        locais: List[Local],
+        zona_governante: Zona,
+        circuito: Circuito,
+        has_dr: bool,
+        marcador,
+        queda_montante_pct: float = 0.0
+    ) -> ResultadoDimensionamento:
+        # 1. Montar Contexto (entradas já validadas na borda: versão leve, sem revalidar)
+        contexto = ContextoCircuito(projeto, locais, zona_governante, circuito)
+        marcador.marcar("contexto")
         
         # 2. Avaliar Regras e extrair restrições do ambiente
         restricoes = self.regras_engine.aplicar_regras(contexto)
         contexto.restricoes = restricoes
+        marcador.marcar("regras")
         
         # Iniciar o criador de fatos documentais
-        builder = ResultadoBuilder(circuito.id)
-        builder.adicionar_passo("== INÍCIO: Análise e Dimensionamento NBR 5410 ==")
+        builder = ResultadoBuilder(circuito.id, self.registrar_memoria)
+        builder.registrar("inicio")
         if restricoes.observacoes:
-             builder.adicionar_passo("Restrições Ambientais Identificadas: ")
+             builder.registrar("restricoes")
              for obs in restricoes.observacoes:
-                  builder.adicionar_passo(f"- {obs}")
+                  builder.registrar("restricao", obs)
+        marcador.marcar("resultado")
          
         # Faltas graves (sem pot/corrente explicita)
         pot = circuito.potencia_instalada_W
         cor = circuito.corrente_nominal_A
         if pot is None and cor is None:
              builder.resultado.erros_entrada.append("Falta de carga no circuito.")
-             return builder.compilar()
+             telemetria.incrementar("dimensionamento_falhas", motivo="sem_carga")
+             return self._compilar(builder, marcador)
              
         # 3. Matemática da Corrente
         corrente_projeto = cor
@@ -67,7 +130,7 @@ class DimensionadorProjeto:
                   tensao_V=circuito.tensao_nominal
              )
         builder.resultado.corrente_projeto_ib = corrente_projeto
-        builder.adicionar_passo(f"IB (Corrente Nominal de Projeto) = {corrente_projeto:.2f} A")
+        builder.registrar("corrente_projeto", corrente_projeto)
         
         # Fator de Correcao de Temperatura
         fc_temperatura = 1.0 # default
@@ -78,7 +141,7 @@ class DimensionadorProjeto:
                fc_temperatura = 0.87
                break
                
-        builder.adicionar_passo(f"Corrigindo IB. Fatores de Correcao -> Agrapamento: {circuito.circuitos_agrupados}, Temperatura: {fc_temperatura:.2f}")
+        builder.registrar("fatores_correcao", circuito.circuitos_agrupados, fc_temperatura)
         # Simplificacao didatica: se ha arranjo > 1 agrupado no conduíte, o FC tbm reduz a amperagem ideal
         corrente_corrigida = corrente_projeto
         # Aplicamos do Agrupamento (0.8 generico por padrao simplificado para multiplos em conduíte para exibição)
@@ -86,36 +149,37 @@ class DimensionadorProjeto:
         
         corrente_corrigida = (corrente_projeto / fc_agrup) / fc_temperatura
         builder.resultado.corrente_corrigida_iz = corrente_corrigida
-        builder.adicionar_passo(f"IZ (Corrente Requerida na Tabela p/ Cabo) = {corrente_corrigida:.2f} A")
+        builder.registrar("corrente_corrigida", corrente_corrigida)
+        marcador.marcar("corrente")
 
         # 4. Seleção Condutor
         num_conds = 2 # Padrao simplificado de fase-neutro
         is_ilum = (circuito.identificador and "ilum" in circuito.identificador.lower()) or (circuito.tipo_circuito.value == "iluminacao")
-        secao = self.selecionador_cabo.selecionar_secao_por_corrente(
-             corrente_corrigida=corrente_corrigida,
-             material=circuito.material_condutor,
-             isolacao=circuito.isolacao,
-             metodo=circuito.metodo_instalacao,
-             num_condutores=num_conds,
-             is_iluminacao=is_ilum
-        )
+        with telemetria.cronometrar("selecao_condutor") if telemetria.ativa() else telemetria.SEM_CRONOMETRO:
+            selecao = self.selecionador_cabo.selecionar_secao_e_capacidade(
+                 corrente_corrigida=corrente_corrigida,
+                 material=circuito.material_condutor,
+                 isolacao=circuito.isolacao,
+                 metodo=circuito.metodo_instalacao,
+                 num_condutores=num_conds,
+                 is_iluminacao=is_ilum
+            )
+        secao, capacidade_teorica = selecao if selecao else (None, 0)
         builder.resultado.secao_condutor_mm2 = secao
         
-        tabela = self.selecionador_cabo.repo.get_tabela_ampacidade(
-             circuito.material_condutor, circuito.isolacao, circuito.metodo_instalacao, num_conds
-        )
-        capacidade_teorica = tabela.get(secao, 0)
-        
         if not secao:
              builder.resultado.erros_entrada.append("A tabela normativa (Tabela 36-39 NBR 5410) não suportou a corrente.")
-             return builder.compilar()
+             telemetria.incrementar("dimensionamento_falhas", motivo="secao_condutor")
+             marcador.marcar("condutor")
+             return self._compilar(builder, marcador)
              
-        builder.adicionar_passo(f"Seção Selecionada: {secao}mm² - Suporta teoricamente {capacidade_teorica}A")
+        builder.registrar("secao_condutor", secao, capacidade_teorica)
              
         val_conducao = ValidacoesNormativas.validar_capacidade_conducao(
             corrente_projeto, capacidade_teorica * fc_temperatura * fc_agrup, fc_temperatura * fc_agrup
         )
         builder.add_validacao(val_conducao)
+        marcador.marcar("condutor")
         
         # 5. Dimensionar Queda de Tensão
         fases_calculo = 1 # F-N
@@ -128,9 +192,14 @@ class DimensionadorProjeto:
             material=circuito.material_condutor
         )
         builder.resultado.queda_tensao_pct = queda
-        val_queda = ValidacoesNormativas.validar_queda_tensao(queda, restricoes.limite_queda_tensao_pct)
+        # Limite da NBR vale da origem da instalação: soma a queda dos alimentadores a montante
+        queda_total = queda + queda_montante_pct
+        val_queda = ValidacoesNormativas.validar_queda_tensao(queda_total, restricoes.limite_queda_tensao_pct)
         builder.add_validacao(val_queda)
-        builder.adicionar_passo(f"Queda de Tensão Calculada DeltaV = {queda:.2f}% (Limite {restricoes.limite_queda_tensao_pct:.2f}%)")
+        builder.registrar("queda_tensao", queda, restricoes.limite_queda_tensao_pct)
+        if queda_montante_pct:
+            builder.registrar("queda_acumulada", queda_montante_pct, queda_total)
+        marcador.marcar("queda_tensao")
 
         # 6. Seleção Proteção Sobrecorrente (Disjuntores)
         disjuntor_in = SelecaoDisjuntor.selecionar_in_disjuntor(corrente_projeto, capacidade_teorica * fc_temperatura * fc_agrup)
@@ -139,18 +208,249 @@ class DimensionadorProjeto:
         builder.resultado.disjuntor_nominal_in = disjuntor_in
         builder.resultado.curva_disjuntor = curva_disjuntor
         if disjuntor_in:
-            builder.adicionar_passo(f"Dispositivo de Proteção Selecionado: Curva {curva_disjuntor} / IN = {disjuntor_in}A")
+            builder.registrar("disjuntor", curva_disjuntor, disjuntor_in)
             val_prot = ValidacoesNormativas.validar_protecao_sobrecorrente(
                 disjuntor_in, corrente_projeto, capacidade_teorica * fc_temperatura * fc_agrup
             )
             builder.add_validacao(val_prot)
         else:
             builder.resultado.erros_entrada.append("Impossível achar Disjuntor que crie coordenação de sobrecorrente. Rever Parâmetros ou Condutor.")
+            telemetria.incrementar("dimensionamento_falhas", motivo="disjuntor")
+        marcador.marcar("disjuntor")
 
         # 7. Regras de Dispositivos Adicionais (DR)
         val_dr = ValidacoesNormativas.verificar_presenca_dr(restricoes.exige_dr_30ma, has_dr)
         builder.add_validacao(val_dr)
         if restricoes.exige_dr_30ma:
-             builder.adicionar_passo(f"Conferência Dispositivo DR: {'Fornecido' if has_dr else 'Faltante (BLOQUEANTE)'}")
+             builder.registrar("dr_fornecido" if has_dr else "dr_faltante")
+        marcador.marcar("dr")
              
+        return self._compilar(builder, marcador)
+
+    @staticmethod
+    def _compilar(builder: ResultadoBuilder, marcador) -> ResultadoDimensionamento:
+        resultado = builder.compilar()
+        # Criação do builder (modelo pydantic do resultado) + composição do status
+        marcador.marcar("resultado")
+        return resultado
+
+    @staticmethod
+    def _registrar_telemetria(resultado: ResultadoDimensionamento):
+        telemetria.incrementar("dimensionamento_circuitos", status=resultado.status_global.value)
+        for verificacao in resultado.verificacoes:
+            if verificacao.status == StatusDimensionamento.ERRO:
+                telemetria.incrementar("verificacoes_reprovadas", criterio=verificacao.criterio)
+
+    def processar_projeto(
+        self,
+        projeto: ProjetoEletrico,
+        locais: List[Local],
+        zonas: List[Zona],
+        circuitos: List[Circuito],
+        has_dr: bool = False,
+        max_workers: int = 1,
+        executor: Optional[Executor] = None,
+        perfilador: Optional[PerfiladorEtapas] = None,
+        quedas_montante: Optional[Mapping[str, float]] = None
+    ) -> List[ResultadoDimensionamento]:
+        """
+        Dimensiona todos os circuitos de um projeto recebendo o contexto uma única vez.
+        A zona governante de cada circuito é resolvida por `circuito.zona_id`.
+
+        Com `max_workers > 1` (ou um `executor` externo) os circuitos são divididos em lotes
+        e distribuídos num pool de processos. Falhas são isoladas por circuito: o circuito
+        problemático recebe um resultado com status ERRO e os demais seguem normalmente.
+        A ordem do retorno é a mesma da lista de entrada.
+
+        Com um `perfilador`, as medidas de todos os circuitos (inclusive dos workers do pool)
+        são reunidas nele; `perfilador.agregar()` resume o lote por etapa.
+
+        `quedas_montante` (id do circuito -> %) soma a queda dos alimentadores de cada circuito
+        na verificação do limite de queda; circuitos fora do mapa não têm queda a montante.
+        """
+        zonas_por_id = {z.id: z for z in zonas}
+
+        if not circuitos:
+            return []
+
+        if executor is None and (max_workers <= 1 or len(circuitos) == 1):
+            return self._processar_lote(projeto, locais, zonas_por_id, circuitos, has_dr, perfilador, quedas_montante)
+
+        num_workers = max_workers if executor is None else max(max_workers, 1)
+        lotes = self._dividir_em_lotes(circuitos, num_workers)
+
+        pool_proprio = executor is None
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers=max_workers)
+        medir_alocacoes = perfilador.medir_alocacoes if perfilador is not None else None
+        try:
+            futuros = [
+                (lote, pool.submit(
+                    _processar_lote, projeto, locais, zonas_por_id, lote, has_dr, medir_alocacoes,
+                    self.registrar_memoria, self._quedas_do_lote(quedas_montante, lote)
+                ))
+                for lote in lotes
+            ]
+            resultados: List[ResultadoDimensionamento] = []
+            for lote, futuro in futuros:
+                try:
+                    resultados_lote, perfil_lote = futuro.result()
+                    resultados.extend(resultados_lote)
+                    if perfil_lote is not None:
+                        perfilador.mesclar(perfil_lote)
+                except Exception as e:
+                    # Falha do processo inteiro (ex: worker morto): marca só os circuitos do lote
+                    logger.error("Lote do pool de cálculo falhou", exc_info=e, extra={"dados": {"circuitos": len(lote)}})
+                    resultados.extend(self._resultado_falha(c, e) for c in lote)
+            return resultados
+        finally:
+            if pool_proprio:
+                pool.shutdown()
+
+    def iterar_projeto(
+        self,
+        projeto: ProjetoEletrico,
+        locais: List[Local],
+        zonas: List[Zona],
+        circuitos: Iterable[Circuito],
+        has_dr: bool = False,
+        executor: Optional[Executor] = None,
+        tamanho_lote: int = 64,
+        max_lotes_em_voo: int = 4,
+        quedas_montante: Optional[Mapping[str, float]] = None
+    ) -> Iterator[ResultadoDimensionamento]:
+        """
+        Versão em fluxo de `processar_projeto`: produz cada resultado assim que ele (e os
+        anteriores) fica pronto, na ordem de entrada, consumindo `circuitos` aos poucos.
+
+        Sem `executor` o cálculo é sequencial, um circuito por vez. Com `executor`, os circuitos
+        são enviados em lotes de `tamanho_lote` e no máximo `max_lotes_em_voo` lotes ficam
+        pendentes: a memória fica limitada a `tamanho_lote * max_lotes_em_voo` resultados,
+        qualquer que seja o tamanho do projeto. Se o consumidor parar de iterar, os lotes
+        ainda não iniciados são cancelados.
+        """
+        zonas_por_id = {z.id: z for z in zonas}
+        if executor is None:
+            for circuito in circuitos:
+                yield self.processar_circuito_isolado(
+                    projeto, locais, zonas_por_id, circuito, has_dr,
+                    queda_montante_pct=quedas_montante.get(circuito.id, 0.0) if quedas_montante else 0.0
+                )
+            return
+
+        fonte = iter(circuitos)
+        pendentes = deque()
+        try:
+            while True:
+                while len(pendentes) < max_lotes_em_voo:
+                    lote = list(islice(fonte, tamanho_lote))
+                    if not lote:
+                        break
+                    pendentes.append(
+                        (lote, executor.submit(
+                            _processar_lote, projeto, locais, zonas_por_id, lote, has_dr, None,
+                            self.registrar_memoria, self._quedas_do_lote(quedas_montante, lote)
+                        ))
+                    )
+                if not pendentes:
+                    return
+                lote, futuro = pendentes.popleft()
+                try:
+                    resultados_lote, _ = futuro.result()
+                except Exception as e:
+                    logger.error("Lote do pool de cálculo falhou", exc_info=e, extra={"dados": {"circuitos": len(lote)}})
+                    resultados_lote = [self._resultado_falha(c, e) for c in lote]
+                yield from resultados_lote
+        finally:
+            for _, futuro in pendentes:
+                futuro.cancel()
+
+    def _processar_lote(
+        self,
+        projeto: ProjetoEletrico,
+        locais: List[Local],
+        zonas: Dict[str, Zona],
+        circuitos: Sequence[Circuito],
+        has_dr: bool,
+        perfilador: Optional[PerfiladorEtapas] = None,
+        quedas_montante: Optional[Mapping[str, float]] = None
+    ) -> List[ResultadoDimensionamento]:
+        if not quedas_montante:
+            return [self.processar_circuito_isolado(projeto, locais, zonas, c, has_dr, perfilador) for c in circuitos]
+        return [
+            self.processar_circuito_isolado(projeto, locais, zonas, c, has_dr, perfilador, quedas_montante.get(c.id, 0.0))
+            for c in circuitos
+        ]
+
+    def processar_circuito_isolado(
+        self,
+        projeto: ProjetoEletrico,
+        locais: List[Local],
+        zonas: Dict[str, Zona],
+        circuito: Circuito,
+        has_dr: bool = False,
+        perfilador: Optional[PerfiladorEtapas] = None,
+        queda_montante_pct: float = 0.0
+    ) -> ResultadoDimensionamento:
+        """
+        Como `processar_circuito`, resolvendo a zona governante por `circuito.zona_id`
+        e convertendo qualquer falha num resultado com status ERRO (nunca levanta).
+        """
+        zona = zonas.get(circuito.zona_id)
+        if zona is None:
+            builder = ResultadoBuilder(circuito.id)
+            builder.resultado.erros_entrada.append(
+                f"Zona '{circuito.zona_id}' do circuito não pertence ao projeto informado."
+            )
+            telemetria.incrementar("dimensionamento_falhas", motivo="zona_inexistente")
+            return builder.compilar()
+        try:
+            return self.processar_circuito(
+                projeto, locais, zona, circuito, has_dr=has_dr, perfilador=perfilador, queda_montante_pct=queda_montante_pct
+            )
+        except Exception as e:
+            logger.exception("Falha no dimensionamento do circuito", extra={"dados": {"circuito_id": circuito.id}})
+            return self._resultado_falha(circuito, e)
+
+    def dimensionar_neutro(
+        self,
+        balanceamento: ResultadoBalanceamento,
+        secao_fase_mm2: float,
+        material: str = "cobre",
+        isolacao: str = "PVC_70C",
+        metodo: str = "B1"
+    ) -> DimensionamentoNeutro:
+        """
+        Neutro do alimentador de um quadro trifásico a partir das correntes de fase do
+        balanceamento (`BalanceadorFases`) e da seção já escolhida para as fases.
+        """
+        secao_neutro = self.selecionador_cabo.selecionar_secao_neutro(
+            balanceamento.corrente_neutro_A, secao_fase_mm2, material, isolacao, metodo
+        )
+        return DimensionamentoNeutro(
+            corrente_neutro_A=balanceamento.corrente_neutro_A,
+            secao_fase_mm2=secao_fase_mm2,
+            secao_neutro_mm2=secao_neutro,
+            reduzido=secao_neutro < secao_fase_mm2
+        )
+
+    @staticmethod
+    def _quedas_do_lote(
+        quedas_montante: Optional[Mapping[str, float]], lote: Sequence[Circuito]
+    ) -> Optional[Dict[str, float]]:
+        # Cada lote leva ao pool só as quedas dos seus circuitos
+        if not quedas_montante:
+            return None
+        return {c.id: quedas_montante[c.id] for c in lote if c.id in quedas_montante}
+
+    @staticmethod
+    def _dividir_em_lotes(circuitos: List[Circuito], num_workers: int) -> List[List[Circuito]]:
+        # ~4 lotes por worker equilibra a carga sem pagar serialização circuito a circuito
+        tamanho = max(1, -(-len(circuitos) // (num_workers * 4)))
+        return [circuitos[i:i + tamanho] for i in range(0, len(circuitos), tamanho)]
+
+    @staticmethod
+    def _resultado_falha(circuito: Circuito, erro: Exception) -> ResultadoDimensionamento:
+        telemetria.incrementar("dimensionamento_falhas", motivo="excecao")
+        builder = ResultadoBuilder(circuito.id)
+        builder.resultado.erros_entrada.append(f"Falha no Motor de Cálculo NBR 5410: {erro}")
         return builder.compilar()
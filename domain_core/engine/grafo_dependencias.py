@@ -0,0 +1,202 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.zona import Zona
+from domain_core.schemas.local import Local
+from domain_core.schemas.carga import Carga
+from domain_core.schemas.circuito import Circuito
+from domain_core.schemas.resultados import ResultadoDimensionamento
+from domain_core.schemas.alteracoes import AlteracoesProjeto, CampoAlterado, DiferencaResultado
+from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
+
+# Nós do grafo: ('projeto',), ('zona', id), ('local', id), ('carga', id) e
+# ('locais_da_zona', id) para circuitos sem cargas, que herdam os locais da própria zona.
+No = Tuple[Hashable, ...]
+NO_PROJETO: No = ('projeto',)
+
+class GrafoDependenciasProjeto:
+    """
+    Mantém o projeto dimensionado e o grafo Projeto/Zonas/Locais/Cargas -> Circuitos -> Resultados.
+    Dado um conjunto de alterações, recalcula apenas os circuitos afetados e devolve o diff
+    dos resultados. O custo de uma edição é proporcional aos circuitos que dependem dela,
+    e não ao tamanho do projeto.
+
+    Os locais de um circuito são os locais das suas cargas; sem cargas conhecidas,
+    são os locais da zona do circuito.
+    """
+
+    def __init__(
+        self,
+        projeto: ProjetoEletrico,
+        zonas: Iterable[Zona] = (),
+        locais: Iterable[Local] = (),
+        cargas: Iterable[Carga] = (),
+        circuitos: Iterable[Circuito] = (),
+        has_dr: bool = False,
+        dimensionador: Optional[DimensionadorProjeto] = None
+    ):
+        self.projeto = projeto
+        self.has_dr = has_dr
+        self.dimensionador = dimensionador or DimensionadorProjeto()
+
+        self.zonas: Dict[str, Zona] = {z.id: z for z in zonas}
+        self.locais: Dict[str, Local] = {l.id: l for l in locais}
+        self.cargas: Dict[str, Carga] = {c.id: c for c in cargas}
+        self.circuitos: Dict[str, Circuito] = {c.id: c for c in circuitos}
+        self.resultados: Dict[str, ResultadoDimensionamento] = {}
+
+        self._locais_por_zona: Dict[str, Dict[str, Local]] = {}
+        for local in self.locais.values():
+            self._locais_por_zona.setdefault(local.zona_id, {})[local.id] = local
+
+        self._dependencias: Dict[str, Set[No]] = {}
+        self._dependentes: Dict[No, Set[str]] = {}
+
+        for circuito_id in self.circuitos:
+            self._recalcular(circuito_id)
+
+    # ------------------------------------------------------------------ consultas
+
+    def circuitos_dependentes(self, no: No) -> Set[str]:
+        return set(self._dependentes.get(no, ()))
+
+    def locais_do_circuito(self, circuito: Circuito) -> List[Local]:
+        locais: Dict[str, Local] = {}
+        for carga_id in circuito.cargas_ids:
+            carga = self.cargas.get(carga_id)
+            if carga is not None and carga.local_id in self.locais:
+                locais[carga.local_id] = self.locais[carga.local_id]
+        if not locais:
+            return list(self._locais_por_zona.get(circuito.zona_id, {}).values())
+        return list(locais.values())
+
+    # ------------------------------------------------------------------ alterações
+
+    def aplicar_alteracoes(self, alteracoes: AlteracoesProjeto) -> List[DiferencaResultado]:
+        """
+        Aplica as alterações, recalcula só os circuitos afetados e devolve, para cada circuito
+        cujo resultado mudou (ou que foi criado/removido), os campos alterados.
+        """
+        afetados: Set[str] = set()
+
+        if alteracoes.projeto is not None:
+            self.projeto = alteracoes.projeto
+            afetados |= self.circuitos_dependentes(NO_PROJETO)
+
+        for zona in alteracoes.zonas:
+            self.zonas[zona.id] = zona
+            afetados |= self.circuitos_dependentes(('zona', zona.id))
+        for zona_id in alteracoes.zonas_removidas:
+            self.zonas.pop(zona_id, None)
+            afetados |= self.circuitos_dependentes(('zona', zona_id))
+
+        for local in alteracoes.locais:
+            afetados |= self._remover_local(local.id)
+            self.locais[local.id] = local
+            self._locais_por_zona.setdefault(local.zona_id, {})[local.id] = local
+            afetados |= self.circuitos_dependentes(('local', local.id))
+            afetados |= self.circuitos_dependentes(('locais_da_zona', local.zona_id))
+        for local_id in alteracoes.locais_removidos:
+            afetados |= self._remover_local(local_id)
+
+        for carga in alteracoes.cargas:
+            self.cargas[carga.id] = carga
+            afetados |= self.circuitos_dependentes(('carga', carga.id))
+        for carga_id in alteracoes.cargas_removidas:
+            self.cargas.pop(carga_id, None)
+            afetados |= self.circuitos_dependentes(('carga', carga_id))
+
+        for circuito in alteracoes.circuitos:
+            self.circuitos[circuito.id] = circuito
+            afetados.add(circuito.id)
+
+        diferencas: List[DiferencaResultado] = []
+        for circuito_id in alteracoes.circuitos_removidos:
+            if self.circuitos.pop(circuito_id, None) is None:
+                continue
+            self._desligar(circuito_id)
+            self.resultados.pop(circuito_id, None)
+            afetados.discard(circuito_id)
+            diferencas.append(DiferencaResultado(circuito_id=circuito_id, removido=True))
+
+        for circuito_id in sorted(afetados):
+            if circuito_id not in self.circuitos:
+                continue
+            anterior = self.resultados.get(circuito_id)
+            novo = self._recalcular(circuito_id)
+            diferenca = self._comparar(circuito_id, anterior, novo)
+            if diferenca is not None:
+                diferencas.append(diferenca)
+        return diferencas
+
+    def _remover_local(self, local_id: str) -> Set[str]:
+        local = self.locais.pop(local_id, None)
+        if local is None:
+            return set()
+        self._locais_por_zona.get(local.zona_id, {}).pop(local_id, None)
+        return (
+            self.circuitos_dependentes(('local', local_id))
+            | self.circuitos_dependentes(('locais_da_zona', local.zona_id))
+        )
+
+    # ------------------------------------------------------------------ internos
+
+    def _dependencias_do_circuito(self, circuito: Circuito) -> Set[No]:
+        dependencias: Set[No] = {NO_PROJETO, ('zona', circuito.zona_id)}
+        tem_local_de_carga = False
+        for carga_id in circuito.cargas_ids:
+            # Cargas ainda inexistentes também são dependências: criá-las muda o circuito
+            dependencias.add(('carga', carga_id))
+            carga = self.cargas.get(carga_id)
+            if carga is not None:
+                dependencias.add(('local', carga.local_id))
+                tem_local_de_carga = tem_local_de_carga or carga.local_id in self.locais
+        if not tem_local_de_carga:
+            dependencias.add(('locais_da_zona', circuito.zona_id))
+            for local_id in self._locais_por_zona.get(circuito.zona_id, {}):
+                dependencias.add(('local', local_id))
+        return dependencias
+
+    def _desligar(self, circuito_id: str):
+        for no in self._dependencias.pop(circuito_id, ()):
+            dependentes = self._dependentes.get(no)
+            if dependentes is not None:
+                dependentes.discard(circuito_id)
+                if not dependentes:
+                    del self._dependentes[no]
+
+    def _recalcular(self, circuito_id: str) -> ResultadoDimensionamento:
+        circuito = self.circuitos[circuito_id]
+
+        self._desligar(circuito_id)
+        dependencias = self._dependencias_do_circuito(circuito)
+        self._dependencias[circuito_id] = dependencias
+        for no in dependencias:
+            self._dependentes.setdefault(no, set()).add(circuito_id)
+
+        resultado = self.dimensionador.processar_circuito_isolado(
+            self.projeto, self.locais_do_circuito(circuito), self.zonas, circuito, has_dr=self.has_dr
+        )
+        self.resultados[circuito_id] = resultado
+        return resultado
+
+    @staticmethod
+    def _comparar(
+        circuito_id: str,
+        anterior: Optional[ResultadoDimensionamento],
+        novo: ResultadoDimensionamento
+    ) -> Optional[DiferencaResultado]:
+        depois = novo.model_dump(mode='json')
+        if anterior is None:
+            return DiferencaResultado(
+                circuito_id=circuito_id, novo=True,
+                campos={k: CampoAlterado(antes=None, depois=v) for k, v in depois.items()}
+            )
+        antes = anterior.model_dump(mode='json')
+        campos = {
+            k: CampoAlterado(antes=antes.get(k), depois=v)
+            for k, v in depois.items() if antes.get(k) != v
+        }
+        if not campos:
+            return None
+        return DiferencaResultado(circuito_id=circuito_id, campos=campos)
@@ -0,0 +1,82 @@
+"""
+Logging estruturado (stdlib `logging`) compartilhado por domain_core e backend.
+
+- Loggers sob o namespace "projel" (`obter_logger("motor.normas")` → "projel.motor.normas").
+- Formatação preguiçosa: use `logger.debug("texto %s", arg)`; a string só é montada se o
+  registro passar pelo nível. Para argumentos caros (ex: `model_dump()`), proteja com
+  `if logger.isEnabledFor(logging.DEBUG):`. Com DEBUG desligado o custo é uma comparação de nível.
+- Campos estruturados: `logger.info("...", extra={"dados": {...}})`.
+- ID de correlação por requisição num ContextVar: propaga para o threadpool do FastAPI
+  (anyio copia o contexto), não para processos do pool de cálculo.
+"""
+import json
+import logging
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+RAIZ = "projel"
+
+_id_correlacao: ContextVar[Optional[str]] = ContextVar("projel_id_correlacao", default=None)
+
+def obter_logger(nome: str) -> logging.Logger:
+    return logging.getLogger(f"{RAIZ}.{nome}")
+
+def definir_id_correlacao(valor: Optional[str]):
+    """Define o ID de correlação do contexto atual; devolve o token para `restaurar_id_correlacao`."""
+    return _id_correlacao.set(valor)
+
+def restaurar_id_correlacao(token):
+    _id_correlacao.reset(token)
+
+def obter_id_correlacao() -> Optional[str]:
+    return _id_correlacao.get()
+
+class FiltroCorrelacao(logging.Filter):
+    """Anexa o ID de correlação do contexto ao registro (também útil com formatos de texto)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.id_correlacao = _id_correlacao.get()
+        return True
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        saida = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "origem": f"{record.module}:{record.lineno}",
+        }
+        id_correlacao = getattr(record, "id_correlacao", None)
+        if id_correlacao:
+            saida["id_correlacao"] = id_correlacao
+        dados = getattr(record, "dados", None)
+        if dados:
+            saida["dados"] = dados
+        if record.exc_info:
+            saida["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(saida, ensure_ascii=False, default=str)
+
+FORMATO_TEXTO = "%(asctime)s %(levelname)s %(name)s [%(id_correlacao)s] %(message)s"
+
+def configurar_logging(nivel: str = "INFO", formato: str = "json", destino=None) -> logging.Logger:
+    """
+    Configura o logger raiz "projel" (sem mexer no root logger nem nos do uvicorn).
+    Idempotente: reconfigurar substitui o handler anterior.
+    """
+    raiz = logging.getLogger(RAIZ)
+    for handler in [h for h in raiz.handlers if getattr(h, "_projel", False)]:
+        raiz.removeHandler(handler)
+
+    handler = logging.StreamHandler(destino or sys.stderr)
+    handler._projel = True
+    handler.addFilter(FiltroCorrelacao())
+    handler.setFormatter(FormatadorJSON() if formato == "json" else logging.Formatter(FORMATO_TEXTO))
+    raiz.addHandler(handler)
+    raiz.setLevel(nivel.upper())
+    raiz.propagate = False
+    return raiz
@@ -0,0 +1,81 @@
+"""
+Representação interna do motor durante o dimensionamento de um circuito.
+
+As entradas (Projeto, Zona, Circuito...) já chegam validadas pelo pydantic na borda da API;
+dentro do motor os valores intermediários são produzidos pelo próprio código e não precisam
+ser revalidados. Por isso o contexto e o resultado vivem em estruturas leves (`__slots__` e
+NamedTuple) e o resultado é convertido uma única vez, no fim, numa só chamada ao validador
+do pydantic-core. (`model_construct` foi medido e é mais lento que isso no pydantic 2.x:
+a montagem em Python custa mais que a validação em Rust.)
+
+`ResultadoParcial` e `Verificacao` espelham os campos de domain_core/schemas/resultados.py.
+"""
+from typing import List, NamedTuple, Optional, Union
+
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.local import Local
+from domain_core.schemas.zona import Zona
+from domain_core.schemas.circuito import Circuito
+from domain_core.schemas.memoria_calculo import EventoMemoria
+from domain_core.schemas.resultados import ResultadoDimensionamento, StatusDimensionamento
+from domain_core.engine.contexto_instalacao import RESTRICOES_PADRAO, ContextoInstalacao, RestricoesNormativas
+
+class ContextoCircuito:
+    """
+    Equivalente leve de `ContextoInstalacao` para o caminho quente: mesmos atributos (é o que
+    RegrasZonaEngine lê), sem validação nem a maquinaria de atributos do pydantic.
+    """
+    __slots__ = ("projeto", "locais", "zona_governante", "circuito", "restricoes")
+
+    def __init__(self, projeto: ProjetoEletrico, locais: List[Local], zona_governante: Zona, circuito: Circuito):
+        self.projeto = projeto
+        self.locais = locais
+        self.zona_governante = zona_governante
+        self.circuito = circuito
+        self.restricoes: RestricoesNormativas = RESTRICOES_PADRAO
+
+    influencias_externas = property(ContextoInstalacao.influencias_externas.fget)
+
+class Verificacao(NamedTuple):
+    """Espelho leve de `VerificacaoNormativa` (mesmos campos, mesma ordem)."""
+    criterio: str
+    status: StatusDimensionamento
+    valor_calculado: Union[float, str]
+    limite_normativo: Union[float, str, None]
+    mensagem: str
+    referencia_nbr: str
+
+class ResultadoParcial:
+    """Acumulador mutável do resultado de um circuito (mesmos nomes de `ResultadoDimensionamento`)."""
+    __slots__ = (
+        "circuito_id", "corrente_projeto_ib", "corrente_corrigida_iz", "disjuntor_nominal_in",
+        "curva_disjuntor", "secao_condutor_mm2", "queda_tensao_pct", "verificacoes", "eventos", "erros_entrada",
+    )
+
+    def __init__(self, circuito_id: Optional[str]):
+        self.circuito_id = circuito_id
+        self.corrente_projeto_ib: float = 0.0
+        self.corrente_corrigida_iz: Optional[float] = None
+        self.disjuntor_nominal_in: Optional[float] = None
+        self.curva_disjuntor: Optional[str] = None
+        self.secao_condutor_mm2: Optional[float] = None
+        self.queda_tensao_pct: Optional[float] = None
+        self.verificacoes: List[Verificacao] = []
+        self.eventos: List[EventoMemoria] = []
+        self.erros_entrada: List[str] = []
+
+    def para_schema(self, status_global: StatusDimensionamento) -> ResultadoDimensionamento:
+        # Uma única chamada ao validador (Rust) monta o resultado e os modelos aninhados
+        return ResultadoDimensionamento.model_validate({
+            "circuito_id": self.circuito_id,
+            "status_global": status_global,
+            "corrente_projeto_ib": self.corrente_projeto_ib,
+            "corrente_corrigida_iz": self.corrente_corrigida_iz,
+            "disjuntor_nominal_in": self.disjuntor_nominal_in,
+            "curva_disjuntor": self.curva_disjuntor,
+            "secao_condutor_mm2": self.secao_condutor_mm2,
+            "queda_tensao_pct": self.queda_tensao_pct,
+            "verificacoes": [v._asdict() for v in self.verificacoes],
+            "memoria": {"eventos": self.eventos},
+            "erros_entrada": self.erros_entrada,
+        })
@@ -1,16 +1,52 @@
+import hashlib
 import os
+import pickle
+import tempfile
 import yaml
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from domain_core.engine.log_estruturado import obter_logger
+
+logger = obter_logger("motor.normas")
+
+# Incrementar quando a estrutura gravada no snapshot mudar (invalida snapshots antigos)
+FORMATO_SNAPSHOT = 1
+
+# Loader em C (libyaml) quando disponível; mesmo comportamento do safe_load
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Tradução dos Enums do Frontend/Domínio para as chaves exatas do YAML da Norma
+MATERIAL_POR_ALIAS = {"COBRE": "cobre", "ALUMINIO": "aluminio"}
+ISOLACAO_POR_ALIAS = {"PVC": "PVC_70C", "EPR": "EPR_90C", "XLPE": "XLPE_90C"}
+
+# Teto do memo de aliases: as chaves vêm crus da API (o mais antigo sai primeiro)
+MAX_ALIASES_AMPACIDADE = 1024
+
+def normalizar_material(material: str) -> str:
+    """"COBRE"/"Cobre"/"cobre" -> "cobre" (chave do YAML)."""
+    return MATERIAL_POR_ALIAS.get(material.upper(), material.lower())
+
+def normalizar_isolacao(isolacao: str) -> str:
+    """"PVC" -> "PVC_70C"; chaves já normalizadas passam inalteradas."""
+    return ISOLACAO_POR_ALIAS.get(isolacao.upper(), isolacao)
+
+class TabelaAmpacidade(NamedTuple):
+    """Arrays paralelos de uma tabela de ampacidade, ordenados por seção crescente."""
+    secoes: Tuple[float, ...]
+    capacidades: Tuple[float, ...]
 
 class NormativeRepository:
     """
     Serviço encarregado da ingestão determinística e read-only de arquivos YAML 
     (NBR5410.yaml e regras_normativas_5410.yaml) para uso do motor de cálculo.
+
+    O resultado do parse é mantido num snapshot binário (pickle) versionado pelo hash
+    do conteúdo dos YAMLs. Editar um YAML muda o hash e força a regeneração automática.
     """
     _instance = None
     _docs_dir: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "docs")
     nbr_data: Dict[str, Any] = {}
     regras_data: Dict[str, Any] = {}
+    versao_dados: str = ""
     
     def __new__(cls):
         if cls._instance is None:
@@ -22,60 +58,180 @@ class NormativeRepository:
         nbr_path = os.path.join(self._docs_dir, "NBR5410.yaml")
         regras_path = os.path.join(self._docs_dir, "regras_normativas_5410.yaml")
         
-        with open(nbr_path, 'r', encoding='utf-8') as f:
-            self.nbr_data = yaml.safe_load(f)
-            
-        with open(regras_path, 'r', encoding='utf-8') as f:
-            docs: List[Any] = list(yaml.safe_load_all(f))
-            # O primeiro doc contem a chave 'regras_normativas', ou as regras tao soltas
-            if docs and 'regras_normativas' in docs[0]:
-                self.regras_data = {'regras_normativas': docs[0]['regras_normativas']}
-                # Captura docs subsequentes e append na lista de regras
-                for i in range(1, len(docs)):
-                   doc = docs[i]
-                   if doc and isinstance(doc, list):
-                       self.regras_data['regras_normativas'].extend(doc)
-                   elif doc and isinstance(doc, dict) and 'regras_normativas' not in doc:
-                        # As regras estão diretamente no doc root
-                        # O YAML esta formatado com '-' no comeco, o pyyaml pode ler isso
-                        pass
-            elif docs:
-                # O YAML usa --- antes de cada item da lista (invalido pra lista continua)
-                # Vamos simplificar: se for lista de dicts (por doc)
-                regras = []
-                for doc in docs:
-                     if isinstance(doc, dict):
-                          if 'regras_normativas' in doc:
-                               regras.extend(doc['regras_normativas'])
-                          else:
-                               # Se for um doc isolado que parece regra
-                               if 'id' in doc: regras.append(doc)
-                     elif isinstance(doc, list):
-                          regras.extend(doc)
-                self.regras_data = {'regras_normativas': regras}
-            else:
-                self.regras_data = {'regras_normativas': []}
+        with open(nbr_path, 'rb') as f:
+            nbr_bytes = f.read()
+        with open(regras_path, 'rb') as f:
+            regras_bytes = f.read()
+
+        # O hash do conteúdo dos YAMLs identifica a versão dos dados normativos.
+        # Se o snapshot compilado bate com ele, o parse YAML (lento) é dispensado.
+        digest = hashlib.sha256()
+        digest.update(str(FORMATO_SNAPSHOT).encode())
+        digest.update(nbr_bytes)
+        digest.update(regras_bytes)
+        self.versao_dados = digest.hexdigest()
+
+        dados = self._ler_snapshot(self.versao_dados)
+        if dados is None:
+            dados = {
+                'nbr_data': yaml.load(nbr_bytes, Loader=_YamlLoader),
+                'regras_data': self._montar_regras(list(yaml.load_all(regras_bytes, Loader=_YamlLoader))),
+            }
+            self._gravar_snapshot(self.versao_dados, dados)
+
+        self.nbr_data = dados['nbr_data']
+        self.regras_data = dados['regras_data']
+        self._construir_indice_ampacidade()
+        self._compilar_indice_regras()
+
+    @classmethod
+    def _snapshot_path(cls) -> str:
+        cache_dir = os.environ.get("PROJEL_NORMATIVE_CACHE_DIR") or os.path.join(cls._docs_dir, ".cache")
+        return os.path.join(cache_dir, "normative_snapshot.pickle")
+
+    def _ler_snapshot(self, versao: str) -> Optional[Dict[str, Any]]:
+        """Lê o snapshot compilado se ele corresponder à versão atual dos YAMLs."""
+        path = self._snapshot_path()
+        try:
+            with open(path, 'rb') as f:
+                # Cabeçalho: hash hex + '\n'. Permite descartar snapshots velhos sem desserializar.
+                cabecalho = f.readline().strip().decode('ascii')
+                if cabecalho != versao:
+                    return None
+                return pickle.load(f)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _gravar_snapshot(self, versao: str, dados: Dict[str, Any]):
+        """Grava o snapshot de forma atômica. Falhas (ex: disco read-only) não são fatais."""
+        path = self._snapshot_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(versao.encode('ascii') + b'\n')
+                pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Snapshot normativo não gravado: %s", e, extra={"dados": {"caminho": path}})
+
+    @staticmethod
+    def _montar_regras(docs: List[Any]) -> Dict[str, Any]:
+        # O primeiro doc contem a chave 'regras_normativas', ou as regras tao soltas
+        if docs and 'regras_normativas' in docs[0]:
+            regras_data = {'regras_normativas': docs[0]['regras_normativas']}
+            # Captura docs subsequentes e append na lista de regras
+            for i in range(1, len(docs)):
+               doc = docs[i]
+               if doc and isinstance(doc, list):
+                   regras_data['regras_normativas'].extend(doc)
+               elif doc and isinstance(doc, dict) and 'regras_normativas' not in doc:
+                    # As regras estão diretamente no doc root
+                    # O YAML esta formatado com '-' no comeco, o pyyaml pode ler isso
+                    pass
+            return regras_data
+        elif docs:
+            # O YAML usa --- antes de cada item da lista (invalido pra lista continua)
+            # Vamos simplificar: se for lista de dicts (por doc)
+            regras = []
+            for doc in docs:
+                 if isinstance(doc, dict):
+                      if 'regras_normativas' in doc:
+                           regras.extend(doc['regras_normativas'])
+                      else:
+                           # Se for um doc isolado que parece regra
+                           if 'id' in doc: regras.append(doc)
+                 elif isinstance(doc, list):
+                      regras.extend(doc)
+            return {'regras_normativas': regras}
+        else:
+            return {'regras_normativas': []}
 
     def get_todas_regras(self) -> List[Dict[str, Any]]:
         """Retorna todas as regras normativas."""
         return self.regras_data.get('regras_normativas', [])
+
+    def get_indice_regras_influencia(self) -> Dict[str, Dict[str, Tuple[int, ...]]]:
+        """
+        Índice invertido: categoria de influência (chave do YAML, ex: 'PresencaAgua')
+        -> código (ex: 'AD4') -> posições, em `get_todas_regras()`, das regras disparadas por ele.
+        """
+        return self._indice_regras_influencia
+
+    def _compilar_indice_regras(self):
+        """
+        Compila as condições `condicoes.influencias` de todas as regras num índice invertido,
+        para que a avaliação de uma zona custe algumas consultas em dict em vez de varrer as regras.
+        """
+        indice: Dict[str, Dict[str, List[int]]] = {}
+        for posicao, regra in enumerate(self.get_todas_regras()):
+            condicoes = (regra.get('condicoes') or {}).get('influencias') or {}
+            for categoria, codigos in condicoes.items():
+                if isinstance(codigos, str):
+                    codigos = [codigos]
+                por_codigo = indice.setdefault(categoria, {})
+                for codigo in codigos or []:
+                    posicoes = por_codigo.setdefault(str(codigo), [])
+                    if posicao not in posicoes:
+                        posicoes.append(posicao)
+        self._indice_regras_influencia = {
+            categoria: {codigo: tuple(posicoes) for codigo, posicoes in por_codigo.items()}
+            for categoria, por_codigo in indice.items()
+        }
         
     def get_tabela_ampacidade(self, material: str, isolacao: str, metodo: str, numero_condutores: int) -> Dict[float, float]:
         """
         Retorna a tabela de ampacidade para as condições dadas.
         Retorno: dict onde a chave é a seção (mm2) e o valor é a corrente máxima (A).
+        No caminho de cálculo prefira `get_indice_ampacidade`, que não aloca por consulta.
         """
-        # Tradução dos Enums do Frontend/Domínio para as chaves exatas do YAML da Norma
-        mat_map = {"COBRE": "cobre", "ALUMINIO": "aluminio"}
-        mat_key = mat_map.get(material.upper(), material.lower())
-        
-        iso_map = {"PVC": "PVC_70C", "EPR": "EPR_90C", "XLPE": "XLPE_90C"}
-        iso_key = iso_map.get(isolacao.upper(), isolacao)
-        
-        try:
-            print(f"[DEBUG NBR] Buscando ampacidade: Mat={mat_key}, Iso={iso_key}, Met={metodo}, Cond={numero_condutores}")
-            tabela = self.nbr_data['ampacidade'][mat_key][iso_key][metodo][str(numero_condutores)]
-            return {float(k): float(v) for k, v in tabela.items() if v is not None}
-        except KeyError as e:
-            print(f"[ERROR NBR] KeyError ao buscar tabela de ampacidade! Chave não encontrada: {e}")
+        indice = self.get_indice_ampacidade(material, isolacao, metodo, numero_condutores)
+        if indice is None:
             return {}
+        return dict(zip(indice.secoes, indice.capacidades))
+
+    def get_indice_ampacidade(self, material: str, isolacao: str, metodo: str, numero_condutores: int) -> Optional[TabelaAmpacidade]:
+        """
+        Retorna a tabela pré-indexada (seções e capacidades ordenadas) ou None se não existir.
+        A tradução de aliases (ex: "COBRE", "PVC") é resolvida uma vez e memorizada, até
+        MAX_ALIASES_AMPACIDADE chaves (uma tabela inexistente é logada uma vez enquanto memorizada).
+        """
+        chave = (material, isolacao, metodo, numero_condutores)
+        try:
+            return self._indice_por_alias[chave]
+        except KeyError:
+            pass
+
+        mat_key = normalizar_material(material)
+        iso_key = normalizar_isolacao(isolacao)
+        indice = self._indice_ampacidade.get((mat_key, iso_key, metodo, int(numero_condutores)))
+        if indice is None:
+            logger.error("Tabela de ampacidade inexistente", extra={"dados": {
+                "material": mat_key, "isolacao": iso_key, "metodo": metodo, "condutores": numero_condutores
+            }})
+        if len(self._indice_por_alias) >= MAX_ALIASES_AMPACIDADE:
+            self._indice_por_alias.pop(next(iter(self._indice_por_alias)), None)
+        self._indice_por_alias[chave] = indice
+        return indice
+
+    def _construir_indice_ampacidade(self):
+        """
+        Pré-computa, para cada (material, isolação, método, nº condutores), os arrays paralelos
+        de seções e capacidades ordenados por seção. Imutável após o carregamento.
+        """
+        indice: Dict[Tuple[str, str, str, int], TabelaAmpacidade] = {}
+        for mat_key, por_isolacao in (self.nbr_data.get('ampacidade') or {}).items():
+            for iso_key, por_metodo in por_isolacao.items():
+                for metodo, por_condutores in por_metodo.items():
+                    for num_condutores, tabela in por_condutores.items():
+                        pares = sorted((float(k), float(v)) for k, v in tabela.items() if v is not None)
+                        secoes = tuple(secao for secao, _ in pares)
+                        capacidades = tuple(cap for _, cap in pares)
+                        # A busca binária depende de a capacidade crescer com a seção
+                        if any(a > b for a, b in zip(capacidades, capacidades[1:])):
+                            raise ValueError(
+                                f"Tabela de ampacidade não monotônica em {mat_key}/{iso_key}/{metodo}/{num_condutores}"
+                            )
+                        indice[(mat_key, iso_key, metodo, int(num_condutores))] = TabelaAmpacidade(secoes, capacidades)
+        self._indice_ampacidade = indice
+        self._indice_por_alias = {}
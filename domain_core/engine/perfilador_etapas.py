@@ -0,0 +1,127 @@
+"""
+Perfilamento opcional das etapas do dimensionamento (contexto, regras, corrente, condutor,
+queda de tensão, disjuntor, DR e montagem do resultado).
+
+Uso:
+    perfilador = PerfiladorEtapas(medir_alocacoes=True)
+    engine.processar_projeto(..., perfilador=perfilador)
+    perfilador.agregar()        # estatísticas por etapa no lote
+    perfilador.circuitos        # medidas de cada circuito
+
+A medição é por "voltas": `marcar(etapa)` atribui à etapa o tempo decorrido desde a marca
+anterior, sem reindentar o fluxo do motor. Com `medir_alocacoes`, usa tracemalloc (liga o
+rastreamento se estiver desligado e desliga em `encerrar`) e registra, por etapa, a memória
+líquida retida e o pico alocado. O tracemalloc deixa o código bem mais lento: compare tempos
+só entre execuções com a mesma configuração.
+"""
+import tracemalloc
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from domain_core.schemas.resultados import EstatisticaEtapa, PerfilCircuito, PerfilEtapa, PerfilLote
+
+class _MarcadorCircuito:
+    __slots__ = ("_perfilador", "_etapas", "_ultimo", "_memoria", "circuito_id")
+
+    def __init__(self, perfilador: "PerfiladorEtapas", circuito_id: Optional[str]):
+        self._perfilador = perfilador
+        self.circuito_id = circuito_id
+        self._etapas: Dict[str, List[float]] = {}
+        self._memoria = None
+        if perfilador.medir_alocacoes:
+            tracemalloc.reset_peak()
+            self._memoria = tracemalloc.get_traced_memory()[0]
+        self._ultimo = perf_counter()
+
+    def marcar(self, etapa: str):
+        agora = perf_counter()
+        medida = self._etapas.get(etapa)
+        if medida is None:
+            medida = self._etapas[etapa] = [0.0, 0, 0]
+        medida[0] += agora - self._ultimo
+        if self._memoria is not None:
+            atual, pico = tracemalloc.get_traced_memory()
+            medida[1] += atual - self._memoria
+            medida[2] = max(medida[2], pico - self._memoria)
+            tracemalloc.reset_peak()
+            self._memoria = atual
+        # O custo da própria medição fica fora da próxima etapa
+        self._ultimo = perf_counter()
+
+    def concluir(self):
+        self._perfilador._registrar(PerfilCircuito(
+            circuito_id=self.circuito_id,
+            etapas=[
+                PerfilEtapa(etapa=nome, duracao_ms=d * 1000, alocado_bytes=a, pico_bytes=p)
+                for nome, (d, a, p) in self._etapas.items()
+            ]
+        ))
+
+class _MarcadorNulo:
+    """Usado quando não há perfilador: todas as marcas são no-op."""
+    __slots__ = ()
+
+    def marcar(self, etapa: str):
+        pass
+
+    def concluir(self):
+        pass
+
+MARCADOR_NULO = _MarcadorNulo()
+
+class PerfiladorEtapas:
+    def __init__(self, medir_alocacoes: bool = False):
+        self.medir_alocacoes = medir_alocacoes
+        self.circuitos: List[PerfilCircuito] = []
+        self._iniciou_tracemalloc = False
+        if medir_alocacoes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+
+    def iniciar_circuito(self, circuito_id: Optional[str]) -> _MarcadorCircuito:
+        return _MarcadorCircuito(self, circuito_id)
+
+    def _registrar(self, perfil: PerfilCircuito):
+        self.circuitos.append(perfil)
+
+    def mesclar(self, outro: "PerfiladorEtapas"):
+        """Junta as medidas de outro perfilador (ex: de um worker do pool de processos)."""
+        self.circuitos.extend(outro.circuitos)
+
+    def encerrar(self):
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def __getstate__(self):
+        # Enviado aos workers: o estado do tracemalloc é do processo que o iniciou
+        estado = self.__dict__.copy()
+        estado["_iniciou_tracemalloc"] = False
+        return estado
+
+    def agregar(self) -> PerfilLote:
+        acumulado: Dict[str, List[float]] = {}
+        for perfil in self.circuitos:
+            for etapa in perfil.etapas:
+                a = acumulado.get(etapa.etapa)
+                if a is None:
+                    a = acumulado[etapa.etapa] = [0, 0.0, 0.0, 0, 0]
+                a[0] += 1
+                a[1] += etapa.duracao_ms
+                a[2] = max(a[2], etapa.duracao_ms)
+                a[3] += etapa.alocado_bytes
+                a[4] = max(a[4], etapa.pico_bytes)
+        total_ms = sum(a[1] for a in acumulado.values())
+        return PerfilLote(
+            circuitos=len(self.circuitos),
+            medir_alocacoes=self.medir_alocacoes,
+            total_ms=total_ms,
+            etapas=[
+                EstatisticaEtapa(
+                    etapa=nome, chamadas=n, total_ms=t, media_ms=t / n, max_ms=m,
+                    fracao=(t / total_ms) if total_ms else 0.0,
+                    alocado_bytes=aloc, pico_bytes=pico
+                )
+                for nome, (n, t, m, aloc, pico) in acumulado.items()
+            ]
+        )
@@ -1,11 +1,25 @@
-from typing import Dict, List, Any, Optional
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from domain_core.engine.contexto_instalacao import ContextoInstalacao, RestricoesNormativas, FatorCorrecao
 from domain_core.engine.normative_repository import NormativeRepository
+from domain_core.engine.cache_lru import CacheLRU
+from domain_core.engine import telemetria
+
+_CAMEL_PARA_SNAKE = re.compile(r'(?<!^)(=[A-Z])')
+
+@lru_cache(maxsize=None)
+def _para_snake_case(chave_yaml: str) -> str:
+    return _CAMEL_PARA_SNAKE.sub(r'_\1', chave_yaml).lower()
 
 class RegrasZonaEngine:
     """
     Responsável por converter influências externas em restrições normativas aplicáveis.
     """
+
+    # Compartilhado entre instâncias: circuitos da mesma zona geram as mesmas restrições
+    _cache_restricoes = CacheLRU(capacidade=512)
     
     def __init__(self):
         self.repo = NormativeRepository()
@@ -14,45 +28,68 @@ class RegrasZonaEngine:
         """
         Avalia as influências da zona e preenche as restrições normativas.
         Consulta regras_normativas_5410.yaml
+
+        O resultado é memorizado pela assinatura (influências, esquema de aterramento,
+        versão das regras) e a instância retornada é imutável e compartilhada.
         """
-        restricoes = RestricoesNormativas()
         influencias = contexto.influencias_externas
-        regras_all = self.repo.get_todas_regras()
-        
-        for regra in regras_all:
-            # Avalia se a regra se aplica a este contexto
-            if self._regra_se_aplica(regra, influencias):
-                self._aplicar_consequencias(regra, restricoes)
-                restricoes.observacoes.append(f"Regra {regra['id']}: {regra['descricao']} (Ref: {regra.get('referencia', {}).get('capitulo')})")
-                
+        projeto = getattr(contexto, 'projeto', None)
+        esquema = getattr(projeto, 'esquema_aterramento', None)
+
+        assinatura = self._assinatura(influencias, esquema)
+        restricoes = self._cache_restricoes.obter(assinatura)
+        if restricoes is None:
+            with telemetria.cronometrar("regras_avaliacao"):
+                restricoes = self._avaliar_regras(influencias)
+            self._cache_restricoes.guardar(assinatura, restricoes)
         return restricoes
-        
-    def _regra_se_aplica(self, regra: Dict[str, Any], influencias: Dict[str, str]) -> bool:
-        condicoes = regra.get('condicoes', {}).get('influencias', {})
-        if not condicoes:
-            return False
-            
-        # Para que a regra se aplique, basta que uma das influências exigidas pela regra
-        # esteja presente com um dos códigos restritos
-        for tipo_influencia, codigos_gatilho in condicoes.items():
-            # Match exato de chave no Pydantic dump das influencias (ex: temp_ambiente -> AA4)
-            # Precisamos mapear as chaves do YAML para as chaves do nosso Enum Influencias.
-            # No YAML: TemperaturaAmbiente: [AA5, AA6] ...
-            # No nosso código (domain_core/enums/influencias.py) temos variaveis com chaves snake_case.
-            # Faremos um match leniente para suportar essa migração.
-            
-            # Buscar valor real da influencia no contexto
+
+    @classmethod
+    def estatisticas_cache(cls) -> Dict[str, int]:
+        """Contadores do cache de restrições (acertos, falhas, tamanho, capacidade)."""
+        return cls._cache_restricoes.estatisticas()
+
+    def _assinatura(self, influencias: Dict[str, Any], esquema_aterramento: Any) -> Tuple:
+        """Chave canônica e hashable: independe da ordem das chaves e de Enum vs str."""
+        def canonico(valor: Any) -> str:
+            if isinstance(valor, Enum):
+                return valor.value
+            return valor if isinstance(valor, str) else repr(valor)
+
+        return (
+            self.repo.versao_dados,
+            canonico(esquema_aterramento) if esquema_aterramento is not None else None,
+            tuple(sorted((chave, canonico(valor)) for chave, valor in influencias.items())),
+        )
+
+    def _avaliar_regras(self, influencias: Dict[str, Any]) -> RestricoesNormativas:
+        if not influencias:
+            return RestricoesNormativas()
+
+        dados: Dict[str, Any] = {'fatores_correcao': [], 'observacoes': []}
+        regras_all = self.repo.get_todas_regras()
+
+        # Índice invertido (categoria -> código -> regras): só as regras candidatas são visitadas.
+        # O valor de cada categoria é resolvido uma única vez, independentemente de quantas regras a usam.
+        posicoes = set()
+        for tipo_influencia, regras_por_codigo in self.repo.get_indice_regras_influencia().items():
             valor_no_contexto = self._encontrar_valor_influencia(tipo_influencia, influencias)
-            
-            if valor_no_contexto and valor_no_contexto in codigos_gatilho:
-                return True
+            if isinstance(valor_no_contexto, Enum):
+                valor_no_contexto = valor_no_contexto.value
+            if valor_no_contexto and isinstance(valor_no_contexto, str):
+                posicoes.update(regras_por_codigo.get(valor_no_contexto, ()))
+
+        # Mantém a ordem do YAML nas observações
+        for posicao in sorted(posicoes):
+            regra = regras_all[posicao]
+            self._aplicar_consequencias(regra, dados)
+            dados['observacoes'].append(f"Regra {regra['id']}: {regra['descricao']} (Ref: {regra.get('referencia', {}).get('capitulo')})")
                 
-        return False
+        return RestricoesNormativas(**dados)
         
     def _encontrar_valor_influencia(self, chave_yaml: str, influencias: Dict[str, str]) -> Optional[str]:
         """Traduz ChaveCamelCase para chave_snake_case ou checa valores diretos"""
-        import re
-        snake_case_key = re.sub(r'(?<!^)(=[A-Z])', r'_\1', chave_yaml).lower()
+        snake_case_key = _para_snake_case(chave_yaml)
         
         # Tenta a chave exata camelCase
         if chave_yaml in influencias:
@@ -75,16 +112,17 @@ class RegrasZonaEngine:
                 
         return None
 
-    def _aplicar_consequencias(self, regra: Dict[str, Any], restricoes: RestricoesNormativas):
+    def _aplicar_consequencias(self, regra: Dict[str, Any], restricoes: Dict[str, Any]):
+        """Acumula as consequências da regra em `restricoes` (campos de RestricoesNormativas)."""
         consequencias = regra.get('consequencias', {})
         
         obrigar = consequencias.get('obrigar', {})
         if 'dispositivo' in obrigar:
             disp = obrigar['dispositivo']
             if disp.get('tipo') == 'DR' and disp.get('sensibilidade_max') == '30mA':
-                restricoes.exige_dr_30ma = True
+                restricoes['exige_dr_30ma'] = True
             if disp.get('tipo') == 'DPS':
-                restricoes.exige_dps = True
+                restricoes['exige_dps'] = True
                 
         aplicar = consequencias.get('aplicar', {})
         if 'fator_correcao' in aplicar:
@@ -92,6 +130,6 @@ class RegrasZonaEngine:
             if fc.get('tipo') == 'temperatura':
                 # Simplificação: O valor REAL do fator exige tabela específica de cabo
                 # Adicionamos um placeholder genérico que a seleção de condutor resolverá
-                restricoes.fatores_correcao.append(
+                restricoes.setdefault('fatores_correcao', []).append(
                     FatorCorrecao(tipo="temperatura", valor=1.0, referencia=fc.get('tabela', 'Tabela 43'))
                 )
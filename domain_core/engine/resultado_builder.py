@@ -1,27 +1,35 @@
-from domain_core.schemas.resultados import ResultadoDimensionamento, MemoriaCalculo, StatusDimensionamento
+from domain_core.schemas.resultados import ResultadoDimensionamento, StatusDimensionamento
+from domain_core.engine.modelos_internos import ResultadoParcial
 from domain_core.engine.validacoes_normativas import ValidacoesNormativas
 
 class ResultadoBuilder:
     """
     Construir objeto final ResultadoDimensionamento explicitando como ensinar o que foi calculado.
+    O estado fica num `ResultadoParcial` leve; o modelo pydantic só é criado em `compilar`.
+
+    A memória de cálculo é registrada como eventos `(modelo, *argumentos)` (ver
+    domain_core/schemas/memoria_calculo.py) e só vira texto na serialização.
+    Com `registrar_memoria=False` nenhum passo é guardado (lotes que só querem os números).
     """
-    def __init__(self, circuito_id: str):
-         self.resultado = ResultadoDimensionamento(
-             circuito_id=circuito_id,
-             status_global=StatusDimensionamento.ERRO,
-             corrente_projeto_ib=0,
-             memoria=MemoriaCalculo(passos=[])
-         )
-         
+    def __init__(self, circuito_id: str, registrar_memoria: bool = True):
+         self.resultado = ResultadoParcial(circuito_id)
+         self.registrar_memoria = registrar_memoria
+
+    def registrar(self, modelo: str, *argumentos):
+        if self.registrar_memoria:
+            self.resultado.eventos.append((modelo,) + argumentos)
+
     def adicionar_passo(self, msg: str):
-        self.resultado.memoria.passos.append(msg)
+        """Passo em texto livre (sem modelo em MODELOS_MEMORIA)."""
+        if self.registrar_memoria:
+            self.resultado.eventos.append(msg)
         
     def add_validacao(self, validacao):
         self.resultado.verificacoes.append(validacao)
 
     def compilar(self) -> ResultadoDimensionamento:
         if self.resultado.erros_entrada:
-            self.resultado.status_global = StatusDimensionamento.ERRO
+            status_global = StatusDimensionamento.ERRO
         else:
-            self.resultado.status_global = ValidacoesNormativas.compor_status_global(self.resultado.verificacoes)
-        return self.resultado
+            status_global = ValidacoesNormativas.compor_status_global(self.resultado.verificacoes)
+        return self.resultado.para_schema(status_global)
@@ -1,23 +1,29 @@
-from typing import Optional, List
-from domain_core.engine.normative_repository import NormativeRepository
+import math
+from bisect import bisect_left
+from typing import Dict, Optional, List, Tuple, Union, TYPE_CHECKING
+from domain_core.engine.normative_repository import NormativeRepository, TabelaAmpacidade, normalizar_material
 from domain_core.engine.contexto_instalacao import FatorCorrecao
+from domain_core.engine import telemetria
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class SelecaoCondutor:
     """
     Selecionar seção mínima do condutor cruzando a corrente com Tabelas da NBR 5410.
     """
     
+    # Cópias numpy das tabelas indexadas (criadas sob demanda pelo caminho vetorizado)
+    _arrays_numpy: Dict[TabelaAmpacidade, Tuple["np.ndarray", "np.ndarray"]] = {}
+
     def __init__(self):
         self.repo = NormativeRepository()
         
     def iterar_secoes(self, material: str, isolacao: str, metodo: str, num_condutores: int) -> List[float]:
-        tabela = self.repo.get_tabela_ampacidade(material, isolacao, metodo, num_condutores)
-        if not tabela:
+        indice = self.repo.get_indice_ampacidade(material, isolacao, metodo, num_condutores)
+        if indice is None:
             return []
-            
-        secoes = list(tabela.keys())
-        secoes.sort()
-        return secoes
+        return list(indice.secoes)
         
     def selecionar_secao_por_corrente(
         self, 
@@ -32,19 +38,114 @@ class SelecaoCondutor:
         Seleciona a menor seção cuja Iz seja maior ou igual a IB corrigida (Iz_cabo >= IB_corrigida).
         Respeita também seções mínimas dadas na norma. (ex: Ilum 1.5, TUG 2.5).
         """
-        tabela = self.repo.get_tabela_ampacidade(material, isolacao, metodo, num_condutores)
-        if not tabela:
+        selecao = self.selecionar_secao_e_capacidade(
+            corrente_corrigida, material, isolacao, metodo, num_condutores, is_iluminacao
+        )
+        return selecao[0] if selecao else None
+
+    def selecionar_secao_e_capacidade(
+        self,
+        corrente_corrigida: float,
+        material: str,
+        isolacao: str,
+        metodo: str,
+        num_condutores: int,
+        is_iluminacao: bool = False
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Igual a `selecionar_secao_por_corrente`, devolvendo também a capacidade tabelada
+        da seção escolhida (evita uma segunda consulta à tabela).
+        Busca binária sobre os arrays pré-indexados do repositório.
+        """
+        indice = self.repo.get_indice_ampacidade(material, isolacao, metodo, num_condutores)
+        if indice is None:
+            if telemetria.ativa():
+                telemetria.incrementar("tabela_ampacidade_consultas", resultado="tabela_inexistente")
+            return None
+        if math.isnan(corrente_corrigida):
             return None
-            
+
         secao_minima_norma = 1.5 if is_iluminacao else 2.5
-        
-        secoes = list(tabela.keys())
-        secoes.sort()
-        
-        for secao in secoes:
-            if secao >= secao_minima_norma:
-                capacidade_conducao = tabela[secao]
-                if capacidade_conducao >= corrente_corrigida:
-                    return secao
-                    
-        return None  # Nenhuma seção suporta (projetista excedeu as tabelas do app)
+
+        inicio = bisect_left(indice.secoes, secao_minima_norma)
+        pos = bisect_left(indice.capacidades, corrente_corrigida, inicio)
+        if pos == len(indice.capacidades):
+            if telemetria.ativa():
+                telemetria.incrementar("tabela_ampacidade_consultas", resultado="corrente_excede_tabela")
+            return None  # Nenhuma seção suporta (projetista excedeu as tabelas do app)
+        if telemetria.ativa():
+            telemetria.incrementar("tabela_ampacidade_consultas", resultado="encontrada")
+        return indice.secoes[pos], indice.capacidades[pos]
+
+    # NBR 5410 Tabela 48: seção reduzida do neutro por seção das fases (mm²)
+    SECAO_NEUTRO_REDUZIDA = {
+        35: 25, 50: 25, 70: 35, 95: 50, 120: 70, 150: 70,
+        185: 95, 240: 120, 300: 150, 400: 185,
+    }
+
+    def selecionar_secao_neutro(
+        self,
+        corrente_neutro: float,
+        secao_fase: float,
+        material: str,
+        isolacao: str,
+        metodo: str,
+        num_fases: int = 3
+    ) -> float:
+        """
+        Seção do neutro (NBR 5410 6.2.6.2): igual à das fases, salvo em circuitos trifásicos
+        com fases acima de 25 mm² (cobre) ou 35 mm² (alumínio), onde pode cair para a Tabela 48
+        desde que suporte a corrente de desequilíbrio. Presume conteúdo de 3ª harmônica
+        até 15% (acima disso o neutro não é reduzido).
+        """
+        limite = 35 if normalizar_material(material) == "aluminio" else 25
+        reduzida = self.SECAO_NEUTRO_REDUZIDA.get(secao_fase)
+        if num_fases != 3 or secao_fase <= limite or reduzida is None:
+            return secao_fase
+        selecao = self.selecionar_secao_e_capacidade(corrente_neutro, material, isolacao, metodo, 3)
+        if selecao is None:
+            return secao_fase
+        return min(secao_fase, max(reduzida, selecao[0]))
+
+    def selecionar_secoes_vetorizado(
+        self,
+        correntes: "np.ndarray",
+        material: str,
+        isolacao: str,
+        metodo: str,
+        num_condutores: int,
+        is_iluminacao: Union[bool, "np.ndarray"] = False
+    ) -> "np.ndarray":
+        """
+        Versão vetorizada de `selecionar_secao_por_corrente` para arrays de correntes corrigidas
+        (estudos de sensibilidade, lotes). Usa `searchsorted` sobre as capacidades tabeladas.
+        `is_iluminacao` pode ser um bool para todo o array ou um array booleano elemento a elemento.
+        Retorna um array float64 de seções com NaN onde nenhuma seção suporta a corrente.
+        Requer numpy (dependência opcional do domain_core).
+        """
+        import numpy as np
+
+        correntes = np.asarray(correntes, dtype=np.float64)
+        indice = self.repo.get_indice_ampacidade(material, isolacao, metodo, num_condutores)
+        if indice is None:
+            return np.full(correntes.shape, np.nan)
+
+        arrays = self._arrays_numpy.get(indice)
+        if arrays is None:
+            arrays = (np.array(indice.secoes, dtype=np.float64), np.array(indice.capacidades, dtype=np.float64))
+            self._arrays_numpy[indice] = arrays
+        secoes, capacidades = arrays
+
+        def selecionar(secao_minima_norma: float) -> "np.ndarray":
+            inicio = bisect_left(indice.secoes, secao_minima_norma)
+            # NaN é ordenado ao final pelo searchsorted -> cai em "nenhuma seção suporta"
+            pos = np.searchsorted(capacidades[inicio:], correntes, side='left') + inicio
+            saida = np.full(correntes.shape, np.nan)
+            suportado = pos < len(capacidades)
+            saida[suportado] = secoes[pos[suportado]]
+            return saida
+
+        if np.ndim(is_iluminacao) == 0:
+            return selecionar(1.5 if is_iluminacao else 2.5)
+        mascara_ilum = np.broadcast_to(np.asarray(is_iluminacao, dtype=bool), correntes.shape)
+        return np.where(mascara_ilum, selecionar(1.5), selecionar(2.5))
@@ -0,0 +1,75 @@
+"""
+Ganchos de telemetria do motor de cálculo.
+
+O domínio só emite eventos (contadores e durações com rótulos); quem os agrega e exporta
+é um observador registrado pela aplicação (ex: o backend registra um que alimenta /metrics).
+Sem observador registrado, `incrementar`/`observar_duracao` só checam `None`, mas a chamada
+ainda monta o dict dos rótulos e `cronometrar` cria um objeto. Nos caminhos quentes (por
+consulta à tabela, por circuito) os ganchos ficam atrás de `ativa()`, sem alocação:
+
+    if telemetria.ativa():
+        telemetria.incrementar("tabela_ampacidade_consultas", resultado="encontrada")
+    with telemetria.cronometrar("selecao_condutor") if telemetria.ativa() else telemetria.SEM_CRONOMETRO:
+        ...
+
+Em pools de processos (`processar_projeto` com `max_workers > 1`) cada worker tem o seu
+próprio estado de módulo: eventos emitidos nos workers não chegam ao observador do processo pai.
+"""
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Optional
+
+class ObservadorTelemetria:
+    """Interface do observador. A implementação base descarta tudo."""
+
+    def incrementar(self, nome: str, valor: float = 1.0, **rotulos: str) -> None:
+        pass
+
+    def observar_duracao(self, nome: str, segundos: float, **rotulos: str) -> None:
+        pass
+
+_observador: Optional[ObservadorTelemetria] = None
+
+# Context manager nulo (reutilizável) para os blocos cronometrados com a telemetria desligada
+SEM_CRONOMETRO = nullcontext()
+
+def registrar_observador(observador: Optional[ObservadorTelemetria]) -> None:
+    """Define o observador do processo (None desliga a telemetria)."""
+    global _observador
+    _observador = observador
+
+def ativa() -> bool:
+    return _observador is not None
+
+def incrementar(nome: str, valor: float = 1.0, **rotulos: str) -> None:
+    if _observador is not None:
+        _observador.incrementar(nome, valor, **rotulos)
+
+def observar_duracao(nome: str, segundos: float, **rotulos: str) -> None:
+    if _observador is not None:
+        _observador.observar_duracao(nome, segundos, **rotulos)
+
+class cronometrar:
+    """
+    Context manager que mede a duração do bloco e a reporta como `nome`.
+    Sem observador, nem o relógio é lido.
+
+        with telemetria.cronometrar("regras_avaliacao"):
+            ...
+    """
+    __slots__ = ("nome", "rotulos", "_inicio")
+
+    def __init__(self, nome: str, **rotulos: str):
+        self.nome = nome
+        self.rotulos = rotulos
+        self._inicio = None
+
+    def __enter__(self):
+        if _observador is not None:
+            self._inicio = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._inicio is not None and _observador is not None:
+            _observador.observar_duracao(self.nome, perf_counter() - self._inicio, **self.rotulos)
+        return False
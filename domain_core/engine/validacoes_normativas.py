@@ -1,18 +1,20 @@
-from typing import List
-from domain_core.schemas.resultados import VerificacaoNormativa, StatusDimensionamento
+from typing import Sequence
+from domain_core.schemas.resultados import StatusDimensionamento
+from domain_core.engine.modelos_internos import Verificacao
 
 class ValidacoesNormativas:
     """
     Realizar validação final de conformidade normativa.
     Verifica estado geral mas não sugere soluções.
+    Devolve `Verificacao` (NamedTuple interna), convertida em VerificacaoNormativa no resultado final.
     """
     
     @staticmethod
-    def validar_capacidade_conducao(corrente_projeto: float, capacidade_cabo: float, temp_fc: float) -> VerificacaoNormativa:
+    def validar_capacidade_conducao(corrente_projeto: float, capacidade_cabo: float, temp_fc: float) -> Verificacao:
         status = StatusDimensionamento.OK if capacidade_cabo >= corrente_projeto else StatusDimensionamento.ERRO
         msg = f"In = {corrente_projeto:.2f}A, Iz (corrigida) = {capacidade_cabo:.2f}A. Fator correção aplicado: {temp_fc:.2f}"
         
-        return VerificacaoNormativa(
+        return Verificacao(
             criterio="Capacidade de Condução (Coordenação IB <= IZ)",
             status=status,
             valor_calculado=capacidade_cabo,
@@ -22,10 +24,10 @@ class ValidacoesNormativas:
         )
         
     @staticmethod
-    def validar_queda_tensao(queda_calculada: float, limite_normativo: float) -> VerificacaoNormativa:
+    def validar_queda_tensao(queda_calculada: float, limite_normativo: float) -> Verificacao:
         status = StatusDimensionamento.OK if queda_calculada <= limite_normativo else StatusDimensionamento.ERRO
         
-        return VerificacaoNormativa(
+        return Verificacao(
             criterio="Queda de Tensão",
             status=status,
             valor_calculado=queda_calculada,
@@ -35,7 +37,7 @@ class ValidacoesNormativas:
         )
         
     @staticmethod
-    def validar_protecao_sobrecorrente(disjuntor_in: float, corrente_projeto: float, capacidade_cabo: float) -> VerificacaoNormativa:
+    def validar_protecao_sobrecorrente(disjuntor_in: float, corrente_projeto: float, capacidade_cabo: float) -> Verificacao:
         status = StatusDimensionamento.OK
         msg = f"Condições atendidas: {corrente_projeto:.1f}A <= {disjuntor_in:.1f}A <= {capacidade_cabo:.1f}A"
         
@@ -46,7 +48,7 @@ class ValidacoesNormativas:
             status = StatusDimensionamento.ERRO
             msg = f"Disjuntor maior que a capacidade do cabo ({disjuntor_in:.1f}A > {capacidade_cabo:.1f}A)"
             
-        return VerificacaoNormativa(
+        return Verificacao(
             criterio="Proteção contra Sobrecarga (IN)",
             status=status,
             valor_calculado=disjuntor_in,
@@ -56,10 +58,10 @@ class ValidacoesNormativas:
         )
         
     @staticmethod
-    def verificar_presenca_dr(foi_exigido: bool, esta_presente: bool) -> VerificacaoNormativa:
+    def verificar_presenca_dr(foi_exigido: bool, esta_presente: bool) -> Verificacao:
         if not foi_exigido:
             # Optativo, se não está não tem problema.
-            return VerificacaoNormativa(
+            return Verificacao(
                 criterio="Exigência de Dispositivo DR",
                 status=StatusDimensionamento.OK,
                 valor_calculado="Dispensado",
@@ -71,7 +73,7 @@ class ValidacoesNormativas:
         status = StatusDimensionamento.OK if esta_presente else StatusDimensionamento.ERRO
         msg = "Exigência de DR atendida" if esta_presente else "AMBIENTE DE RISCO. Proteção DR máxima 30mA OBRIGATÓRIA ausente!"
         
-        return VerificacaoNormativa(
+        return Verificacao(
             criterio="Exigência de Dispositivo DR",
             status=status,
             valor_calculado="Presente" if esta_presente else "Ausente",
@@ -81,7 +83,7 @@ class ValidacoesNormativas:
         )
 
     @staticmethod
-    def compor_status_global(verificacoes: List[VerificacaoNormativa]) -> StatusDimensionamento:
+    def compor_status_global(verificacoes: Sequence[Verificacao]) -> StatusDimensionamento:
         for v in verificacoes:
              if v.status == StatusDimensionamento.ERRO:
                  return StatusDimensionamento.ERRO
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class TipoNoDistribuicao(str, Enum):
+    ENTRADA = "entrada"    # Ponto de entrega / origem da instalação
+    QGBT = "qgbt"          # Quadro geral de baixa tensão
+    QUADRO = "quadro"      # Quadros de distribuição (sub-quadros)
+    CIRCUITO = "circuito"  # Circuito terminal
@@ -0,0 +1,10 @@
+from enum import Enum
+
+class Fase(str, Enum):
+    A = "A"
+    B = "B"
+    C = "C"
+
+class ModoBalanceamento(str, Enum):
+    GULOSO = "guloso"            # Rápido, para uso interativo
+    BUSCA_LOCAL = "busca_local"  # Parte do guloso e refina dentro de um orçamento de tempo
@@ -7,3 +7,17 @@ class TipoZona(str, Enum):
     TECNICA = "tecnica"
     EXTERNA = "externa"
     PERSONALIZADA = "personalizada"
+
+# Presets de zonas por tipo de projeto (influências NBR 5410 pré-definidas para a UI)
+PRESETS_ZONAS = {
+    "residencial": [
+        {"id": "res_seca", "nome": "Área Seca (Sala/Quarto)", "descricao": "Ambientes internos sem risco de água.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#81C784"},
+        {"id": "res_molhada", "nome": "Área Molhada (Banheiro/Cozinha)", "descricao": "Locais com presença de água. Exige DR.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD2", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#64B5F6"},
+        {"id": "res_garagem", "nome": "Garagem / Área de Serviço", "descricao": "Umidade eventual e poeira.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD2", "presenca_solidos": "AE2", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#FFB74D"},
+        {"id": "res_externa", "nome": "Área Externa", "descricao": "Exposição ao tempo.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD4", "presenca_solidos": "AE2", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#A1887F"}
+    ],
+    "comercial": [
+        {"id": "com_admin", "nome": "Área Administrativa", "descricao": "Escritórios.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#90CAF9"},
+        {"id": "com_publico", "nome": "Atendimento ao Público", "descricao": "Lojas e recepções.", "influencias": {"temp_ambiente": "AA4", "presenca_agua": "AD1", "presenca_solidos": "AE1", "competencia_pessoas": "BA1", "materiais_construcao": "CA1", "estrutura_edificacao": "CB1"}, "cor": "#CE93D8"}
+    ]
+}
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.zona import Zona
+from domain_core.schemas.local import Local
+from domain_core.schemas.carga import Carga
+from domain_core.schemas.circuito import Circuito
+
+class AlteracoesProjeto(BaseModel):
+    """Conjunto de edições aplicadas de uma vez sobre um projeto já dimensionado."""
+    projeto: Optional[ProjetoEletrico] = Field(default=None, description="Novo estado do projeto, se editado")
+
+    # Entidades criadas ou editadas (upsert por id)
+    zonas: List[Zona] = []
+    locais: List[Local] = []
+    cargas: List[Carga] = []
+    circuitos: List[Circuito] = []
+
+    # Entidades removidas (ids)
+    zonas_removidas: List[str] = []
+    locais_removidos: List[str] = []
+    cargas_removidas: List[str] = []
+    circuitos_removidos: List[str] = []
+
+class CampoAlterado(BaseModel):
+    antes: Any = None
+    depois: Any = None
+
+class DiferencaResultado(BaseModel):
+    """Campos de ResultadoDimensionamento que mudaram para um circuito após as alterações."""
+    circuito_id: str
+    novo: bool = Field(default=False, description="Circuito não tinha resultado antes")
+    removido: bool = Field(default=False, description="Circuito deixou de existir")
+    campos: Dict[str, CampoAlterado] = {}
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
+
+from domain_core.enums.distribuicao import TipoNoDistribuicao
+
+class NoDistribuicao(BaseModel):
+    """
+    Nó da árvore de distribuição (entrada -> QGBT -> quadros -> circuitos).
+    O trecho descrito é o cabo que liga o nó ao seu pai (alimentador ou circuito terminal).
+    """
+    id: str
+    tipo: TipoNoDistribuicao
+    pai_id: Optional[str] = Field(default=None, description="Nó a montante (None só na entrada)")
+
+    # Trecho pai -> nó (sem seção ou comprimento, o trecho não tem queda: ex. barramento)
+    comprimento_m: float = Field(default=0.0, ge=0)
+    secao_mm2: Optional[float] = Field(default=None, gt=0)
+    material_condutor: str = Field(default="cobre", description="cobre/aluminio")
+    tensao_V: float = Field(..., gt=0)
+    fases: Literal[1, 2, 3] = 1
+
+    potencia_W: float = Field(default=0.0, ge=0, description="Carga ligada diretamente ao nó (circuitos)")
+
+    @model_validator(mode='after')
+    def validar_pai(self):
+        if self.tipo == TipoNoDistribuicao.ENTRADA and self.pai_id is not None:
+            raise ValueError("A entrada é a origem da instalação e não tem nó a montante.")
+        if self.tipo != TipoNoDistribuicao.ENTRADA and self.pai_id is None:
+            raise ValueError("Obrigatorio informar 'pai_id' para quadros e circuitos.")
+        return self
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+
+from domain_core.enums.fases import Fase, ModoBalanceamento
+
+class AtribuicaoFases(BaseModel):
+    circuito_id: str
+    fases: List[Fase] = Field(..., description="1 fase (F-N), 2 (F-F) ou as 3")
+
+class ResultadoBalanceamento(BaseModel):
+    modo: ModoBalanceamento
+    atribuicoes: List[AtribuicaoFases]
+
+    potencia_por_fase_W: Dict[Fase, float]
+    corrente_por_fase_A: Dict[Fase, float]
+    corrente_neutro_A: float = Field(..., description="Corrente de desequilíbrio das cargas F-N (A)")
+    desequilibrio_pct: float = Field(..., description="Maior desvio de potência de uma fase em relação à média (%)")
+
+    iteracoes: int = Field(0, description="Movimentos aplicados pela busca local")
+    duracao_ms: float
+
+class DimensionamentoNeutro(BaseModel):
+    corrente_neutro_A: float
+    secao_fase_mm2: float
+    secao_neutro_mm2: float
+    reduzido: bool = Field(..., description="Neutro com seção menor que a das fases (NBR 5410 6.2.6.2.6)")
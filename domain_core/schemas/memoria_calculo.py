@@ -0,0 +1,51 @@
+"""
+Memória de cálculo estruturada.
+
+O motor registra cada passo como um evento `(modelo, *argumentos)`: o ID de um modelo de
+texto em MODELOS_MEMORIA seguido dos valores do passo (uma tupla só por passo). O texto em português só é montado quando
+`passos` é lido ou o resultado é serializado; o JSON continua sendo `{"passos": [...]}`.
+Os eventos (`MemoriaCalculo.eventos`) servem para comparar resultados sem depender da
+redação dos textos.
+
+Passos em texto livre (ex: vindos de um JSON já renderizado) são guardados como `str`.
+Os modelos usam formatação `%`, como os logs: mais barata que `str.format` por passo.
+"""
+from typing import Any, List, Tuple, Union
+
+from pydantic import AliasChoices, BaseModel, Field, computed_field
+
+EventoMemoria = Union[str, Tuple[Any, ...]]
+
+MODELOS_MEMORIA = {
+    "inicio": "== INÍCIO: Análise e Dimensionamento NBR 5410 ==",
+    "restricoes": "Restrições Ambientais Identificadas: ",
+    "restricao": "- %s",
+    "corrente_projeto": "IB (Corrente Nominal de Projeto) = %.2f A",
+    "fatores_correcao": "Corrigindo IB. Fatores de Correcao -> Agrapamento: %s, Temperatura: %.2f",
+    "corrente_corrigida": "IZ (Corrente Requerida na Tabela p/ Cabo) = %.2f A",
+    "secao_condutor": "Seção Selecionada: %smm² - Suporta teoricamente %sA",
+    "queda_tensao": "Queda de Tensão Calculada DeltaV = %.2f%% (Limite %.2f%%)",
+    "queda_acumulada": "Queda nos Alimentadores a Montante = %.2f%% -> Acumulada desde a Origem = %.2f%%",
+    "disjuntor": "Dispositivo de Proteção Selecionado: Curva %s / IN = %sA",
+    "dr_fornecido": "Conferência Dispositivo DR: Fornecido",
+    "dr_faltante": "Conferência Dispositivo DR: Faltante (BLOQUEANTE)",
+}
+
+def renderizar_evento(evento: EventoMemoria) -> str:
+    if evento.__class__ is str:
+        return evento
+    return MODELOS_MEMORIA[evento[0]] % evento[1:]
+
+class MemoriaCalculo(BaseModel):
+    # Entrada também aceita `passos` (JSON já renderizado): cada texto vira um evento livre
+    eventos: List[Any] = Field(
+        default_factory=list, exclude=True,
+        validation_alias=AliasChoices("eventos", "passos")
+    )
+
+    @computed_field(description="Passo a passo didático do cálculo")
+    @property
+    def passos(self) -> List[str]:
+        # Equivale a `renderizar_evento` em cada evento, sem uma chamada de função por passo
+        modelos = MODELOS_MEMORIA
+        return [e if e.__class__ is str else modelos[e[0]] % e[1:] for e in self.eventos]
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+from domain_core.schemas.resultados import StatusDimensionamento
+
+class Quadro(BaseModel):
+    """Quadro de distribuição (QGBT ou sub-quadro) e o alimentador que o liga ao quadro a montante."""
+    id: str
+    identificador: str = Field(..., description="Ex: QGBT, QD-01")
+    pai_id: Optional[str] = Field(default=None, description="Quadro a montante (None: alimentado pela entrada)")
+    tensao_nominal: float = Field(..., gt=0)
+    fases: Literal[1, 2, 3] = 3
+
+    # Alimentador (cabo do quadro a montante, ou da entrada, até este quadro)
+    comprimento_m: float = Field(..., gt=0)
+    metodo_instalacao: str = Field(default="B1", description="A1...F")
+    material_condutor: str = Field(default="cobre", description="cobre/aluminio")
+    isolacao: str = Field(default="PVC_70C", description="PVC/EPR/XLPE")
+
+class DemandaGrupo(BaseModel):
+    grupo: str = Field(..., description="Grupo de cargas do fator de demanda (ex: iluminacao_tug, tue)")
+    quantidade: int
+    potencia_instalada_W: float
+    fator_demanda: float
+    potencia_demandada_W: float
+
+class DimensionamentoAlimentador(BaseModel):
+    """Cargas agregadas de um quadro (com todos os quadros abaixo dele) e o alimentador resultante."""
+    quadro_id: str
+    status_global: StatusDimensionamento
+
+    potencia_instalada_W: float
+    potencia_demandada_W: float
+    grupos: List[DemandaGrupo] = []
+
+    corrente_demanda_A: float = Field(..., description="Corrente de projeto do alimentador (A)")
+    secao_condutor_mm2: Optional[float] = None
+    capacidade_conducao_A: Optional[float] = None
+    disjuntor_nominal_in: Optional[float] = None
+    curva_disjuntor: Optional[str] = None
+    queda_tensao_pct: Optional[float] = Field(None, description="Queda de tensão no alimentador (%)")
+
+    erros_entrada: List[str] = []
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 from enum import Enum
 
+from domain_core.schemas.memoria_calculo import MemoriaCalculo
+
 class StatusDimensionamento(str, Enum):
     OK = "atende"
     ALERTA = "atende_com_restricao"
@@ -16,9 +18,6 @@ class VerificacaoNormativa(BaseModel):
     mensagem: str = Field(..., description="Explicação técnica do resultado")
     referencia_nbr: str = Field(..., description="Item da NBR 5410 (ex: 6.2.5)")
 
-class MemoriaCalculo(BaseModel):
-    passos: List[str] = Field(default=[], description="Passo a passo didático do cálculo")
-
 class ResultadoDimensionamento(BaseModel):
     """Objeto consolidado de resposta do Motor de Cálculo"""
     circuito_id: Optional[str] = None
@@ -37,4 +36,32 @@ class ResultadoDimensionamento(BaseModel):
     memoria: MemoriaCalculo
     
     # Alertas de bloqueio (se houver erro fatal na entrada)
-    erros_entrada: List[str] = []
\ No newline at end of file
+    erros_entrada: List[str] = []
+
+# --- Perfilamento das etapas do motor (opcional, modo debug) ---
+
+class PerfilEtapa(BaseModel):
+    etapa: str
+    duracao_ms: float
+    alocado_bytes: int = Field(0, description="Memória líquida retida na etapa (só com tracemalloc)")
+    pico_bytes: int = Field(0, description="Pico de memória alocada na etapa (só com tracemalloc)")
+
+class PerfilCircuito(BaseModel):
+    circuito_id: Optional[str] = None
+    etapas: List[PerfilEtapa] = []
+
+class EstatisticaEtapa(BaseModel):
+    etapa: str
+    chamadas: int
+    total_ms: float
+    media_ms: float
+    max_ms: float
+    fracao: float = Field(..., description="Fração do tempo total medido gasto nesta etapa")
+    alocado_bytes: int = 0
+    pico_bytes: int = 0
+
+class PerfilLote(BaseModel):
+    circuitos: int
+    medir_alocacoes: bool
+    total_ms: float
+    etapas: List[EstatisticaEtapa] = []
@@ -0,0 +1,270 @@
+"""
+Balanceamento de fases (A/B/C) dos circuitos de um quadro trifásico.
+
+- Circuitos F-N ocupam 1 fase, F-F ocupam 2 (metade da potência em cada) e trifásicos as 3
+  (sem escolha). O número de fases vem da tensão do circuito frente às tensões do sistema.
+- O objetivo é a soma dos quadrados das potências por fase mais a dos quadrados da parcela
+  F-N de cada fase: com os totais fixos, minimizá-la aproxima as fases da média e também
+  equilibra as cargas F-N, as únicas que circulam no neutro (cargas F-F compensando um
+  desequilíbrio F-N deixariam as fases iguais e o neutro carregado).
+- GULOSO: circuitos em ordem decrescente de potência, cada um na opção de menor custo
+  (carga somada das fases da opção). O(n log n); centenas de circuitos em poucos ms.
+- BUSCA_LOCAL: parte do guloso; desce com realocações (qualquer circuito) e trocas entre
+  pares de circuitos F-N de fases diferentes (o melhor par sai de uma busca binária sobre as
+  potências ordenadas) e, no ótimo local, perturba a melhor solução e desce de novo, até o
+  `orcamento_ms`, `max_perturbacoes` seguidas sem melhora ou equilíbrio perfeito. As
+  perturbações usam `semente`: com o mesmo orçamento esgotado, o resultado pode variar com a
+  velocidade da máquina; limite por `max_perturbacoes` para reprodutibilidade.
+- As correntes por fase (corrente de linha de cada circuito conforme o número de fases,
+  ver `corrente_de_linha`) e a de neutro (só cargas F-N, defasagem de 120° e mesmo fator
+  de potência) alimentam `DimensionadorProjeto.dimensionar_neutro`.
+"""
+import math
+import random
+from bisect import bisect_left
+from time import perf_counter
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from domain_core.enums.fases import Fase, ModoBalanceamento
+from domain_core.schemas.circuito import Circuito
+from domain_core.schemas.fases import AtribuicaoFases, ResultadoBalanceamento
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.services.hierarquia_quadros import FATOR_POTENCIA_PADRAO, potencia_do_circuito
+
+FASES = (Fase.A, Fase.B, Fase.C)
+
+# Opções de ligação por número de fases do circuito (índices em FASES)
+OPCOES_POR_NUMERO_FASES = {
+    1: ((0,), (1,), (2,)),
+    2: ((0, 1), (1, 2), (2, 0)),
+    3: ((0, 1, 2),),
+}
+
+class BalanceadorFases:
+
+    def __init__(self, tensao_fase_fase: float = 220.0, tensao_fase_neutro: float = 127.0,
+                 fator_potencia: float = FATOR_POTENCIA_PADRAO):
+        self.tensao_fase_fase = tensao_fase_fase
+        self.tensao_fase_neutro = tensao_fase_neutro
+        self.fator_potencia = fator_potencia
+
+    @classmethod
+    def do_projeto(cls, projeto: ProjetoEletrico) -> "BalanceadorFases":
+        """Tensões a partir de `projeto.tensao_sistema` no formato "FF/FN" (ex: "220/127")."""
+        try:
+            fase_fase, fase_neutro = (float(v) for v in projeto.tensao_sistema.replace("V", "").split("/"))
+        except ValueError:
+            raise ValueError(f"Tensão do sistema '{projeto.tensao_sistema}' fora do formato 'FF/FN' (ex: 220/127).")
+        return cls(tensao_fase_fase=fase_fase, tensao_fase_neutro=fase_neutro)
+
+    def numero_fases(self, circuito: Circuito) -> int:
+        """F-N -> 1 fase; F-F -> 2 fases (a tensão mais próxima decide)."""
+        if abs(circuito.tensao_nominal - self.tensao_fase_fase) < abs(circuito.tensao_nominal - self.tensao_fase_neutro):
+            return 2
+        return 1
+
+    def corrente_de_linha(self, potencia_W: float, numero_fases: int) -> float:
+        """
+        Corrente em cada condutor de fase: P/(V_fn·fp) para F-N, P/(V_ff·fp) para F-F e
+        P/(√3·V_ff·fp) para trifásicos. As correntes de circuitos na mesma fase são somadas
+        em módulo (a favor da segurança).
+        """
+        if numero_fases == 1:
+            tensao = self.tensao_fase_neutro
+        elif numero_fases == 2:
+            tensao = self.tensao_fase_fase
+        else:
+            tensao = math.sqrt(3) * self.tensao_fase_fase
+        return potencia_W / (tensao * self.fator_potencia)
+
+    def balancear(
+        self,
+        circuitos: Sequence[Circuito],
+        modo: ModoBalanceamento = ModoBalanceamento.GULOSO,
+        orcamento_ms: float = 100.0,
+        max_perturbacoes: int = 200,
+        semente: int = 0,
+        fases_por_circuito: Optional[Mapping[str, int]] = None
+    ) -> ResultadoBalanceamento:
+        """
+        `fases_por_circuito` (id -> 1, 2 ou 3) substitui o número de fases deduzido da tensão
+        (ex: motores trifásicos).
+        """
+        inicio = perf_counter()
+        fases_por_circuito = fases_por_circuito or {}
+        numeros = [fases_por_circuito.get(c.id) or self.numero_fases(c) for c in circuitos]
+        # Potência que cada circuito põe em cada uma das fases que ocupa
+        parcelas = [potencia_do_circuito(c) / n for c, n in zip(circuitos, numeros)]
+
+        estado = _Estado(numeros, parcelas)
+        estado.guloso()
+        if modo == ModoBalanceamento.BUSCA_LOCAL:
+            estado.busca_local(inicio + orcamento_ms / 1000, max_perturbacoes, random.Random(semente))
+
+        return self._montar_resultado(circuitos, modo, estado, (perf_counter() - inicio) * 1000)
+
+    def _montar_resultado(
+        self, circuitos: Sequence[Circuito], modo: ModoBalanceamento, estado: "_Estado", duracao_ms: float
+    ) -> ResultadoBalanceamento:
+        cargas = estado.cargas
+        atribuicoes = [
+            AtribuicaoFases(
+                circuito_id=circuito.id,
+                fases=[FASES[k] for k in OPCOES_POR_NUMERO_FASES[numero][escolha]]
+            )
+            for circuito, numero, escolha in zip(circuitos, estado.numeros, estado.escolhas)
+        ]
+
+        correntes = [0.0, 0.0, 0.0]
+        for numero, parcela, escolha in zip(estado.numeros, estado.parcelas, estado.escolhas):
+            corrente = self.corrente_de_linha(parcela * numero, numero)
+            for k in OPCOES_POR_NUMERO_FASES[numero][escolha]:
+                correntes[k] += corrente
+        divisor = self.tensao_fase_neutro * self.fator_potencia
+        ia, ib, ic = (carga / divisor for carga in estado.cargas_fn)
+        media = sum(cargas) / 3
+        return ResultadoBalanceamento(
+            modo=modo,
+            atribuicoes=atribuicoes,
+            potencia_por_fase_W=dict(zip(FASES, cargas)),
+            corrente_por_fase_A=dict(zip(FASES, correntes)),
+            corrente_neutro_A=math.sqrt(max(0.0, ia * ia + ib * ib + ic * ic - ia * ib - ib * ic - ic * ia)),
+            desequilibrio_pct=(max(abs(c - media) for c in cargas) / media * 100) if media else 0.0,
+            iteracoes=estado.iteracoes,
+            duracao_ms=duracao_ms
+        )
+
+class _Estado:
+    """
+    Escolha de opção por circuito e potência acumulada por fase, total (`cargas`) e só das
+    cargas F-N (`cargas_fn`). Listas simples, sem modelos.
+    """
+    __slots__ = ("numeros", "parcelas", "escolhas", "cargas", "cargas_fn", "iteracoes")
+
+    def __init__(self, numeros: List[int], parcelas: List[float]):
+        self.numeros = numeros
+        self.parcelas = parcelas
+        self.escolhas = [0] * len(numeros)
+        self.cargas = [0.0, 0.0, 0.0]
+        self.cargas_fn = [0.0, 0.0, 0.0]
+        self.iteracoes = 0
+
+    def objetivo(self) -> float:
+        return sum(c * c for c in self.cargas) + sum(c * c for c in self.cargas_fn)
+
+    def _custos(self, numero: int) -> List[float]:
+        """
+        Carga somada das fases de cada opção: somar a mesma parcela às fases da opção aumenta
+        o objetivo em 2·parcela·custo + constante. Circuitos F-N pesam também na parcela F-N.
+        """
+        cargas, cargas_fn = self.cargas, self.cargas_fn
+        if numero == 1:
+            return [cargas[k] + cargas_fn[k] for k in range(3)]
+        return [sum(cargas[k] for k in opcao) for opcao in OPCOES_POR_NUMERO_FASES[numero]]
+
+    def _aplicar(self, i: int, escolha: int, sinal: float):
+        parcela = sinal * self.parcelas[i]
+        for k in OPCOES_POR_NUMERO_FASES[self.numeros[i]][escolha]:
+            self.cargas[k] += parcela
+            if self.numeros[i] == 1:
+                self.cargas_fn[k] += parcela
+
+    def _mover(self, i: int, escolha: int):
+        self._aplicar(i, self.escolhas[i], -1.0)
+        self._aplicar(i, escolha, 1.0)
+        self.escolhas[i] = escolha
+
+    def guloso(self):
+        for i in sorted(range(len(self.numeros)), key=lambda i: -self.parcelas[i] * self.numeros[i]):
+            custos = self._custos(self.numeros[i])
+            self.escolhas[i] = min(range(len(custos)), key=custos.__getitem__)
+            self._aplicar(i, self.escolhas[i], 1.0)
+
+    def _equilibrado(self, tolerancia: float) -> bool:
+        return (max(self.cargas) - min(self.cargas) <= tolerancia
+                and max(self.cargas_fn) - min(self.cargas_fn) <= tolerancia)
+
+    # ------------------------------------------------------------------ busca local
+
+    def busca_local(self, prazo: float, max_perturbacoes: int, aleatorio: random.Random):
+        moveis = [i for i, n in enumerate(self.numeros) if n < 3]
+        if not moveis:
+            return
+        tolerancia = 1e-9 * (sum(self.cargas) or 1.0)
+        self._descer(prazo, tolerancia)
+        melhor_objetivo, melhores = self.objetivo(), list(self.escolhas)
+
+        sem_melhora = 0
+        tamanho = max(2, len(moveis) // 20)
+        while sem_melhora < max_perturbacoes and perf_counter() < prazo and not self._equilibrado(tolerancia):
+            for i in aleatorio.sample(moveis, min(tamanho, len(moveis))):
+                self._mover(i, aleatorio.randrange(len(OPCOES_POR_NUMERO_FASES[self.numeros[i]])))
+            self._descer(prazo, tolerancia)
+            objetivo = self.objetivo()
+            if objetivo < melhor_objetivo - tolerancia:
+                melhor_objetivo, melhores = objetivo, list(self.escolhas)
+                sem_melhora = 0
+            else:
+                sem_melhora += 1
+                for i, escolha in enumerate(melhores):
+                    if self.escolhas[i] != escolha:
+                        self._mover(i, escolha)
+
+    def _descer(self, prazo: float, tolerancia: float):
+        """Aplica realocações e trocas enquanto houver melhora (ou até o prazo)."""
+        melhorou = True
+        while melhorou and perf_counter() < prazo:
+            melhorou = self._realocar(tolerancia)
+            melhorou = self._trocar(tolerancia) or melhorou
+
+    def _realocar(self, tolerancia: float) -> bool:
+        melhorou = False
+        for i, numero in enumerate(self.numeros):
+            if numero == 3:
+                continue
+            # Custo de cada opção sem o próprio circuito
+            atual = self.escolhas[i]
+            self._aplicar(i, atual, -1.0)
+            custos = self._custos(numero)
+            self._aplicar(i, atual, 1.0)
+            escolha = min(range(len(custos)), key=custos.__getitem__)
+            if escolha != atual and 2 * self.parcelas[i] * (custos[atual] - custos[escolha]) > tolerancia:
+                self._mover(i, escolha)
+                self.iteracoes += 1
+                melhorou = True
+        return melhorou
+
+    def _trocar(self, tolerancia: float) -> bool:
+        """Melhor troca entre dois circuitos F-N de fases diferentes."""
+        por_fase: Tuple[List[Tuple[float, int]], ...] = ([], [], [])
+        for i, numero in enumerate(self.numeros):
+            if numero == 1:
+                por_fase[self.escolhas[i]].append((self.parcelas[i], i))
+        for lista in por_fase:
+            lista.sort()
+
+        melhor_ganho, melhor_par = tolerancia, None
+        for p in range(3):
+            for q in range(3):
+                # Trocar a (em p) por b (em q), d = a - b, melhora 2·d·(folga - 2·d):
+                # vale para 0 < d < folga/2, com o ideal em d = folga/4
+                folga = self.cargas[p] + self.cargas_fn[p] - self.cargas[q] - self.cargas_fn[q]
+                if folga <= 0 or not por_fase[p] or not por_fase[q]:
+                    continue
+                destino = por_fase[q]
+                potencias_q = [pq for pq, _ in destino]
+                for a, i in por_fase[p]:
+                    pos = bisect_left(potencias_q, a - folga / 4)
+                    for j in (pos - 1, pos):
+                        if 0 <= j < len(destino):
+                            d = a - destino[j][0]
+                            ganho = 2 * d * (folga - 2 * d)
+                            if ganho > melhor_ganho:
+                                melhor_ganho, melhor_par = ganho, (i, destino[j][1], p, q)
+        if melhor_par is None:
+            return False
+        i, j, p, q = melhor_par
+        self._mover(i, q)
+        self._mover(j, p)
+        self.iteracoes += 1
+        return True
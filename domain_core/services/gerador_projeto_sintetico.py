@@ -0,0 +1,288 @@
+"""
+Gerador determinístico (seeded) de projetos sintéticos para benchmarks e testes de carga.
+
+Produz zonas (a partir de PRESETS_ZONAS), locais, cargas e circuitos com distribuições
+realistas de potência, comprimento, método de instalação e agrupamento. Cada entidade é
+gerada sob demanda (iteradores), então projetos com milhões de circuitos podem ser
+escritos em NDJSON sem materializar tudo em memória:
+
+    python -m domain_core.services.gerador_projeto_sintetico --circuitos 1000000 --seed 7 > projeto.ndjson
+
+Formato NDJSON: uma linha por entidade, `{"tipo": "<projeto|zona|local|carga|circuito>", "dados": {...}}`,
+na ordem projeto → zonas → locais → cargas → circuitos (referências sempre apontam para trás).
+"""
+import argparse
+import json
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from pydantic import BaseModel, Field
+
+from domain_core.schemas.projeto import ProjetoEletrico
+from domain_core.schemas.zona import Zona
+from domain_core.schemas.local import Local
+from domain_core.schemas.carga import Carga
+from domain_core.schemas.circuito import Circuito
+from domain_core.enums.cargas import TipoCarga
+from domain_core.enums.circuitos import TipoCircuito
+from domain_core.enums.zonas import PRESETS_ZONAS
+
+DATA_BASE = datetime(2024, 1, 1)
+
+# Distribuições (pesos relativos). Perfil típico de instalações de baixa tensão.
+PESOS_TIPO_CIRCUITO = {
+    TipoCircuito.ILUMINACAO: 30,
+    TipoCircuito.TUG: 40,
+    TipoCircuito.TUE: 22,
+    TipoCircuito.MOTOR: 8,
+}
+PESOS_METODO = {"B1": 60, "B2": 12, "A1": 10, "A2": 3, "C": 10, "D": 5}
+PESOS_ISOLACAO = {"PVC_70C": 85, "XLPE_90C": 15}
+PESOS_MATERIAL = {"cobre": 97, "aluminio": 3}
+PESOS_AGRUPAMENTO = {1: 35, 2: 25, 3: 20, 4: 10, 5: 6, 6: 4}
+
+# Potência (W) log-normal por tipo: (mediana, dispersão, mínimo, máximo)
+POTENCIA_POR_TIPO = {
+    TipoCircuito.ILUMINACAO: (600.0, 0.5, 100.0, 2000.0),
+    TipoCircuito.TUG: (1200.0, 0.45, 300.0, 2500.0),
+    TipoCircuito.TUE: (3500.0, 0.5, 1000.0, 9000.0),
+    TipoCircuito.MOTOR: (3000.0, 0.7, 750.0, 15000.0),
+}
+# Comprimento (m) log-normal: (mediana, dispersão, mínimo, máximo)
+COMPRIMENTO_POR_TIPO = {
+    TipoCircuito.ILUMINACAO: (15.0, 0.5, 3.0, 60.0),
+    TipoCircuito.TUG: (15.0, 0.5, 3.0, 60.0),
+    TipoCircuito.TUE: (12.0, 0.6, 3.0, 80.0),
+    TipoCircuito.MOTOR: (30.0, 0.6, 5.0, 150.0),
+}
+TIPO_CARGA_POR_CIRCUITO = {
+    TipoCircuito.ILUMINACAO: TipoCarga.ILUMINACAO,
+    TipoCircuito.TUG: TipoCarga.TUG,
+    TipoCircuito.TUE: TipoCarga.TUE,
+    TipoCircuito.MOTOR: TipoCarga.MOTOR,
+}
+
+class ParametrosGerador(BaseModel):
+    seed: int = Field(default=5410, description="Semente: mesma semente → mesmo projeto")
+    tipo_projeto: str = Field(default="residencial", description="Chave de PRESETS_ZONAS")
+    num_zonas: int = Field(default=4, ge=1)
+    locais_por_zona: int = Field(default=5, ge=1)
+    cargas_por_local: int = Field(default=4, ge=1)
+    num_circuitos: int = Field(default=100, ge=0)
+    prefixo_id: str = Field(default="sint", description="Prefixo dos IDs gerados")
+
+class ProjetoSintetico(NamedTuple):
+    projeto: ProjetoEletrico
+    zonas: List[Zona]
+    locais: List[Local]
+    cargas: List[Carga]
+    circuitos: List[Circuito]
+
+def _escolher(rng: random.Random, pesos: Dict):
+    return rng.choices(list(pesos.keys()), weights=list(pesos.values()))[0]
+
+def _lognormal(rng: random.Random, mediana: float, sigma: float, minimo: float, maximo: float) -> float:
+    return round(min(maximo, max(minimo, rng.lognormvariate(math.log(mediana), sigma))), 1)
+
+class GeradorProjetoSintetico:
+    """
+    Cada tipo de entidade usa seu próprio gerador pseudo-aleatório derivado da semente,
+    então iterar só os circuitos produz exatamente os mesmos circuitos que a geração completa.
+    """
+
+    def __init__(self, parametros: ParametrosGerador = None):
+        self.parametros = parametros or ParametrosGerador()
+        presets = PRESETS_ZONAS.get(self.parametros.tipo_projeto)
+        if not presets:
+            raise ValueError(f"Tipo de projeto sem presets de zona: '{self.parametros.tipo_projeto}'")
+        self._presets = presets
+        self.projeto_id = f"{self.parametros.prefixo_id}-projeto"
+
+    @property
+    def num_locais(self) -> int:
+        return self.parametros.num_zonas * self.parametros.locais_por_zona
+
+    def _rng(self, fluxo: str) -> random.Random:
+        return random.Random(f"{self.parametros.seed}:{fluxo}")
+
+    def _id_zona(self, indice: int) -> str:
+        return f"{self.parametros.prefixo_id}-z{indice}"
+
+    def _id_local(self, indice: int) -> str:
+        return f"{self.parametros.prefixo_id}-l{indice}"
+
+    def _id_carga(self, indice_local: int, k: int) -> str:
+        return f"{self.parametros.prefixo_id}-l{indice_local}-q{k}"
+
+    def _zona_do_local(self, indice_local: int) -> int:
+        return indice_local // self.parametros.locais_por_zona
+
+    def gerar_projeto_eletrico(self) -> ProjetoEletrico:
+        return ProjetoEletrico(
+            id=self.projeto_id,
+            nome=f"Projeto Sintético {self.parametros.seed}",
+            tipo_instalacao=self.parametros.tipo_projeto,
+            tensao_sistema="220/127",
+            sistema="Trifásico",
+            esquema_aterramento="TN-S"
+        )
+
+    def iterar_zonas(self) -> Iterator[Zona]:
+        for i in range(self.parametros.num_zonas):
+            preset = self._presets[i % len(self._presets)]
+            yield Zona(
+                id=self._id_zona(i),
+                projeto_id=self.projeto_id,
+                nome=f"{preset['nome']} {i + 1}",
+                descricao=preset['descricao'],
+                origem='preset',
+                preset_id=preset['id'],
+                cor_identificacao=preset['cor'],
+                data_criacao=DATA_BASE,
+                **preset['influencias']
+            )
+
+    def iterar_locais(self) -> Iterator[Local]:
+        rng = self._rng("locais")
+        for i in range(self.num_locais):
+            # Cômodos aproximadamente retangulares (proporção 1:1 a 1:2)
+            area = _lognormal(rng, 12.0, 0.5, 2.0, 200.0)
+            proporcao = rng.uniform(1.0, 2.0)
+            lado = math.sqrt(area / proporcao)
+            yield Local(
+                id=self._id_local(i),
+                zona_id=self._id_zona(self._zona_do_local(i)),
+                projeto_id=self.projeto_id,
+                nome=f"Local {i + 1}",
+                area_m2=area,
+                perimetro_m=round(2 * (lado + lado * proporcao), 2),
+                data_criacao=DATA_BASE + timedelta(seconds=i)
+            )
+
+    def iterar_cargas(self) -> Iterator[Carga]:
+        rng = self._rng("cargas")
+        for i in range(self.num_locais):
+            zona_id = self._id_zona(self._zona_do_local(i))
+            for k in range(self.parametros.cargas_por_local):
+                tipo_circuito = _escolher(rng, PESOS_TIPO_CIRCUITO)
+                tipo = TIPO_CARGA_POR_CIRCUITO[tipo_circuito]
+                quantidade = rng.randint(1, 6) if tipo in (TipoCarga.ILUMINACAO, TipoCarga.TUG) else 1
+                fp = 1.0 if tipo == TipoCarga.ILUMINACAO else round(rng.uniform(0.8, 0.95), 2)
+                potencia_va = _lognormal(rng, *POTENCIA_POR_TIPO[tipo_circuito]) / quantidade
+                yield Carga(
+                    id=self._id_carga(i, k),
+                    nome=f"{tipo.value} {k + 1}",
+                    tipo=tipo,
+                    quantidade=quantidade,
+                    potencia_va=round(potencia_va, 1),
+                    potencia_w=round(potencia_va * fp, 1),
+                    fator_potencia=fp,
+                    local_id=self._id_local(i),
+                    projeto_id=self.projeto_id,
+                    zona_id=zona_id,
+                    data_criacao=DATA_BASE
+                )
+
+    def iterar_circuitos(self) -> Iterator[Circuito]:
+        rng = self._rng("circuitos")
+        cargas_por_local = self.parametros.cargas_por_local
+        for i in range(self.parametros.num_circuitos):
+            indice_local = i % self.num_locais
+            tipo = _escolher(rng, PESOS_TIPO_CIRCUITO)
+            tensao = 127.0 if tipo in (TipoCircuito.ILUMINACAO, TipoCircuito.TUG) else 220.0
+            num_cargas = rng.randint(1, min(3, cargas_por_local))
+            inicio = rng.randrange(cargas_por_local)
+            yield Circuito(
+                id=f"{self.parametros.prefixo_id}-c{i}",
+                identificador=f"C{i + 1}",
+                tipo_circuito=tipo,
+                zona_id=self._id_zona(self._zona_do_local(indice_local)),
+                tensao_nominal=tensao,
+                comprimento_m=_lognormal(rng, *COMPRIMENTO_POR_TIPO[tipo]),
+                metodo_instalacao=_escolher(rng, PESOS_METODO),
+                material_condutor=_escolher(rng, PESOS_MATERIAL),
+                isolacao=_escolher(rng, PESOS_ISOLACAO),
+                temperatura_ambiente=30,
+                circuitos_agrupados=_escolher(rng, PESOS_AGRUPAMENTO),
+                cargas_ids=[
+                    self._id_carga(indice_local, (inicio + k) % cargas_por_local) for k in range(num_cargas)
+                ],
+                potencia_instalada_W=_lognormal(rng, *POTENCIA_POR_TIPO[tipo])
+            )
+
+    def gerar(self) -> ProjetoSintetico:
+        """Materializa o projeto completo em memória (adequado até centenas de milhares de circuitos)."""
+        return ProjetoSintetico(
+            projeto=self.gerar_projeto_eletrico(),
+            zonas=list(self.iterar_zonas()),
+            locais=list(self.iterar_locais()),
+            cargas=list(self.iterar_cargas()),
+            circuitos=list(self.iterar_circuitos())
+        )
+
+    def iterar_registros(self) -> Iterator[Tuple[str, BaseModel]]:
+        yield "projeto", self.gerar_projeto_eletrico()
+        for tipo, iterador in (
+            ("zona", self.iterar_zonas()),
+            ("local", self.iterar_locais()),
+            ("carga", self.iterar_cargas()),
+            ("circuito", self.iterar_circuitos()),
+        ):
+            for modelo in iterador:
+                yield tipo, modelo
+
+    def escrever_ndjson(self, destino: IO[str]) -> int:
+        """Escreve o projeto em NDJSON, uma entidade por linha. Retorna o número de linhas."""
+        linhas = 0
+        for tipo, modelo in self.iterar_registros():
+            destino.write(f'{{"tipo":"{tipo}","dados":{modelo.model_dump_json()}}}\n')
+            linhas += 1
+        return linhas
+
+MODELOS_NDJSON = {
+    "projeto": ProjetoEletrico,
+    "zona": Zona,
+    "local": Local,
+    "carga": Carga,
+    "circuito": Circuito,
+}
+
+def ler_ndjson(linhas: Iterable[str]) -> Iterator[Tuple[str, BaseModel]]:
+    """Lê de volta um fluxo NDJSON gerado por `escrever_ndjson`, validando cada entidade."""
+    for numero, linha in enumerate(linhas, start=1):
+        if not linha.strip():
+            continue
+        registro = json.loads(linha)
+        modelo = MODELOS_NDJSON.get(registro.get("tipo"))
+        if modelo is None:
+            raise ValueError(f"Linha {numero}: tipo de registro desconhecido '{registro.get('tipo')}'")
+        yield registro["tipo"], modelo.model_validate(registro["dados"])
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gera um projeto elétrico sintético em NDJSON.")
+    parser.add_argument("--seed", type=int, default=5410)
+    parser.add_argument("--tipo", default="residencial", choices=sorted(PRESETS_ZONAS))
+    parser.add_argument("--zonas", type=int, default=4)
+    parser.add_argument("--locais-por-zona", type=int, default=5)
+    parser.add_argument("--cargas-por-local", type=int, default=4)
+    parser.add_argument("--circuitos", type=int, default=100)
+    parser.add_argument("--saida", default="-", help="Arquivo de saída ('-' para stdout)")
+    args = parser.parse_args(argv)
+
+    gerador = GeradorProjetoSintetico(ParametrosGerador(
+        seed=args.seed, tipo_projeto=args.tipo, num_zonas=args.zonas,
+        locais_por_zona=args.locais_por_zona, cargas_por_local=args.cargas_por_local,
+        num_circuitos=args.circuitos
+    ))
+    if args.saida == "-":
+        gerador.escrever_ndjson(sys.stdout)
+    else:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            gerador.escrever_ndjson(f)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
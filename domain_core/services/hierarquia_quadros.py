@@ -0,0 +1,347 @@
+"""
+Hierarquia de quadros (QGBT -> sub-quadros) com cargas agregadas por fator de demanda.
+
+- Cada quadro mantém, para a sua subárvore inteira (circuitos próprios + quadros abaixo),
+  a potência instalada e a quantidade de circuitos por grupo de demanda. A potência
+  demandada é derivada desses agregados (O(grupos)), nunca somando os circuitos de novo.
+- Editar, mover ou remover um circuito aplica a diferença no caminho do quadro até a raiz:
+  O(profundidade). Mover um quadro faz o mesmo com os agregados da subárvore dele.
+- Os alimentadores são dimensionados sob demanda, com SelecaoCondutor e SelecaoDisjuntor,
+  a partir da corrente demandada; `quedas_montante()` leva a queda deles ao DimensionadorProjeto.
+- As somas incrementais acumulam arredondamento de ponto flutuante (um grupo que fica sem
+  circuitos volta a zero exato); `recalcular()` refaz tudo do zero.
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from domain_core.enums.circuitos import TipoCircuito
+from domain_core.schemas.circuito import Circuito
+from domain_core.schemas.quadros import DemandaGrupo, DimensionamentoAlimentador, Quadro
+from domain_core.schemas.resultados import StatusDimensionamento
+from domain_core.engine.calculo_corrente import CalculoCorrente
+from domain_core.engine.calculo_queda_tensao import CalculoQuedaTensao
+from domain_core.engine.selecao_condutor import SelecaoCondutor
+from domain_core.engine.selecao_disjuntor import SelecaoDisjuntor
+
+GRUPO_ILUMINACAO_TUG = "iluminacao_tug"
+GRUPO_TUE = "tue"
+GRUPO_MOTOR = "motor"
+GRUPO_DISTRIBUICAO = "distribuicao"
+
+GRUPO_POR_TIPO = {
+    TipoCircuito.ILUMINACAO: GRUPO_ILUMINACAO_TUG,
+    TipoCircuito.TUG: GRUPO_ILUMINACAO_TUG,
+    TipoCircuito.TUE: GRUPO_TUE,
+    TipoCircuito.MOTOR: GRUPO_MOTOR,
+    TipoCircuito.DISTRIBUICAO: GRUPO_DISTRIBUICAO,
+}
+
+FATOR_POTENCIA_PADRAO = 0.92  # Mesmo padrão de CalculoCorrente
+
+class FatoresDemanda:
+    """
+    Fatores de demanda por grupo de cargas (valores usuais das normas de fornecimento das
+    concessionárias; a NBR 5410 não os fixa). Para outros valores, derive a classe.
+    """
+
+    # Iluminação + TUG: fator por faixa de potência instalada (W), aplicado faixa a faixa
+    # (a demanda nunca diminui quando a carga instalada aumenta)
+    FAIXAS_ILUMINACAO_TUG = (
+        (1000, 0.86), (2000, 0.75), (3000, 0.66), (4000, 0.59), (5000, 0.52),
+        (6000, 0.45), (7000, 0.40), (8000, 0.35), (9000, 0.31), (10000, 0.27), (float("inf"), 0.24),
+    )
+    # TUE e motores: fator pelo número de circuitos do grupo (o último vale para quantidades maiores)
+    FATORES_TUE = (1.00, 1.00, 0.84, 0.76, 0.70, 0.65, 0.60, 0.57, 0.54, 0.52, 0.49, 0.48, 0.46, 0.45, 0.44, 0.43, 0.40)
+    FATORES_MOTOR = (1.00, 0.90, 0.80, 0.80, 0.80, 0.70)
+
+    def potencia_demandada(self, grupo: str, potencia_instalada_W: float, quantidade: int) -> float:
+        if quantidade <= 0:
+            return 0.0
+        if grupo == GRUPO_ILUMINACAO_TUG:
+            demanda, inicio = 0.0, 0.0
+            for limite, fator in self.FAIXAS_ILUMINACAO_TUG:
+                if potencia_instalada_W <= inicio:
+                    break
+                demanda += (min(potencia_instalada_W, limite) - inicio) * fator
+                inicio = limite
+            return demanda
+        if grupo == GRUPO_TUE:
+            return potencia_instalada_W * self._fator_por_quantidade(self.FATORES_TUE, quantidade)
+        if grupo == GRUPO_MOTOR:
+            return potencia_instalada_W * self._fator_por_quantidade(self.FATORES_MOTOR, quantidade)
+        return potencia_instalada_W
+
+    @staticmethod
+    def _fator_por_quantidade(fatores: Tuple[float, ...], quantidade: int) -> float:
+        return fatores[min(quantidade, len(fatores)) - 1]
+
+def potencia_do_circuito(circuito: Circuito) -> float:
+    """Potência instalada (W); circuitos informados por corrente são convertidos como em CalculoCorrente."""
+    if circuito.potencia_instalada_W is not None:
+        return circuito.potencia_instalada_W
+    return circuito.corrente_nominal_A * circuito.tensao_nominal * FATOR_POTENCIA_PADRAO
+
+class _NoQuadro:
+    __slots__ = ("dados", "pai", "filhos", "circuitos", "agregados")
+
+    def __init__(self, dados: Quadro):
+        self.dados = dados
+        self.pai: Optional["_NoQuadro"] = None
+        self.filhos: Dict[str, "_NoQuadro"] = {}
+        self.circuitos: Dict[str, Tuple[str, float]] = {}   # id -> (grupo, potência W)
+        self.agregados: Dict[str, List] = {}                # grupo -> [potência W, quantidade] da subárvore
+
+class HierarquiaQuadros:
+    """
+    `circuitos` associa o id de cada quadro aos circuitos ligados diretamente a ele.
+    Quadros sem `pai_id` são raízes (alimentados pela entrada); pode haver mais de uma.
+    """
+
+    def __init__(
+        self,
+        quadros: Iterable[Quadro],
+        circuitos: Optional[Mapping[str, Iterable[Circuito]]] = None,
+        fatores: Optional[FatoresDemanda] = None
+    ):
+        self.fatores = fatores or FatoresDemanda()
+        self.selecionador_cabo = SelecaoCondutor()
+        self._quadros: Dict[str, _NoQuadro] = {}
+        self._quadro_do_circuito: Dict[str, _NoQuadro] = {}
+
+        for dados in quadros:
+            if dados.id in self._quadros:
+                raise ValueError(f"Quadro '{dados.id}' repetido na hierarquia.")
+            self._quadros[dados.id] = _NoQuadro(dados)
+        for no in self._quadros.values():
+            if no.dados.pai_id is not None:
+                self._ligar(no, self._obter_pai(no.dados))
+
+        for quadro_id, lista in (circuitos or {}).items():
+            no = self._obter(quadro_id)
+            for circuito in lista:
+                if circuito.id in self._quadro_do_circuito:
+                    raise ValueError(f"Circuito '{circuito.id}' ligado a mais de um quadro.")
+                no.circuitos[circuito.id] = (GRUPO_POR_TIPO[circuito.tipo_circuito], potencia_do_circuito(circuito))
+                self._quadro_do_circuito[circuito.id] = no
+        self.recalcular()
+
+    # ------------------------------------------------------------------ consultas
+
+    def __contains__(self, quadro_id: str) -> bool:
+        return quadro_id in self._quadros
+
+    def quadro_do_circuito(self, circuito_id: str) -> Optional[str]:
+        no = self._quadro_do_circuito.get(circuito_id)
+        return no.dados.id if no is not None else None
+
+    def potencia_instalada_W(self, quadro_id: str) -> float:
+        return sum(potencia for potencia, _ in self._obter(quadro_id).agregados.values())
+
+    def potencia_demandada_W(self, quadro_id: str) -> float:
+        return sum(g.potencia_demandada_W for g in self.demanda_por_grupo(quadro_id))
+
+    def demanda_por_grupo(self, quadro_id: str) -> List[DemandaGrupo]:
+        grupos = []
+        for grupo, (potencia, quantidade) in sorted(self._obter(quadro_id).agregados.items()):
+            demandada = self.fatores.potencia_demandada(grupo, potencia, quantidade)
+            grupos.append(DemandaGrupo(
+                grupo=grupo, quantidade=quantidade, potencia_instalada_W=potencia,
+                fator_demanda=demandada / potencia if potencia else 1.0,
+                potencia_demandada_W=demandada
+            ))
+        return grupos
+
+    def dimensionar_alimentador(self, quadro_id: str) -> DimensionamentoAlimentador:
+        """Seção, disjuntor e queda do alimentador do quadro, pela potência demandada."""
+        quadro = self._obter(quadro_id).dados
+        grupos = self.demanda_por_grupo(quadro_id)
+        instalada = sum(g.potencia_instalada_W for g in grupos)
+        demandada = sum(g.potencia_demandada_W for g in grupos)
+        corrente = CalculoCorrente.calcular_corrente_projeto(
+            potencia_W=demandada, tensao_V=quadro.tensao_nominal, fases=quadro.fases
+        )
+        resultado = {
+            "quadro_id": quadro_id, "potencia_instalada_W": instalada, "potencia_demandada_W": demandada,
+            "grupos": grupos, "corrente_demanda_A": corrente,
+            "curva_disjuntor": SelecaoDisjuntor.selecionar_curva(TipoCircuito.DISTRIBUICAO.value),
+        }
+        erros: List[str] = []
+
+        # Alimentador: condutores carregados = fases (+ neutro nos monofásicos)
+        selecao = self.selecionador_cabo.selecionar_secao_e_capacidade(
+            corrente_corrigida=corrente,
+            material=quadro.material_condutor,
+            isolacao=quadro.isolacao,
+            metodo=quadro.metodo_instalacao,
+            num_condutores=3 if quadro.fases == 3 else 2
+        )
+        if selecao is None:
+            erros.append("A tabela normativa (Tabela 36-39 NBR 5410) não suportou a corrente do alimentador.")
+        else:
+            secao, capacidade = selecao
+            resultado["secao_condutor_mm2"] = secao
+            resultado["capacidade_conducao_A"] = capacidade
+            resultado["queda_tensao_pct"] = CalculoQuedaTensao.calcular_queda_tensao_percentual(
+                corrente_A=corrente,
+                secao_mm2=secao,
+                comprimento_m=quadro.comprimento_m,
+                tensao_V=quadro.tensao_nominal,
+                fases=quadro.fases,
+                material=quadro.material_condutor
+            )
+            disjuntor_in = SelecaoDisjuntor.selecionar_in_disjuntor(corrente, capacidade)
+            if disjuntor_in is None:
+                erros.append("Impossível achar Disjuntor que crie coordenação de sobrecorrente para o alimentador.")
+            resultado["disjuntor_nominal_in"] = disjuntor_in
+
+        resultado["erros_entrada"] = erros
+        resultado["status_global"] = StatusDimensionamento.ERRO if erros else StatusDimensionamento.OK
+        return DimensionamentoAlimentador.model_validate(resultado)
+
+    def dimensionar_alimentadores(self) -> List[DimensionamentoAlimentador]:
+        return [self.dimensionar_alimentador(quadro_id) for quadro_id in self._quadros]
+
+    def quedas_montante(self) -> Dict[str, float]:
+        """
+        Queda acumulada nos alimentadores desde a entrada até o quadro de cada circuito, no
+        formato de `DimensionadorProjeto.processar_projeto(quedas_montante=...)`. Alimentadores
+        sem seção possível (já reprovados em `dimensionar_alimentador`) não somam queda.
+        """
+        acumuladas: Dict[str, float] = {}
+        pilha = [(no, 0.0) for no in self._quadros.values() if no.pai is None]
+        while pilha:
+            no, montante = pilha.pop()
+            queda = self.dimensionar_alimentador(no.dados.id).queda_tensao_pct or 0.0
+            acumuladas[no.dados.id] = montante + queda
+            pilha.extend((filho, montante + queda) for filho in no.filhos.values())
+        return {circuito_id: acumuladas[no.dados.id] for circuito_id, no in self._quadro_do_circuito.items()}
+
+    # ------------------------------------------------------------------ cálculo
+
+    def recalcular(self):
+        """Refaz os agregados de todos os quadros (pós-ordem)."""
+        ordem = []
+        pilha = [no for no in self._quadros.values() if no.pai is None]
+        while pilha:
+            no = pilha.pop()
+            ordem.append(no)
+            pilha.extend(no.filhos.values())
+        if len(ordem) != len(self._quadros):
+            raise ValueError("A hierarquia de quadros tem ciclo: há quadros que não descendem de uma raiz.")
+
+        # Pré-ordem invertida: todo filho vem antes do pai
+        for no in reversed(ordem):
+            agregados: Dict[str, List] = {}
+            for grupo, potencia in no.circuitos.values():
+                agregado = agregados.setdefault(grupo, [0.0, 0])
+                agregado[0] += potencia
+                agregado[1] += 1
+            for filho in no.filhos.values():
+                for grupo, (potencia, quantidade) in filho.agregados.items():
+                    agregado = agregados.setdefault(grupo, [0.0, 0])
+                    agregado[0] += potencia
+                    agregado[1] += quantidade
+            no.agregados = agregados
+
+    # ------------------------------------------------------------------ alterações
+
+    def atualizar_circuito(self, circuito: Circuito, quadro_id: Optional[str] = None):
+        """
+        Insere ou edita um circuito (carga, tipo) e, com `quadro_id`, liga-o a esse quadro.
+        Um circuito novo exige `quadro_id`. Custo O(profundidade).
+        """
+        atual = self._quadro_do_circuito.get(circuito.id)
+        destino = self._obter(quadro_id) if quadro_id is not None else atual
+        if destino is None:
+            raise ValueError(f"Circuito '{circuito.id}' ainda não pertence a um quadro: informe 'quadro_id'.")
+        if atual is not None:
+            grupo, potencia = atual.circuitos.pop(circuito.id)
+            self._propagar(atual, grupo, -potencia, -1)
+        grupo = GRUPO_POR_TIPO[circuito.tipo_circuito]
+        potencia = potencia_do_circuito(circuito)
+        destino.circuitos[circuito.id] = (grupo, potencia)
+        self._quadro_do_circuito[circuito.id] = destino
+        self._propagar(destino, grupo, potencia, 1)
+
+    def remover_circuito(self, circuito_id: str):
+        no = self._quadro_do_circuito.pop(circuito_id, None)
+        if no is None:
+            return
+        grupo, potencia = no.circuitos.pop(circuito_id)
+        self._propagar(no, grupo, -potencia, -1)
+
+    def atualizar_quadro(self, dados: Quadro):
+        """Insere ou edita um quadro (alimentador, quadro a montante). Custo O(profundidade × grupos)."""
+        no = self._quadros.get(dados.id)
+        pai = self._obter_pai(dados) if dados.pai_id is not None else None
+        if no is None:
+            no = self._quadros[dados.id] = _NoQuadro(dados)
+            if pai is not None:
+                self._ligar(no, pai)
+            return
+
+        if pai is not no.pai:
+            ancestral = pai
+            while ancestral is not None:
+                if ancestral is no:
+                    raise ValueError(f"Mover o quadro '{dados.id}' para '{dados.pai_id}' criaria um ciclo.")
+                ancestral = ancestral.pai
+            if no.pai is not None:
+                del no.pai.filhos[dados.id]
+                self._propagar_agregados(no.pai, no.agregados, -1)
+            no.pai = None
+            if pai is not None:
+                self._ligar(no, pai)
+                self._propagar_agregados(pai, no.agregados, 1)
+        no.dados = dados
+
+    def remover_quadro(self, quadro_id: str):
+        """Remove o quadro, os quadros abaixo dele e os circuitos ligados a eles."""
+        no = self._obter(quadro_id)
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            del self._quadros[atual.dados.id]
+            for circuito_id in atual.circuitos:
+                del self._quadro_do_circuito[circuito_id]
+            pilha.extend(atual.filhos.values())
+        if no.pai is not None:
+            del no.pai.filhos[quadro_id]
+            self._propagar_agregados(no.pai, no.agregados, -1)
+
+    # ------------------------------------------------------------------ internos
+
+    def _obter(self, quadro_id: str) -> _NoQuadro:
+        no = self._quadros.get(quadro_id)
+        if no is None:
+            raise KeyError(f"Quadro '{quadro_id}' não existe na hierarquia.")
+        return no
+
+    def _obter_pai(self, dados: Quadro) -> _NoQuadro:
+        pai = self._quadros.get(dados.pai_id)
+        if pai is None:
+            raise ValueError(f"Quadro '{dados.id}' referencia um quadro a montante inexistente: '{dados.pai_id}'.")
+        return pai
+
+    @staticmethod
+    def _ligar(no: _NoQuadro, pai: _NoQuadro):
+        no.pai = pai
+        pai.filhos[no.dados.id] = no
+
+    @staticmethod
+    def _propagar(inicio: Optional[_NoQuadro], grupo: str, delta_potencia: float, delta_quantidade: int):
+        no = inicio
+        while no is not None:
+            agregado = no.agregados.get(grupo)
+            if agregado is None:
+                agregado = no.agregados[grupo] = [0.0, 0]
+            agregado[1] += delta_quantidade
+            if agregado[1] == 0:
+                del no.agregados[grupo]  # zera exato, sem resíduo de arredondamento
+            else:
+                agregado[0] += delta_potencia
+            no = no.pai
+
+    @classmethod
+    def _propagar_agregados(cls, inicio: _NoQuadro, agregados: Dict[str, List], sinal: int):
+        for grupo, (potencia, quantidade) in list(agregados.items()):
+            cls._propagar(inicio, grupo, sinal * potencia, sinal * quantidade)
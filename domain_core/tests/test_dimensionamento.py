@@ -1,6 +1,10 @@
+import math
 import pytest
 import os
 import sys
+import io
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
@@ -12,7 +16,24 @@ from domain_core.enums.circuitos import TipoCircuito
 from domain_core.enums.influencias import TemperaturaAmbiente
 
 from domain_core.engine.dimensionador_projeto import DimensionadorProjeto
-from domain_core.schemas.resultados import StatusDimensionamento
+from domain_core.engine.selecao_condutor import SelecaoCondutor
+from domain_core.engine.contexto_instalacao import ContextoInstalacao
+from domain_core.engine.modelos_internos import ContextoCircuito
+from domain_core.engine.regras_zona import RegrasZonaEngine
+from domain_core.engine.arvore_distribuicao import ArvoreDistribuicao
+from domain_core.enums.distribuicao import TipoNoDistribuicao
+from domain_core.enums.fases import Fase, ModoBalanceamento
+from domain_core.schemas.distribuicao import NoDistribuicao
+from domain_core.schemas.fases import ResultadoBalanceamento
+from domain_core.schemas.quadros import Quadro
+from domain_core.schemas.resultados import ResultadoDimensionamento, StatusDimensionamento
+from domain_core.services.hierarquia_quadros import FatoresDemanda, HierarquiaQuadros
+from domain_core.services.balanceamento_fases import BalanceadorFases
+from domain_core.engine.grafo_dependencias import GrafoDependenciasProjeto
+from domain_core.schemas.alteracoes import AlteracoesProjeto
+from domain_core.services.gerador_projeto_sintetico import GeradorProjetoSintetico, ParametrosGerador, ler_ndjson
+from domain_core.engine import telemetria
+from domain_core.engine.perfilador_etapas import PerfiladorEtapas
 
 def test_dimensionador_completo_basico():
     projeto = ProjetoEletrico(
@@ -41,3 +62,505 @@ def test_dimensionador_completo_basico():
     assert res.disjuntor_nominal_in in [10, 16] # 10 ou 16 cobrem bem. Na vdd 10 coberia 9.09, o codigo pega o primeiro maior ou igual, pegou 10 provavelmente
     assert res.status_global == StatusDimensionamento.OK
     assert len(res.verificacoes) > 0
+
+def _contexto_projeto():
+    projeto = ProjetoEletrico(
+        id="p1", nome="Casa", tipo_instalacao="Residencial",
+        tensao_sistema="220/127", sistema="Trifásico", esquema_aterramento="TN-S"
+    )
+    zona = Zona(id="z1", projeto_id="p1", nome="Quarto", data_criacao="2024-01-01T00:00")
+    local = Local(id="l1", zona_id="z1", projeto_id="p1", nome="Dormitório 1", area_m2=12.0, perimetro_m=14.0, data_criacao="2024-01-01T00:00")
+    return projeto, zona, local
+
+def _circuito(cid: str, potencia: float, zona_id: str = "z1") -> Circuito:
+    return Circuito(
+        id=cid, identificador=cid, tipo_circuito=TipoCircuito.TUG,
+        zona_id=zona_id, tensao_nominal=220, comprimento_m=15,
+        metodo_instalacao="B1", material_condutor="cobre", isolacao="PVC_70C",
+        temperatura_ambiente=30, circuitos_agrupados=1,
+        potencia_instalada_W=potencia
+    )
+
+def test_processar_projeto_isola_falhas_e_preserva_ordem():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [
+        _circuito("c1", 2000),
+        _circuito("c2", 2000, zona_id="zona-inexistente"),
+        _circuito("c3", 500000),  # Excede as tabelas de ampacidade
+        _circuito("c4", 1000),
+    ]
+
+    engine = DimensionadorProjeto()
+    resultados = engine.processar_projeto(projeto, [local], [zona], circuitos)
+
+    assert [r.circuito_id for r in resultados] == ["c1", "c2", "c3", "c4"]
+    assert resultados[0].status_global == StatusDimensionamento.OK
+    assert resultados[1].status_global == StatusDimensionamento.ERRO
+    assert "zona-inexistente" in resultados[1].erros_entrada[0]
+    assert resultados[2].status_global == StatusDimensionamento.ERRO
+    assert resultados[3].status_global == StatusDimensionamento.OK
+
+def test_processar_projeto_pool_equivale_ao_sequencial():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito(f"c{i}", 500 + 100 * i) for i in range(12)]
+
+    engine = DimensionadorProjeto()
+    sequencial = engine.processar_projeto(projeto, [local], [zona], circuitos)
+    paralelo = engine.processar_projeto(projeto, [local], [zona], circuitos, max_workers=2)
+
+    assert [r.model_dump() for r in paralelo] == [r.model_dump() for r in sequencial]
+
+def test_iterar_projeto_consome_circuitos_sob_demanda_e_preserva_ordem():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito(f"c{i}", 500 + 100 * i) for i in range(20)]
+    lidos = []
+    def fonte():
+        for c in circuitos:
+            lidos.append(c.id)
+            yield c
+
+    engine = DimensionadorProjeto()
+    sequencial = engine.processar_projeto(projeto, [local], [zona], circuitos)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fluxo = engine.iterar_projeto(projeto, [local], [zona], fonte(), executor=pool,
+                                      tamanho_lote=3, max_lotes_em_voo=2)
+        primeiro = next(fluxo)
+        # Só os lotes em voo foram lidos da fonte
+        assert len(lidos) <= 3 * 3
+        em_fluxo = [primeiro] + list(fluxo)
+
+    assert [r.model_dump() for r in em_fluxo] == [r.model_dump() for r in sequencial]
+    assert [r.model_dump() for r in engine.iterar_projeto(projeto, [local], [zona], circuitos)] == \
+        [r.model_dump() for r in sequencial]
+
+def test_resultado_do_caminho_rapido_equivale_a_revalidacao_completa():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito("c1", 2000), _circuito("c2", 500000), _circuito("c3", 1000, zona_id="z-x")]
+    for resultado in DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos, has_dr=True):
+        revalidado = ResultadoDimensionamento.model_validate(resultado.model_dump())
+        assert resultado.model_dump_json() == revalidado.model_dump_json()
+
+def test_contexto_leve_produz_as_mesmas_restricoes_que_o_contexto_pydantic():
+    projeto, zona, local = _contexto_projeto()
+    circuito = _circuito("c1", 2000)
+    regras = RegrasZonaEngine()
+    assert regras.aplicar_regras(ContextoCircuito(projeto, [local], zona, circuito)) == \
+        regras.aplicar_regras(ContextoInstalacao(projeto=projeto, locais=[local], zona_governante=zona, circuito=circuito))
+
+def test_grafo_dependencias_recalcula_apenas_circuitos_afetados():
+    projeto, zona, local = _contexto_projeto()
+    zona2 = Zona(id="z2", projeto_id="p1", nome="Sala", data_criacao="2024-01-01T00:00")
+    circuitos = [_circuito("c1", 2000), _circuito("c2", 1500), _circuito("c3", 1000, zona_id="z2")]
+
+    engine = DimensionadorProjeto()
+    recalculados = []
+    original = engine.processar_circuito_isolado
+    def espiao(projeto, locais, zonas, circuito, has_dr=False):
+        recalculados.append(circuito.id)
+        return original(projeto, locais, zonas, circuito, has_dr)
+    engine.processar_circuito_isolado = espiao
+
+    grafo = GrafoDependenciasProjeto(projeto, [zona, zona2], [local], [], circuitos, dimensionador=engine)
+    assert sorted(recalculados) == ["c1", "c2", "c3"]
+
+    # Editar a zona 2 só recalcula o circuito dela; nada mudou no resultado -> diff vazio
+    recalculados.clear()
+    diffs = grafo.aplicar_alteracoes(AlteracoesProjeto(zonas=[zona2.model_copy(update={"nome": "Sala Ampla"})]))
+    assert recalculados == ["c3"]
+    assert diffs == []
+
+    # Aumentar a potência de c1 muda corrente e seção
+    recalculados.clear()
+    diffs = grafo.aplicar_alteracoes(AlteracoesProjeto(circuitos=[_circuito("c1", 5000)]))
+    assert recalculados == ["c1"]
+    assert [d.circuito_id for d in diffs] == ["c1"]
+    assert "corrente_projeto_ib" in diffs[0].campos
+    assert diffs[0].campos["secao_condutor_mm2"].antes == 2.5
+
+    # Remover a zona 1 afeta c1 e c2 (que passam a erro), não c3
+    recalculados.clear()
+    diffs = grafo.aplicar_alteracoes(AlteracoesProjeto(zonas_removidas=["z1"], circuitos_removidos=["c2"]))
+    assert recalculados == ["c1"]
+    assert {d.circuito_id: d.removido for d in diffs} == {"c1": False, "c2": True}
+    assert grafo.resultados["c1"].status_global == StatusDimensionamento.ERRO
+    assert "c2" not in grafo.resultados
+
+def test_gerador_sintetico_deterministico_e_ndjson_ida_e_volta():
+    parametros = ParametrosGerador(seed=42, num_zonas=3, locais_por_zona=2, cargas_por_local=3, num_circuitos=50)
+    projeto = GeradorProjetoSintetico(parametros).gerar()
+    assert projeto == GeradorProjetoSintetico(parametros).gerar()
+    # Iterar só os circuitos reproduz os mesmos circuitos da geração completa
+    assert list(GeradorProjetoSintetico(parametros).iterar_circuitos()) == projeto.circuitos
+
+    zonas_ids = {z.id for z in projeto.zonas}
+    cargas_ids = {c.id for c in projeto.cargas}
+    assert all(l.zona_id in zonas_ids for l in projeto.locais)
+    assert all(c.zona_id in zonas_ids and set(c.cargas_ids) <= cargas_ids for c in projeto.circuitos)
+
+    buffer = io.StringIO()
+    linhas = GeradorProjetoSintetico(parametros).escrever_ndjson(buffer)
+    registros = list(ler_ndjson(buffer.getvalue().splitlines()))
+    assert linhas == len(registros) == 1 + 3 + 6 + 18 + 50
+    assert [m for tipo, m in registros if tipo == "circuito"] == projeto.circuitos
+
+    resultados = DimensionadorProjeto().processar_projeto(projeto.projeto, projeto.locais, projeto.zonas, projeto.circuitos)
+    assert all(not r.erros_entrada or "Zona" not in r.erros_entrada[0] for r in resultados)
+
+def test_telemetria_reporta_eventos_ao_observador_registrado():
+    class ObservadorTeste(telemetria.ObservadorTelemetria):
+        def __init__(self):
+            self.contadores = Counter()
+            self.duracoes = Counter()
+
+        def incrementar(self, nome, valor=1.0, **rotulos):
+            self.contadores[(nome, tuple(sorted(rotulos.items())))] += valor
+
+        def observar_duracao(self, nome, segundos, **rotulos):
+            self.duracoes[nome] += 1
+
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito("ok", 1500), _circuito("grande", 500000), _circuito("orfao", 1500, zona_id="zx")]
+
+    observador = ObservadorTeste()
+    telemetria.registrar_observador(observador)
+    try:
+        DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos)
+    finally:
+        telemetria.registrar_observador(None)
+
+    assert observador.duracoes["dimensionamento_circuito"] == 2
+    assert observador.duracoes["selecao_condutor"] == 2
+    assert observador.contadores[("dimensionamento_falhas", (("motivo", "secao_condutor"),))] == 1
+    assert observador.contadores[("dimensionamento_falhas", (("motivo", "zona_inexistente"),))] == 1
+    assert observador.contadores[("dimensionamento_circuitos", (("status", "atende"),))] == 1
+
+    # Sem observador os ganchos não fazem nada
+    DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos)
+    assert observador.duracoes["dimensionamento_circuito"] == 2
+
+def test_perfilador_registra_etapas_e_agrega_lote_inclusive_no_pool():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito(f"c{i}", 1000 + 50 * i) for i in range(12)]
+
+    perfilador = PerfiladorEtapas()
+    DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos, perfilador=perfilador)
+    etapas = {e.etapa for e in perfilador.circuitos[0].etapas}
+    assert etapas == {"contexto", "regras", "resultado", "corrente", "condutor", "queda_tensao", "disjuntor", "dr"}
+
+    agregado = perfilador.agregar()
+    assert agregado.circuitos == 12
+    assert all(e.chamadas == 12 for e in agregado.etapas)
+    assert abs(sum(e.fracao for e in agregado.etapas) - 1.0) < 1e-9
+
+    no_pool = PerfiladorEtapas(medir_alocacoes=True)
+    DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos, max_workers=2, perfilador=no_pool)
+    no_pool.encerrar()
+    assert sorted(p.circuito_id for p in no_pool.circuitos) == sorted(c.id for c in circuitos)
+    assert any(e.pico_bytes > 0 for e in no_pool.agregar().etapas)
+
+def test_memoria_registrada_como_eventos_e_renderizada_em_passos():
+    projeto, zona, local = _contexto_projeto()
+    resultado = DimensionadorProjeto().processar_projeto(projeto, [local], [zona], [_circuito("c1", 2000)])[0]
+
+    memoria = resultado.memoria
+    assert memoria.eventos[0] == ("inicio",)
+    assert ("corrente_projeto", resultado.corrente_projeto_ib) in memoria.eventos
+    assert f"IB (Corrente Nominal de Projeto) = {resultado.corrente_projeto_ib:.2f} A" in memoria.passos
+
+def test_memoria_serializada_como_passos_e_relida_como_texto_livre():
+    projeto, zona, local = _contexto_projeto()
+    resultado = DimensionadorProjeto().processar_projeto(projeto, [local], [zona], [_circuito("c1", 2000)])[0]
+
+    assert resultado.model_dump(mode="json")["memoria"] == {"passos": resultado.memoria.passos}
+    relido = ResultadoDimensionamento.model_validate_json(resultado.model_dump_json())
+    assert relido.memoria.passos == resultado.memoria.passos
+    assert all(isinstance(evento, str) for evento in relido.memoria.eventos)
+
+def test_sem_registro_de_memoria_os_demais_campos_nao_mudam():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito("c1", 2000), _circuito("c2", 3500)]
+    completo = DimensionadorProjeto().processar_projeto(projeto, [local], [zona], circuitos)
+    sem_memoria = DimensionadorProjeto(registrar_memoria=False).processar_projeto(projeto, [local], [zona], circuitos)
+
+    for com, sem in zip(completo, sem_memoria):
+        assert sem.memoria.passos == []
+        assert sem.model_dump(exclude={"memoria"}) == com.model_dump(exclude={"memoria"})
+
+def _no(nid, tipo, pai=None, potencia=0.0, comprimento=0.0, secao=None, fases=1, tensao=220) -> NoDistribuicao:
+    return NoDistribuicao(
+        id=nid, tipo=tipo, pai_id=pai, potencia_W=potencia,
+        comprimento_m=comprimento, secao_mm2=secao, fases=fases, tensao_V=tensao
+    )
+
+def _nos_distribuicao():
+    """Entrada -> QGBT -> qd1/qd2 -> 8 circuitos alternados entre os dois quadros."""
+    nos = [
+        _no("entrada", TipoNoDistribuicao.ENTRADA, tensao=380, fases=3),
+        _no("qgbt", TipoNoDistribuicao.QGBT, "entrada", comprimento=20, secao=16, fases=3, tensao=380),
+        _no("qd1", TipoNoDistribuicao.QUADRO, "qgbt", comprimento=30, secao=6),
+        _no("qd2", TipoNoDistribuicao.QUADRO, "qgbt", comprimento=10, secao=10),
+    ]
+    return nos + [
+        _no(f"c{i}", TipoNoDistribuicao.CIRCUITO, f"qd{1 + i % 2}", potencia=500 + 100 * i, comprimento=12, secao=2.5)
+        for i in range(8)
+    ]
+
+def _assert_arvores_equivalentes(arvore: ArvoreDistribuicao, nos):
+    do_zero = ArvoreDistribuicao(nos)
+    assert len(arvore) == len(do_zero)
+    for nid, queda in do_zero.quedas_acumuladas().items():
+        assert arvore.potencia_W(nid) == pytest.approx(do_zero.potencia_W(nid))
+        assert arvore.queda_acumulada_pct(nid) == pytest.approx(queda)
+        assert arvore.pior_queda_pct(nid) == pytest.approx(do_zero.pior_queda_pct(nid))
+
+def test_arvore_distribuicao_acumula_quedas_desde_a_entrada():
+    nos = _nos_distribuicao()
+    arvore = ArvoreDistribuicao(nos)
+
+    assert arvore.potencia_W("qgbt") == sum(n.potencia_W for n in nos)
+    esperado = arvore.queda_trecho_pct("qgbt") + arvore.queda_trecho_pct("qd1") + arvore.queda_trecho_pct("c0")
+    assert arvore.queda_acumulada_pct("c0") == pytest.approx(esperado)
+    assert arvore.quedas_montante()["c0"] == pytest.approx(arvore.queda_acumulada_pct("qd1"))
+    assert arvore.pior_queda_pct() == pytest.approx(max(arvore.quedas_acumuladas().values()))
+
+def test_arvore_distribuicao_edicoes_incrementais_equivalem_a_reconstrucao():
+    nos = {n.id: n for n in _nos_distribuicao()}
+    arvore = ArvoreDistribuicao(nos.values())
+    edicoes = [
+        nos["c0"].model_copy(update={"potencia_W": 2800}),            # carga
+        nos["c3"].model_copy(update={"secao_mm2": 1.5}),              # cabo do trecho
+        nos["c4"].model_copy(update={"pai_id": "qd2"}),               # troca de quadro
+        nos["qd2"].model_copy(update={"comprimento_m": 45}),          # alimentador
+        _no("c9", TipoNoDistribuicao.CIRCUITO, "qd2", potencia=1200, comprimento=25, secao=2.5),  # inserção
+    ]
+    for editado in edicoes:
+        arvore.atualizar_no(editado)
+        nos[editado.id] = editado
+    arvore.remover_no("c5")
+    del nos["c5"]
+
+    _assert_arvores_equivalentes(arvore, nos.values())
+
+def test_arvore_distribuicao_remover_quadro_remove_a_subarvore():
+    nos = _nos_distribuicao()
+    arvore = ArvoreDistribuicao(nos)
+    arvore.remover_no("qd1")
+
+    assert "qd1" not in arvore and "c0" not in arvore
+    _assert_arvores_equivalentes(arvore, [n for n in nos if n.id != "qd1" and n.pai_id != "qd1"])
+
+def test_arvore_distribuicao_rejeita_ciclos_e_ligacoes_invalidas():
+    arvore = ArvoreDistribuicao(_nos_distribuicao())
+    potencia = arvore.potencia_W("entrada")
+
+    with pytest.raises(ValueError):
+        arvore.atualizar_no(_no("qgbt", TipoNoDistribuicao.QGBT, "qd1", comprimento=20, secao=16))  # ciclo
+    with pytest.raises(ValueError):
+        arvore.atualizar_no(_no("c10", TipoNoDistribuicao.CIRCUITO, "c0", potencia=100))  # alimentado por circuito
+    with pytest.raises(ValueError):
+        arvore.atualizar_no(_no("c10", TipoNoDistribuicao.CIRCUITO, "qd9", potencia=100))  # pai inexistente
+    with pytest.raises(ValueError):
+        arvore.remover_no("entrada")
+    with pytest.raises(KeyError):
+        arvore.queda_acumulada_pct("qd9")
+    # Nenhuma tentativa rejeitada alterou a árvore
+    assert arvore.potencia_W("entrada") == potencia and arvore.potencia_W("qd1") + arvore.potencia_W("qd2") == potencia
+
+def test_queda_a_montante_entra_no_limite_de_queda_do_circuito():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito("c1", 2000), _circuito("c2", 2000)]
+    sem_montante, com_montante = DimensionadorProjeto().processar_projeto(
+        projeto, [local], [zona], circuitos, quedas_montante={"c2": 3.9}
+    )
+
+    assert sem_montante.status_global == StatusDimensionamento.OK
+    assert com_montante.queda_tensao_pct == sem_montante.queda_tensao_pct  # queda própria do circuito
+    verificacao = next(v for v in com_montante.verificacoes if v.criterio == "Queda de Tensão")
+    assert verificacao.valor_calculado == pytest.approx(3.9 + com_montante.queda_tensao_pct)
+    assert com_montante.status_global == StatusDimensionamento.ERRO
+
+def test_quedas_a_montante_chegam_aos_lotes_do_pool():
+    projeto, zona, local = _contexto_projeto()
+    circuitos = [_circuito("c1", 2000), _circuito("c2", 2000)]
+    engine = DimensionadorProjeto()
+    sequencial = engine.processar_projeto(projeto, [local], [zona], circuitos, quedas_montante={"c2": 3.9})
+    no_pool = engine.processar_projeto(projeto, [local], [zona], circuitos, max_workers=2, quedas_montante={"c2": 3.9})
+    assert [r.model_dump() for r in no_pool] == [r.model_dump() for r in sequencial]
+
+def _quadros():
+    return [
+        Quadro(id="qgbt", identificador="QGBT", tensao_nominal=380, comprimento_m=15),
+        Quadro(id="qd1", identificador="QD-01", pai_id="qgbt", tensao_nominal=220, fases=1, comprimento_m=25),
+        Quadro(id="qd2", identificador="QD-02", pai_id="qgbt", tensao_nominal=380, comprimento_m=40),
+    ]
+
+def _circuitos_por_quadro():
+    """4 TUGs no qd1; 2 TUGs e 3 TUEs de 4 kW no qd2."""
+    tug = [_circuito(f"tug{i}", 600 + 100 * i) for i in range(6)]
+    tue = [_circuito(f"tue{i}", 4000).model_copy(update={"tipo_circuito": TipoCircuito.TUE}) for i in range(3)]
+    return {"qd1": tug[:4], "qd2": tug[4:] + tue}
+
+def _assert_hierarquias_equivalentes(hierarquia: HierarquiaQuadros, do_zero: HierarquiaQuadros):
+    for quadro_id in ("qgbt", "qd1", "qd2"):
+        grupos = hierarquia.demanda_por_grupo(quadro_id)
+        esperados = do_zero.demanda_por_grupo(quadro_id)
+        assert [(g.grupo, g.quantidade) for g in grupos] == [(g.grupo, g.quantidade) for g in esperados]
+        for grupo, esperado in zip(grupos, esperados):
+            assert grupo.potencia_instalada_W == pytest.approx(esperado.potencia_instalada_W)
+        assert hierarquia.potencia_demandada_W(quadro_id) == pytest.approx(do_zero.potencia_demandada_W(quadro_id))
+
+def test_fatores_de_demanda_por_faixa_e_por_quantidade():
+    fatores = FatoresDemanda()
+    assert fatores.potencia_demandada("iluminacao_tug", 1500, 3) == pytest.approx(1000 * 0.86 + 500 * 0.75)
+    assert fatores.potencia_demandada("tue", 12000, 3) == pytest.approx(12000 * 0.84)
+
+def test_hierarquia_quadros_agrega_a_subarvore_com_fatores_de_demanda():
+    por_quadro = _circuitos_por_quadro()
+    hierarquia = HierarquiaQuadros(_quadros(), por_quadro)
+    todos = por_quadro["qd1"] + por_quadro["qd2"]
+    total_tug = sum(c.potencia_instalada_W for c in todos if c.tipo_circuito == TipoCircuito.TUG)
+
+    assert hierarquia.potencia_instalada_W("qgbt") == pytest.approx(sum(c.potencia_instalada_W for c in todos))
+    assert hierarquia.potencia_demandada_W("qgbt") == pytest.approx(
+        FatoresDemanda().potencia_demandada("iluminacao_tug", total_tug, 6) + 12000 * 0.84
+    )
+
+def test_hierarquia_quadros_edicoes_incrementais_equivalem_a_reconstrucao():
+    quadros = _quadros()
+    por_quadro = _circuitos_por_quadro()
+    hierarquia = HierarquiaQuadros(quadros, por_quadro)
+
+    editado = por_quadro["qd1"][0].model_copy(update={"potencia_instalada_W": 2500})
+    hierarquia.atualizar_circuito(editado)                       # carga
+    hierarquia.atualizar_circuito(por_quadro["qd2"][2], "qd1")   # TUE muda de quadro
+    hierarquia.atualizar_circuito(_circuito("novo", 900), "qgbt")  # circuito direto no QGBT
+    hierarquia.remover_circuito("tug5")
+    quadros[2] = quadros[2].model_copy(update={"pai_id": "qd1"})  # qd2 passa a ser alimentado pelo qd1
+    hierarquia.atualizar_quadro(quadros[2])
+
+    do_zero = HierarquiaQuadros(quadros, {
+        "qgbt": [_circuito("novo", 900)],
+        "qd1": [editado] + por_quadro["qd1"][1:] + [por_quadro["qd2"][2]],
+        "qd2": [por_quadro["qd2"][0]] + por_quadro["qd2"][3:],
+    })
+    _assert_hierarquias_equivalentes(hierarquia, do_zero)
+    assert hierarquia.quadro_do_circuito("tue0") == "qd1" and hierarquia.quadro_do_circuito("tug5") is None
+
+def test_hierarquia_quadros_rejeita_ciclo_e_circuito_sem_quadro():
+    quadros = _quadros()
+    hierarquia = HierarquiaQuadros(quadros, _circuitos_por_quadro())
+    potencia = hierarquia.potencia_instalada_W("qgbt")
+
+    with pytest.raises(ValueError):
+        hierarquia.atualizar_quadro(quadros[0].model_copy(update={"pai_id": "qd2"}))
+    with pytest.raises(ValueError):
+        hierarquia.atualizar_circuito(_circuito("novo", 900))
+    with pytest.raises(KeyError):
+        hierarquia.atualizar_circuito(_circuito("novo", 900), "qd9")
+    assert hierarquia.potencia_instalada_W("qgbt") == potencia
+
+def test_hierarquia_quadros_dimensiona_alimentador_pela_corrente_demandada():
+    alimentador = HierarquiaQuadros(_quadros(), _circuitos_por_quadro()).dimensionar_alimentador("qd1")
+
+    assert alimentador.status_global == StatusDimensionamento.OK
+    assert alimentador.corrente_demanda_A <= alimentador.disjuntor_nominal_in <= alimentador.capacidade_conducao_A
+    assert alimentador.queda_tensao_pct > 0
+
+def test_hierarquia_quadros_queda_a_montante_soma_os_alimentadores():
+    quadros = _quadros()
+    quadros[2] = quadros[2].model_copy(update={"pai_id": "qd1"})
+    hierarquia = HierarquiaQuadros(quadros, _circuitos_por_quadro())
+
+    assert hierarquia.quedas_montante()["tug4"] == pytest.approx(sum(
+        hierarquia.dimensionar_alimentador(q).queda_tensao_pct for q in ("qgbt", "qd1", "qd2")
+    ))
+
+def _circuitos_fn(quantidade: int):
+    """Circuitos F-N (127 V) com potências espalhadas entre 100 e 3000 W."""
+    return [
+        _circuito(f"fn{i}", 100 + (i * 379) % 2900).model_copy(update={"tensao_nominal": 127})
+        for i in range(quantidade)
+    ]
+
+def _circuitos_ff(quantidade: int):
+    """Circuitos F-F (220 V) entre 2000 e 6000 W."""
+    return [_circuito(f"ff{i}", 2000 + (i * 743) % 4000) for i in range(quantidade)]
+
+def _dispersao(resultado: ResultadoBalanceamento) -> float:
+    media = sum(resultado.potencia_por_fase_W.values()) / 3
+    return sum((p - media) ** 2 for p in resultado.potencia_por_fase_W.values())
+
+def test_balanceamento_busca_local_nao_piora_o_guloso():
+    balanceador = BalanceadorFases()
+    circuitos = _circuitos_fn(120)
+    guloso = balanceador.balancear(circuitos)
+    local = balanceador.balancear(circuitos, ModoBalanceamento.BUSCA_LOCAL, orcamento_ms=1e6, max_perturbacoes=20)
+    assert _dispersao(local) <= _dispersao(guloso)
+
+def test_balanceamento_atribui_todos_os_circuitos_e_conserva_a_potencia():
+    circuitos = _circuitos_fn(30) + _circuitos_ff(10)
+    resultado = BalanceadorFases().balancear(circuitos, fases_por_circuito={"ff0": 3})
+
+    fases = {a.circuito_id: a.fases for a in resultado.atribuicoes}
+    assert list(fases) == [c.id for c in circuitos]
+    assert len(fases["fn0"]) == 1 and len(fases["ff1"]) == 2
+    assert fases["ff0"] == [Fase.A, Fase.B, Fase.C]
+    assert sum(resultado.potencia_por_fase_W.values()) == pytest.approx(sum(c.potencia_instalada_W for c in circuitos))
+
+def test_balanceamento_equilibra_fases_e_neutro_com_cargas_ff():
+    resultado = BalanceadorFases().balancear(
+        _circuitos_fn(120) + _circuitos_ff(20), ModoBalanceamento.BUSCA_LOCAL, orcamento_ms=1e6, max_perturbacoes=20
+    )
+    assert resultado.desequilibrio_pct < 1
+    # Só as cargas F-N circulam no neutro: elas também ficam equilibradas entre si
+    assert resultado.corrente_neutro_A < 1
+
+def test_corrente_por_fase_usa_a_corrente_de_linha_de_cada_circuito():
+    balanceador = BalanceadorFases(fator_potencia=1.0)
+    ff = _circuito("ff", 4400)
+    resultado = balanceador.balancear([ff])
+    fases = resultado.atribuicoes[0].fases
+    assert [resultado.corrente_por_fase_A[f] for f in fases] == [pytest.approx(20.0)] * 2
+    assert sum(resultado.corrente_por_fase_A.values()) == pytest.approx(40.0)
+
+    fn = _circuito("fn", 1270).model_copy(update={"tensao_nominal": 127})
+    tri = _circuito("tri", 3 * 2200)
+    resultado = balanceador.balancear([fn, tri], fases_por_circuito={"tri": 3})
+    fase_fn = resultado.atribuicoes[0].fases[0]
+    por_tri = 3 * 2200 / (math.sqrt(3) * 220)
+    assert resultado.corrente_por_fase_A[fase_fn] == pytest.approx(10.0 + por_tri)
+    assert all(resultado.corrente_por_fase_A[f] == pytest.approx(por_tri) for f in Fase if f != fase_fn)
+
+def test_balanceamento_casos_limite():
+    balanceador = BalanceadorFases()
+    vazio = balanceador.balancear([], ModoBalanceamento.BUSCA_LOCAL)
+    assert vazio.atribuicoes == [] and vazio.desequilibrio_pct == 0 and vazio.corrente_neutro_A == 0
+
+    trifasicos = _circuitos_ff(3)
+    resultado = balanceador.balancear(
+        trifasicos, ModoBalanceamento.BUSCA_LOCAL, fases_por_circuito={c.id: 3 for c in trifasicos}
+    )
+    assert resultado.desequilibrio_pct == pytest.approx(0) and resultado.iteracoes == 0
+
+def test_balanceador_le_as_tensoes_do_projeto():
+    projeto, _, _ = _contexto_projeto()
+    balanceador = BalanceadorFases.do_projeto(projeto)
+    assert (balanceador.tensao_fase_fase, balanceador.tensao_fase_neutro) == (220, 127)
+    with pytest.raises(ValueError):
+        BalanceadorFases.do_projeto(projeto.model_copy(update={"tensao_sistema": "220"}))
+
+def test_dimensionar_neutro_reduz_so_secoes_grandes_com_corrente_compativel():
+    dimensionador = DimensionadorProjeto()
+    balanceamento = BalanceadorFases().balancear(_circuitos_fn(60))
+
+    neutro = dimensionador.dimensionar_neutro(balanceamento, 95)
+    assert neutro.reduzido and neutro.secao_neutro_mm2 == 50
+    assert dimensionador.dimensionar_neutro(balanceamento, 16).secao_neutro_mm2 == 16
+    desequilibrado = balanceamento.model_copy(update={"corrente_neutro_A": 200.0})
+    assert dimensionador.dimensionar_neutro(desequilibrado, 95).secao_neutro_mm2 == 95
+
+@pytest.mark.parametrize("material", ["aluminio", "ALUMINIO", "Aluminio"])
+def test_neutro_de_aluminio_so_reduz_acima_de_35mm2(material):
+    selecao = SelecaoCondutor()
+    assert selecao.selecionar_secao_neutro(10, 35, material, "PVC_70C", "B1") == 35
+    assert selecao.selecionar_secao_neutro(10, 50, material, "PVC_70C", "B1") == 25
@@ -1,6 +1,10 @@
 import pytest
 import os
 import sys
+import shutil
+import json
+import logging
+from types import SimpleNamespace
 
 # Corrige imports adicionando raiz do projeto
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -9,6 +13,12 @@ from domain_core.engine.calculo_corrente import CalculoCorrente
 from domain_core.engine.calculo_queda_tensao import CalculoQuedaTensao
 from domain_core.engine.selecao_condutor import SelecaoCondutor
 from domain_core.engine.selecao_disjuntor import SelecaoDisjuntor
+from domain_core.engine.normative_repository import NormativeRepository
+from domain_core.engine import normative_repository
+from domain_core.engine.contexto_instalacao import ContextoInstalacao, RestricoesNormativas
+from domain_core.engine.regras_zona import RegrasZonaEngine
+from domain_core.enums.aterramento import EsquemaAterramento
+from domain_core.engine.log_estruturado import FormatadorJSON
 
 def test_calculo_corrente():
     ib = CalculoCorrente.calcular_corrente_projeto(potencia_W=4400, tensao_V=220, fator_potencia=1.0)
@@ -41,3 +51,152 @@ def test_selecao_disjuntor():
     # test IB <= IN <= IZ -> 14 <= IN <= 26 -> 16 ou 20 ou 25 comercial entra, seleciona o primeiro que cober no loop
     in_sel = SelecaoDisjuntor.selecionar_in_disjuntor(14.0, 26.0)
     assert in_sel == 16.0 
+
+def test_snapshot_normativo_regenera_quando_yaml_muda(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for nome in ("NBR5410.yaml", "regras_normativas_5410.yaml"):
+        shutil.copy(os.path.join(NormativeRepository._docs_dir, nome), docs / nome)
+    monkeypatch.setattr(NormativeRepository, "_docs_dir", str(docs))
+    monkeypatch.setenv("PROJEL_NORMATIVE_CACHE_DIR", str(tmp_path / "cache"))
+
+    # Instâncias isoladas (fora do singleton) para exercitar o carregamento
+    repo = object.__new__(NormativeRepository)
+    repo._load_data()
+    versao_original = repo.versao_dados
+    assert (tmp_path / "cache" / "normative_snapshot.pickle").exists()
+
+    repo_snapshot = object.__new__(NormativeRepository)
+    repo_snapshot._load_data()
+    assert repo_snapshot.versao_dados == versao_original
+    assert repo_snapshot.nbr_data == repo.nbr_data
+    assert repo_snapshot.regras_data == repo.regras_data
+
+    with open(docs / "regras_normativas_5410.yaml", "a", encoding="utf-8") as f:
+        f.write("\n- id: R_TESTE_SNAPSHOT\n  descricao: \"Regra adicionada no teste\"\n")
+
+    repo_alterado = object.__new__(NormativeRepository)
+    repo_alterado._load_data()
+    assert repo_alterado.versao_dados != versao_original
+    assert repo_alterado.get_todas_regras()[-1]['id'] == "R_TESTE_SNAPSHOT"
+
+def test_selecao_condutor_busca_binaria_equivale_a_varredura_linear():
+    engine = SelecaoCondutor()
+    tabela = engine.repo.get_tabela_ampacidade("cobre", "PVC_70C", "B1", 2)
+
+    def varredura_linear(corrente, minima):
+        for secao in sorted(tabela):
+            if secao >= minima and tabela[secao] >= corrente:
+                return secao
+        return None
+
+    for corrente in [0.0, 10.0, 14.5, 17.5, 17.51, 24.0, 99.9, 500.0, 10000.0]:
+        for is_ilum, minima in ((True, 1.5), (False, 2.5)):
+            esperado = varredura_linear(corrente, minima)
+            assert engine.selecionar_secao_por_corrente(corrente, "cobre", "PVC_70C", "B1", 2, is_ilum) == esperado
+            selecao = engine.selecionar_secao_e_capacidade(corrente, "COBRE", "PVC", "B1", 2, is_ilum)
+            assert (selecao[0] if selecao else None) == esperado
+            if selecao:
+                assert selecao[1] == tabela[selecao[0]]
+
+    assert engine.selecionar_secao_por_corrente(10.0, "cobre", "PVC_70C", "Z9", 2) is None
+
+def test_selecao_condutor_vetorizada_consistente_com_escalar():
+    np = pytest.importorskip("numpy")
+    engine = SelecaoCondutor()
+
+    correntes = np.array([0.0, 12.0, 14.5, 21.0, 26.0, 26.01, 350.0, 5000.0, np.nan])
+    ilum = np.array([True, False, True, False, True, False, True, False, False])
+
+    obtido = engine.selecionar_secoes_vetorizado(correntes, "cobre", "PVC_70C", "A1", 2, is_iluminacao=ilum)
+    esperado = [
+        engine.selecionar_secao_por_corrente(float(i), "cobre", "PVC_70C", "A1", 2, is_iluminacao=bool(il))
+        for i, il in zip(correntes, ilum)
+    ]
+    esperado = np.array([np.nan if s is None else s for s in esperado], dtype=np.float64)
+    assert obtido.tobytes() == esperado.tobytes()
+
+    # bool único vale para todo o array
+    assert engine.selecionar_secoes_vetorizado(np.array([12.0]), "cobre", "PVC_70C", "A1", 2)[0] == 2.5
+    assert np.isnan(engine.selecionar_secoes_vetorizado(np.array([12.0]), "cobre", "PVC_70C", "Z9", 2)).all()
+
+def _regra_se_aplica(engine, regra, influencias) -> bool:
+    """Oráculo da varredura linear: basta uma influência da regra com um código gatilho."""
+    condicoes = regra.get('condicoes', {}).get('influencias', {})
+    for tipo_influencia, codigos_gatilho in condicoes.items():
+        valor_no_contexto = engine._encontrar_valor_influencia(tipo_influencia, influencias)
+        if valor_no_contexto and valor_no_contexto in codigos_gatilho:
+            return True
+    return False
+
+def test_regras_zona_indice_invertido_equivale_a_varredura_completa():
+    engine = RegrasZonaEngine()
+
+    def varredura_completa(influencias):
+        dados = {'fatores_correcao': [], 'observacoes': []}
+        for regra in engine.repo.get_todas_regras():
+            if _regra_se_aplica(engine, regra, influencias):
+                engine._aplicar_consequencias(regra, dados)
+                dados['observacoes'].append(f"Regra {regra['id']}: {regra['descricao']} (Ref: {regra.get('referencia', {}).get('capitulo')})")
+        return RestricoesNormativas(**dados)
+
+    cenarios = [
+        {},
+        {"PresencaAgua": "AD4"},
+        {"PresencaAgua": "AD1", "TemperaturaAmbiente": "AA6"},
+        {"TemperaturaAmbiente": "AA5", "MateriaisProcessadosArmazenados": "BE3", "CompetenciaPessoas": "BA2"},
+        {"temp_ambiente": "AA4"},  # chaves fora do padrão do YAML caem no fallback leniente
+    ]
+    for influencias in cenarios:
+        contexto = ContextoInstalacao.model_construct(zona_governante=SimpleNamespace(influencias_externas=influencias))
+        assert engine.aplicar_regras(contexto) == varredura_completa(influencias)
+
+    contexto = ContextoInstalacao.model_construct(zona_governante=SimpleNamespace(influencias_externas={"PresencaAgua": "AD4"}))
+    assert engine.aplicar_regras(contexto).exige_dr_30ma
+
+def test_regras_zona_cache_compartilha_restricoes_por_assinatura():
+    def contexto(influencias, esquema=EsquemaAterramento.TN_S):
+        return ContextoInstalacao.model_construct(
+            projeto=SimpleNamespace(esquema_aterramento=esquema),
+            zona_governante=SimpleNamespace(influencias_externas=influencias),
+        )
+
+    RegrasZonaEngine._cache_restricoes.limpar()
+    engine = RegrasZonaEngine()
+
+    primeira = engine.aplicar_regras(contexto({"PresencaAgua": "AD4", "TemperaturaAmbiente": "AA4"}))
+    # Mesma assinatura com outra ordem de chaves e outra instância do engine
+    segunda = RegrasZonaEngine().aplicar_regras(contexto({"TemperaturaAmbiente": "AA4", "PresencaAgua": "AD4"}))
+    assert segunda is primeira
+    assert primeira.exige_dr_30ma
+
+    outro_esquema = engine.aplicar_regras(contexto({"PresencaAgua": "AD4", "TemperaturaAmbiente": "AA4"}, EsquemaAterramento.TT))
+    assert outro_esquema is not primeira
+
+    stats = RegrasZonaEngine.estatisticas_cache()
+    assert stats["acertos"] == 1 and stats["falhas"] == 2 and stats["tamanho"] == 2
+
+    with pytest.raises(Exception):
+        primeira.exige_dr_30ma = False
+
+def test_tabela_inexistente_gera_log_estruturado_uma_vez(caplog):
+    repo = NormativeRepository()
+    with caplog.at_level(logging.ERROR, logger="projel.motor.normas"):
+        assert repo.get_indice_ampacidade("cobre", "PVC_70C", "X_LOG", 2) is None
+        assert repo.get_indice_ampacidade("cobre", "PVC_70C", "X_LOG", 2) is None  # memorizado: sem novo log
+
+    registros = [r for r in caplog.records if r.name == "projel.motor.normas"]
+    assert len(registros) == 1
+    linha = json.loads(FormatadorJSON().format(registros[0]))
+    assert linha["nivel"] == "ERROR"
+    assert linha["dados"] == {"material": "cobre", "isolacao": "PVC_70C", "metodo": "X_LOG", "condutores": 2}
+
+def test_memo_de_aliases_da_ampacidade_e_limitado(monkeypatch):
+    repo = NormativeRepository()
+    monkeypatch.setattr(normative_repository, "MAX_ALIASES_AMPACIDADE", 4)
+    monkeypatch.setattr(repo, "_indice_por_alias", {})
+    for i in range(20):
+        repo.get_indice_ampacidade("cobre", "PVC_70C", f"X_{i}", 2)
+    assert len(repo._indice_por_alias) == 4
+    tabela = repo.get_indice_ampacidade("cobre", "PVC_70C", "B1", 3)
+    assert tabela is not None and repo.get_indice_ampacidade("COBRE", "PVC", "B1", 3) is tabela